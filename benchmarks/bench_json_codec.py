@@ -0,0 +1,109 @@
+"""
+Benchmark the JSON codec backends on the framework's real payload shapes
+
+Usage:
+    python -m benchmarks.bench_json_codec [--iterations N] [--output reports/bench/json_codec.json]
+"""
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable, List
+
+from utils.helpers import TestHelper
+from utils.json_codec import JSONCodec, orjson
+
+def build_payloads() -> Dict[str, Any]:
+    """Build payloads shaped like the API bodies, captures and result files the suite handles"""
+    rng = random.Random(12345)
+
+    products = []
+    for product_id in range(1, 21):
+        product = TestHelper.generate_product_data(rng=rng)
+        product.update({"id": product_id, "rating": {"rate": round(rng.uniform(0, 5), 1), "count": rng.randint(0, 500)}})
+        products.append(product)
+
+    users = [dict(TestHelper.generate_user_data(rng=rng), id=user_id) for user_id in range(1, 11)]
+    carts = [dict(TestHelper.generate_cart_data(rng.randint(1, 10), rng=rng), id=cart_id) for cart_id in range(1, 8)]
+
+    capture = {
+        "status_code": 200,
+        "headers": {"content-type": "application/json; charset=utf-8", "server": "cloudflare"},
+        "response_time_seconds": 0.123,
+        "body": products
+    }
+
+    test_data = TestHelper.load_test_data("products_test_data.json")
+
+    return {
+        "product": products[0],
+        "products_list": products,
+        "users_list": users,
+        "carts_list": carts,
+        "allure_capture": capture,
+        "test_data_file": test_data,
+        "catalog_1000": products * 50
+    }
+
+def time_call(fn: Callable[[], Any], iterations: int) -> float:
+    """Best-of-three mean time per call in microseconds"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1e6
+
+def run(iterations: int) -> List[Dict[str, Any]]:
+    """Run the benchmark for every available backend"""
+    backends = ["stdlib"] + (["orjson"] if orjson is not None else [])
+    payloads = build_payloads()
+    results = []
+
+    for name, payload in payloads.items():
+        for backend in backends:
+            codec = JSONCodec(backend)
+            encoded = codec.dumps_bytes(payload)
+            # Large payloads get fewer iterations so the run stays short
+            count = max(10, iterations * 1000 // max(len(encoded), 1))
+            results.append({
+                "payload": name,
+                "bytes": len(encoded),
+                "backend": backend,
+                "dumps_us": time_call(lambda: codec.dumps_bytes(payload), count),
+                "dumps_indent_us": time_call(lambda: codec.dumps(payload, indent=2, default=str), count),
+                "loads_us": time_call(lambda: codec.loads(encoded), count)
+            })
+
+    return results
+
+def print_table(results: List[Dict[str, Any]]):
+    """Print results grouped by payload"""
+    header = f"{'payload':<16} {'bytes':>8} {'backend':<8} {'dumps us':>10} {'indent us':>10} {'loads us':>10}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(f"{row['payload']:<16} {row['bytes']:>8} {row['backend']:<8} "
+              f"{row['dumps_us']:>10.1f} {row['dumps_indent_us']:>10.1f} {row['loads_us']:>10.1f}")
+
+    if orjson is None:
+        print("\norjson is not installed; only the stdlib backend was measured")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark JSON codec backends")
+    parser.add_argument("--iterations", type=int, default=200, help="Iteration scale factor")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    print_table(results)
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        JSONCodec("stdlib").dump(results, output_path, indent=2)
+        print(f"\nResults saved: {output_path}")
+
+if __name__ == "__main__":
+    main()
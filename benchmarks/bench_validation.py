@@ -0,0 +1,94 @@
+"""
+Benchmark response validation: interpreted JSON Schema, compiled schemas and typed models
+
+Usage:
+    python -m benchmarks.bench_validation [--iterations N] [--output reports/bench/validation.json]
+"""
+import argparse
+import random
+import time
+from pathlib import Path
+from typing import Dict, Any, List
+
+import jsonschema
+
+from utils.json_codec import codec, JSONCodec
+from utils.models import Product
+from utils.schema_compiler import SchemaCompiler
+
+SCHEMA_FILE = Path(__file__).parent.parent / "test_data" / "schemas" / "product_schema.json"
+
+CATEGORIES = ["electronics", "jewelery", "men's clothing", "women's clothing"]
+
+def build_products(count: int) -> List[Dict[str, Any]]:
+    """Build a product list shaped like GET /products"""
+    rng = random.Random(12345)
+    return [
+        {
+            "id": product_id,
+            "title": f"Product {product_id}",
+            "price": round(rng.uniform(1, 1000), 2),
+            "description": "Lorem ipsum dolor sit amet " * 8,
+            "category": rng.choice(CATEGORIES),
+            "image": f"https://fakestoreapi.com/img/{product_id}.jpg",
+            "rating": {"rate": round(rng.uniform(0, 5), 1), "count": rng.randint(0, 500)}
+        }
+        for product_id in range(1, count + 1)
+    ]
+
+def time_call(fn, iterations: int) -> float:
+    """Best-of-three mean time per call in microseconds"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1e6
+
+def run(iterations: int) -> List[Dict[str, Any]]:
+    """Validate product lists of several sizes with each approach"""
+    item_schema = codec.load(SCHEMA_FILE)
+    list_schema = {"type": "array", "items": item_schema}
+    list_validator = jsonschema.Draft7Validator(list_schema, format_checker=jsonschema.FormatChecker())
+    compiled_validator = SchemaCompiler().get_validator("bench_product_list", list_schema)
+    results = []
+
+    for count in (20, 200, 1000):
+        body = JSONCodec("stdlib").dumps_bytes(build_products(count))
+        runs = max(5, iterations * 20 // count)
+        results.append({
+            "items": count,
+            "bytes": len(body),
+            "jsonschema_us": time_call(lambda: list_validator.validate(codec.loads(body)), runs),
+            "compiled_us": time_call(lambda: compiled_validator(codec.loads(body)), runs),
+            "model_json_us": time_call(lambda: Product.parse_many(body), runs),
+            "model_python_us": time_call(lambda: Product.parse_many(codec.loads(body)), runs)
+        })
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response validation approaches")
+    parser.add_argument("--iterations", type=int, default=200, help="Iteration scale factor")
+    parser.add_argument("--output", default=None, help="Optional JSON file for the results")
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+
+    header = (f"{'items':>6} {'bytes':>9} {'jsonschema us':>14} {'compiled us':>14} "
+              f"{'model json us':>14} {'model dict us':>14}")
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(f"{row['items']:>6} {row['bytes']:>9} {row['jsonschema_us']:>14.1f} {row['compiled_us']:>14.1f} "
+              f"{row['model_json_us']:>14.1f} {row['model_python_us']:>14.1f}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        codec.dump(results, output_path, indent=2)
+        print(f"\nResults saved: {output_path}")
+
+if __name__ == "__main__":
+    main()
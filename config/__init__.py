@@ -1,3 +1,3 @@
-from .config_loader import ConfigLoader, get_config
+from .config_loader import ConfigLoader, get_config, get_config_for
 
-__all__ = ['ConfigLoader', 'get_config'] 
\ No newline at end of file
+__all__ = ['ConfigLoader', 'get_config', 'get_config_for'] 
\ No newline at end of file
@@ -1,3 +1,4 @@
+import copy
 import json
 import os
 from pathlib import Path
@@ -8,6 +9,8 @@ class ConfigLoader:
     def __init__(self):
         self.config_dir = Path(__file__).parent
         self.environment = os.getenv("TEST_ENV", "staging")
+        # False for views of other environments, which API_BASE_URL must not redirect
+        self.active = True
         self._cache = {}
         
         if self.environment not in ["staging", "prod"]:
@@ -45,6 +48,7 @@ class ConfigLoader:
         self._environments = {
             "staging": {
                 "base_url": "https://fakestoreapi.com",
+                "connect_timeout": 5,
                 "timeout": 30,
                 "retry_count": 3,
                 "retry_delay": 2,
@@ -64,6 +68,7 @@ class ConfigLoader:
             },
             "prod": {
                 "base_url": "https://fakestoreapi.com",
+                "connect_timeout": 5,
                 "timeout": 20,
                 "retry_count": 5,
                 "retry_delay": 3,
@@ -145,11 +150,18 @@ class ConfigLoader:
         return self.environment == "staging"
     
     def get_base_url(self) -> str:
+        # API_BASE_URL points the active environment at another server, such as the local stub
+        override = os.getenv("API_BASE_URL")
+        if override and self.active:
+            return override.rstrip("/")
         return self.get_environment_config().get("base_url", "https://fakestoreapi.com")
     
     def get_timeout(self) -> int:
         return self.get_environment_config().get("timeout", 30)
     
+    def get_connect_timeout(self) -> float:
+        return self.get_environment_config().get("connect_timeout", 5)
+    
     def get_headers(self) -> Dict[str, str]:
         return self.get_environment_config().get("headers", {
             "Content-Type": "application/json"
@@ -191,6 +203,80 @@ class ConfigLoader:
             "seed": 12345
         })
     
+    def get_data_generation_config(self) -> Dict[str, Any]:
+        return self._test_settings.get("data_generation", {}).get("seeded", {
+            "memoize": True,
+            "cache_dir": ".cache/generated_data",
+            "date_range": {
+                "start": "2019-01-01",
+                "end": "2020-12-31"
+            }
+        })
+    
+    def get_test_data_config(self) -> Dict[str, Any]:
+        return self._test_settings.get("test_data", {
+            "file_cache_size": 16,
+            "store": {
+                "enabled": True,
+                "path": ".cache/test_data.sqlite",
+                "case_cache_size": 1024
+            }
+        })
+    
+    def get_resource_pool_config(self) -> Dict[str, Any]:
+        return self._test_settings.get("resource_pool", {
+            "size": 5,
+            "max_workers": 8,
+            "recycle": "restore",
+            "acquire_timeout": 30
+        })
+    
+    def get_cleanup_config(self) -> Dict[str, Any]:
+        return self._test_settings.get("cleanup", {
+            "enabled": True,
+            "spool_dir": ".cache/cleanup",
+            "batch_size": 20,
+            "max_workers": 8,
+            "retries": 3,
+            "backoff": 0.5,
+            "deadline": 120
+        })
+    
+    def get_circuit_breaker_config(self) -> Dict[str, Any]:
+        return self._test_settings.get("circuit_breaker", {
+            "enabled": True,
+            "failure_threshold": 5,
+            "reset_timeout": 30,
+            "probe_timeout": 15,
+            "failure_statuses": [502, 503, 504],
+            "state_path": ".cache/circuit_breakers.sqlite"
+        })
+    
+    def get_health_check_config(self) -> Dict[str, Any]:
+        return self._test_settings.get("health_check", {
+            "enabled": True,
+            "path": "/products?limit=1",
+            "timeout": 5,
+            "attempts": 2,
+            "on_unreachable": "fail"
+        })
+    
+    def get_scheduling_config(self) -> Dict[str, Any]:
+        return self._test_settings.get("scheduling", {
+            "group_fixtures": []
+        })
+    
+    def get_soak_config(self) -> Dict[str, Any]:
+        return self._test_settings.get("soak", {
+            "duration": "1h",
+            "window_seconds": 60,
+            "think_time_ms": 0,
+            "output_dir": "reports/soak",
+            "warmup_windows": 5,
+            "page_hinkley": {"delta": 0.05, "threshold": 1.0},
+            "cusum": {"k": 0.5, "h": 8.0, "min_sigma_ratio": 0.1}
+        })
+    
     def get_auth_config(self) -> Dict[str, Any]:
         return self._test_settings.get("auth", {
             "test_credentials": {
@@ -202,13 +288,55 @@ class ConfigLoader:
     def get_validation_config(self) -> Dict[str, Any]:
         return self._test_settings.get("validation", {
             "strict_schema": True,
-            "status_code_validation": True
+            "status_code_validation": True,
+            "schema_engine": "compiled",
+            "compiled_schema_dir": "build/compiled_schemas"
         })
     
     def get_reporting_config(self) -> Dict[str, Any]:
         return self._test_settings.get("reporting", {
             "allure_enabled": True,
-            "html_report": True
+            "html_report": True,
+            "event_log_dir": "reports/events",
+            "render_on_finish": []
+        })
+    
+    def get_client_config(self) -> Dict[str, Any]:
+        return self._test_settings.get("client", {
+            "coalescing": {
+                "enabled": True,
+                "methods": ["GET", "HEAD"]
+            },
+            "streaming": {
+                "spool_threshold_bytes": 1048576,
+                "max_body_bytes": 268435456,
+                "chunk_size": 65536,
+                "spool_dir": None
+            },
+            "compression": {
+                "accept_encodings": ["zstd", "br", "gzip", "deflate"],
+                "compress_requests": False,
+                "request_min_bytes": 1024,
+                "request_encoding": "gzip"
+            },
+            "hedging": {
+                "enabled": False,
+                "methods": ["GET", "HEAD"],
+                "endpoints": ["products.get_by_id", "products.categories"],
+                "delay_ms": 500,
+                "delay_percentile": 95,
+                "min_samples": 20,
+                "max_hedge_ratio": 0.1,
+                "burst": 5,
+                "max_workers": 8
+            },
+            "pagination": {
+                "page_size": 50,
+                "prefetch": True,
+                "max_workers": 8,
+                "max_empty_pages": 3,
+                "date_window_days": 30
+            }
         })
     
     def get_environment_summary(self) -> Dict[str, Any]:
@@ -229,6 +357,7 @@ class ConfigLoader:
             "environment": self.environment,
             "base_url": self.get_base_url(),
             "timeout": self.get_timeout(),
+            "connect_timeout": self.get_connect_timeout(),
             "headers": self.get_headers(),
             "retry": self.get_retry_config(),
             "logging": self.get_logging_config(),
@@ -236,11 +365,30 @@ class ConfigLoader:
             "test_execution": self.get_test_execution_config(),
             "endpoints": self.get_endpoints(),
             "faker": self.get_faker_config(),
+            "data_generation": self.get_data_generation_config(),
+            "test_data": self.get_test_data_config(),
+            "resource_pool": self.get_resource_pool_config(),
+            "cleanup": self.get_cleanup_config(),
+            "circuit_breaker": self.get_circuit_breaker_config(),
+            "health_check": self.get_health_check_config(),
+            "scheduling": self.get_scheduling_config(),
+            "soak": self.get_soak_config(),
             "auth": self.get_auth_config(),
             "validation": self.get_validation_config(),
-            "reporting": self.get_reporting_config()
+            "reporting": self.get_reporting_config(),
+            "client": self.get_client_config()
         }
     
+    def get_config_for(self, env: str) -> Dict[str, Any]:
+        """Full configuration of another environment without switching the current one"""
+        if env not in self.get_available_environments():
+            raise ValueError(f"Unknown environment '{env}', available: {self.get_available_environments()}")
+        
+        loader = copy.copy(self)
+        loader.environment = env
+        loader.active = env == self.environment
+        return loader.get_all_config()
+    
     def switch_environment(self, env: str):
         valid_envs = ["staging", "prod"]
         if env in valid_envs:
@@ -256,6 +404,9 @@ _config_loader = ConfigLoader()
 def get_config() -> Dict[str, Any]:
     return _config_loader.get_all_config()
 
+def get_config_for(env: str) -> Dict[str, Any]:
+    return _config_loader.get_config_for(env)
+
 def get_environment_info() -> Dict[str, Any]:
     return _config_loader.get_environment_summary()
 
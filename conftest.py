@@ -1,9 +1,125 @@
+import math
+import os
 import pytest
 import allure
-import json
-from typing import Dict, Any, Generator
-from utils import APIClient, DataProvider, ResponseValidator, TestHelper
+from typing import Dict, Any, Generator, Optional
+from utils import APIClient, DataProvider, ResponseValidator, TestHelper, SeededDataGenerator
 from config import get_config
+from utils.combinatorics import parse_strength
+from utils.test_scheduler import DurationSchedulerPlugin
+from utils.impact import ImpactSelectionPlugin
+from utils.json_codec import codec
+from utils.resource_pool import ResourcePoolManager, Lease
+from utils.cleanup import CleanupPlugin
+from utils.deadline import deadline_scope
+from utils.event_log import EventLogPlugin
+
+def pytest_addoption(parser):
+    """Register framework command line options"""
+    group = parser.getgroup("fakestore", "FakeStore API test framework")
+    group.addoption(
+        "--combination-strength", action="store", default="2",
+        help="Interaction strength for generated combinations: 2 (pairwise), 3, ... or 'full'"
+    )
+    group.addoption(
+        "--combination-shard", action="store", default="0/1",
+        help="Run only one deterministic shard of generated combinations, as INDEX/COUNT"
+    )
+    group.addoption(
+        "--schedule-by-duration", action="store_true", default=False,
+        help="Run the slowest tests first based on recorded durations"
+    )
+    group.addoption(
+        "--ci-split", action="store", default=None,
+        help="Run one of N duration-balanced slices of the suite, as INDEX/COUNT"
+    )
+    group.addoption(
+        "--durations-path", action="store", default=".cache/test_durations.json",
+        help="File used to record and predict per-test durations"
+    )
+    group.addoption(
+        "--impact-record", action="store_true", default=False,
+        help="Record which endpoints, schemas and test data each test touches"
+    )
+    group.addoption(
+        "--impact-since", action="store", default=None,
+        help="Run only tests affected by changes since the given git ref"
+    )
+    group.addoption(
+        "--impact-index", action="store", default=".cache/impact_index.json",
+        help="File holding the test impact index"
+    )
+    group.addoption(
+        "--profile", action="store", default="off", choices=("off", "test", "session"),
+        help="Sample stacks around each test or the whole session and write flamegraphs"
+    )
+    group.addoption(
+        "--profile-interval", action="store", type=float, default=5.0,
+        help="Sampling interval of the profiler in milliseconds"
+    )
+    group.addoption(
+        "--profile-dir", action="store", default="reports/profiles",
+        help="Directory receiving collapsed stacks and speedscope profiles"
+    )
+    group.addoption(
+        "--memory-track", action="store_true", default=False,
+        help="Trace allocations per test and report retained memory by module and fixture"
+    )
+    group.addoption(
+        "--memory-frames", action="store", type=int, default=15,
+        help="Traceback depth recorded for each allocation"
+    )
+    group.addoption(
+        "--memory-snapshot-interval", action="store", type=int, default=10,
+        help="Tests between allocation site snapshots used for attribution"
+    )
+    group.addoption(
+        "--memory-max-test-growth", action="store", type=float, default=None,
+        help="Fail the run if a single test retains more than this many MB"
+    )
+    group.addoption(
+        "--memory-fail-on-leak", action="store_true", default=False,
+        help="Fail the run if memory grows monotonically across tests"
+    )
+    group.addoption(
+        "--memory-report", action="store", default="reports/memory/memory_report.json",
+        help="File receiving the memory report"
+    )
+    group.addoption(
+        "--keep-created", action="store_true", default=False,
+        help="Do not delete resources created by the tests at the end of the session"
+    )
+    group.addoption(
+        "--test-deadline", action="store", type=float, default=None,
+        help="Seconds each test may spend, requests and retries included (0 disables; "
+             "defaults to test_execution.timeout_per_test)"
+    )
+    group.addoption(
+        "--health-check", action="store", default=None, choices=("fail", "skip", "off"),
+        help="Probe the target at session start and fail or skip network tests while it is down "
+             "(defaults to health_check.on_unreachable)"
+    )
+    group.addoption(
+        "--event-log-dir", action="store", default=None,
+        help="Directory receiving the event log of the run (defaults to reporting.event_log_dir)"
+    )
+    group.addoption(
+        "--render-reports", action="store", default=None,
+        help="Comma-separated reports to render from the event log at the end of the session: "
+             "junit, html, allure, metrics or all (defaults to reporting.render_on_finish)"
+    )
+    group.addoption(
+        "--stub-server", action="store_true", default=False,
+        help="Run the suite against a local FakeStore API stub"
+    )
+    group.addoption(
+        "--fault-profile", action="store", default=None,
+        help="Inject the latency and faults described by this profile file into every request"
+    )
+    group.addoption(
+        "--resilience-dir", action="store", default="reports/resilience",
+        help="Directory receiving fault injection reports and the run history"
+    )
 
 # Configure pytest
 def pytest_configure(config):
@@ -17,6 +133,75 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "users: mark test as users related")
     config.addinivalue_line("markers", "carts: mark test as carts related")
     config.addinivalue_line("markers", "auth: mark test as authentication related")
+    config.addinivalue_line("markers", "combinations(base, variations, strength): generate combination_data cases")
+    config.addinivalue_line("markers", "xdist_group(name): run tests of the same group on one xdist worker")
+    config.addinivalue_line("markers", "deadline(seconds): time budget of the test, overriding --test-deadline")
+    
+    # Every run writes the event log; reports are rendered from it only when asked for
+    reporting_config = get_config().get("reporting", {})
+    event_log_dir = config.getoption("--event-log-dir") or reporting_config.get("event_log_dir", "reports/events")
+    render_formats = config.getoption("--render-reports")
+    render_formats = render_formats.split(",") if render_formats else reporting_config.get("render_on_finish", [])
+    config.pluginmanager.register(
+        EventLogPlugin(config, event_log_dir, [fmt.strip() for fmt in render_formats if fmt.strip()]),
+        "event_log"
+    )
+    
+    # Record durations on every run; reorder only when requested
+    config.pluginmanager.register(DurationSchedulerPlugin(config, get_config().get("scheduling")), "duration_scheduler")
+    config.pluginmanager.register(ImpactSelectionPlugin(config), "impact_selection")
+    config.pluginmanager.register(CleanupPlugin(config, get_config().get("cleanup")), "resource_cleanup")
+
+    # The profiler is only imported and registered when requested; the xdist controller runs no tests
+    is_xdist_controller = bool(getattr(config.option, "numprocesses", None)) and not hasattr(config, "workerinput")
+    if config.getoption("--profile") != "off" and not is_xdist_controller:
+        from utils.profiler import ProfilerPlugin
+        config.pluginmanager.register(ProfilerPlugin(config), "sampling_profiler")
+    if config.getoption("--memory-track"):
+        from utils.memory_tracker import MemoryTrackerPlugin
+        config.pluginmanager.register(MemoryTrackerPlugin(config), "memory_tracker")
+    if config.getoption("--stub-server"):
+        from utils.stub_server import StubServerPlugin
+        config.pluginmanager.register(StubServerPlugin(config), "stub_server")
+    health_config = get_config().get("health_check", {})
+    on_unreachable = config.getoption("--health-check") or health_config.get("on_unreachable", "fail")
+    if health_config.get("enabled", True) and on_unreachable != "off" and not config.option.collectonly:
+        from utils.circuit_breaker import HealthGatePlugin
+        config.pluginmanager.register(
+            HealthGatePlugin(config, get_config()["base_url"], on_unreachable, health_config,
+                             get_config().get("circuit_breaker")),
+            "health_gate"
+        )
+    if config.getoption("--fault-profile"):
+        from utils.fault_injection import FaultInjectionPlugin
+        config.pluginmanager.register(
+            FaultInjectionPlugin(config, config.getoption("--fault-profile"), config.getoption("--resilience-dir")),
+            "fault_injection"
+        )
+
+def _observe_hooks(pytestconfig, hooks):
+    """Let registered framework plugins subscribe to a component's hooks"""
+    for plugin in pytestconfig.pluginmanager.get_plugins():
+        observe = getattr(plugin, "observe_hooks", None)
+        if callable(observe):
+            observe(hooks)
+
+def _test_deadline(item) -> Optional[float]:
+    """Time budget of a test: deadline marker, then --test-deadline, then configuration"""
+    marker = item.get_closest_marker("deadline")
+    if marker is not None:
+        seconds = marker.args[0]
+    else:
+        seconds = item.config.getoption("--test-deadline")
+        if seconds is None:
+            seconds = get_config()["test_execution"].get("timeout_per_test")
+    return seconds or None
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Run setup, call and teardown of each test under its deadline, which bounds every request"""
+    with deadline_scope(_test_deadline(item), label="test deadline"):
+        yield
 
 def pytest_runtest_setup(item):
     """Setup for each test item"""
@@ -47,49 +232,73 @@ def pytest_runtest_setup(item):
             allure.dynamic.feature('Authentication API')
 
 @pytest.fixture(scope="session")
-def config() -> Dict[str, Any]:
+def config(pytestconfig) -> Dict[str, Any]:
     """
     Provide test configuration
     
+    Args:
+        pytestconfig: pytest configuration
+        
     Returns:
-        Configuration dictionary
+        Configuration dictionary, with the circuit breaker state file of this run
     """
-    return get_config()
+    settings = get_config()
+    health_gate = pytestconfig.pluginmanager.get_plugin("health_gate")
+    if health_gate is not None:
+        settings["circuit_breaker"] = health_gate.breaker_config
+    return settings
 
 @pytest.fixture(scope="session")
-def api_client(config) -> Generator[APIClient, None, None]:
+def api_client(config, pytestconfig) -> Generator[APIClient, None, None]:
     """
     Provide API client instance
     
     Args:
         config: Test configuration
+        pytestconfig: pytest configuration
         
     Yields:
         API client instance
     """
-    client = APIClient(config)
+    fault_injection = pytestconfig.pluginmanager.get_plugin("fault_injection")
+    client = APIClient(config, fault_injector=fault_injection.injector if fault_injection else None)
+    _observe_hooks(pytestconfig, client.hooks)
     yield client
+    
+    if config["reporting"].get("performance_metrics", False):
+        # Rendered into reports/metrics/metrics.json with the other reports
+        pytestconfig.pluginmanager.get_plugin("event_log").record("metrics", snapshot=client.metrics.snapshot())
     client.close()
 
 @pytest.fixture(scope="session")
-def data_provider() -> DataProvider:
+def data_provider(pytestconfig) -> DataProvider:
     """
     Provide data provider instance
     
+    Args:
+        pytestconfig: pytest configuration
+        
     Returns:
         Data provider instance
     """
-    return DataProvider()
+    provider = DataProvider()
+    _observe_hooks(pytestconfig, provider.hooks)
+    return provider
 
 @pytest.fixture(scope="session")
-def validator() -> ResponseValidator:
+def validator(pytestconfig) -> ResponseValidator:
     """
     Provide response validator instance
     
+    Args:
+        pytestconfig: pytest configuration
+        
     Returns:
         Response validator instance
     """
-    return ResponseValidator()
+    response_validator = ResponseValidator()
+    _observe_hooks(pytestconfig, response_validator.hooks)
+    return response_validator
 
 @pytest.fixture(scope="session")
 def test_helper() -> TestHelper:
@@ -101,44 +310,131 @@ def test_helper() -> TestHelper:
     """
     return TestHelper()
 
+@pytest.fixture(scope="session")
+def data_generator() -> SeededDataGenerator:
+    """
+    Provide seeded data generator instance
+    
+    Returns:
+        Seeded data generator instance
+    """
+    return SeededDataGenerator()
+
+# Resource kinds that can be leased, with the fixture leasing them
+LEASED_FIXTURES = {"products": "leased_product", "users": "leased_user", "carts": "leased_cart"}
+
+@pytest.fixture(scope="session")
+def resource_pools(request, api_client, data_generator, config) -> Generator[ResourcePoolManager, None, None]:
+    """
+    Provide pools of pre-created resources, warmed for this worker's share of the collected tests
+
+    Every xdist worker collects the whole session but runs only part of it, so the
+    expected leases are split evenly across workers; leases beyond that are created
+    on demand.
+    
+    Args:
+        request: pytest request object
+        api_client: API client instance
+        data_generator: Seeded data generator instance
+        config: Test configuration
+        
+    Yields:
+        Resource pool manager
+    """
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    factories = {
+        "products": lambda n: data_generator.product_data(f"resource-pool/{worker_id}/products/{n}"),
+        "users": lambda n: data_generator.user_data(f"resource-pool/{worker_id}/users/{n}"),
+        "carts": lambda n: data_generator.cart_data(f"resource-pool/{worker_id}/carts/{n}", user_id=1),
+    }
+    manager = ResourcePoolManager(api_client, factories, config.get("resource_pool"))
+    expected = {
+        resource: sum(1 for item in request.session.items if fixture_name in item.fixturenames)
+        for resource, fixture_name in LEASED_FIXTURES.items()
+    }
+    workers = getattr(request.config, "workerinput", {}).get("workercount", 1)
+    manager.warm({resource: math.ceil(count / workers) for resource, count in expected.items()})
+    yield manager
+    manager.close()
+    
+    cleanup = request.config.pluginmanager.get_plugin("resource_cleanup")
+    for resource, ids in manager.created_ids().items():
+        cleanup.register(resource, ids)
+
+@pytest.fixture
+def leased_product(resource_pools) -> Generator[Lease, None, None]:
+    """
+    Lease a pre-created product exclusively for one test
+    
+    Yields:
+        Lease with the product id and creation data; call mark_deleted() after deleting it
+    """
+    with resource_pools.lease("products") as lease:
+        yield lease
+
 @pytest.fixture
-def random_product_data(test_helper) -> Dict[str, Any]:
+def leased_user(resource_pools) -> Generator[Lease, None, None]:
     """
-    Provide random product test data
+    Lease a pre-created user exclusively for one test
+    
+    Yields:
+        Lease with the user id and creation data; call mark_deleted() after deleting it
+    """
+    with resource_pools.lease("users") as lease:
+        yield lease
+
+@pytest.fixture
+def leased_cart(resource_pools) -> Generator[Lease, None, None]:
+    """
+    Lease a pre-created cart exclusively for one test
+    
+    Yields:
+        Lease with the cart id and creation data; call mark_deleted() after deleting it
+    """
+    with resource_pools.lease("carts") as lease:
+        yield lease
+
+@pytest.fixture
+def random_product_data(request, data_generator) -> Dict[str, Any]:
+    """
+    Provide random product test data, reproducible per test node id
     
     Args:
-        test_helper: Test helper instance
+        request: pytest request object
+        data_generator: Seeded data generator instance
         
     Returns:
         Random product data
     """
-    return test_helper.generate_product_data()
+    return data_generator.product_data(request.node.nodeid)
 
 @pytest.fixture
-def random_user_data(test_helper) -> Dict[str, Any]:
+def random_user_data(request, data_generator) -> Dict[str, Any]:
     """
-    Provide random user test data
+    Provide random user test data, reproducible per test node id
     
     Args:
-        test_helper: Test helper instance
+        request: pytest request object
+        data_generator: Seeded data generator instance
         
     Returns:
         Random user data
     """
-    return test_helper.generate_user_data()
+    return data_generator.user_data(request.node.nodeid)
 
 @pytest.fixture
-def random_cart_data(test_helper) -> Dict[str, Any]:
+def random_cart_data(request, data_generator) -> Dict[str, Any]:
     """
-    Provide random cart test data
+    Provide random cart test data, reproducible per test node id
     
     Args:
-        test_helper: Test helper instance
+        request: pytest request object
+        data_generator: Seeded data generator instance
         
     Returns:
         Random cart data
     """
-    return test_helper.generate_cart_data(user_id=1)
+    return data_generator.cart_data(request.node.nodeid, user_id=1)
 
 @pytest.fixture
 def auth_credentials() -> Dict[str, str]:
@@ -185,10 +481,13 @@ def add_allure_environment_info(config):
     allure.dynamic.label('base_url', config['base_url'])
 
 @pytest.fixture
-def capture_request_response():
+def capture_request_response(pytestconfig):
     """
-    Fixture to capture and attach request/response data to Allure
+    Fixture to capture request/response data into the event log (and Allure, when it is recording)
     """
+    event_log = pytestconfig.pluginmanager.get_plugin("event_log")
+    allure_recording = pytestconfig.pluginmanager.has_plugin("allure_listener")
+    
     def _capture(response, test_name: str = "API Request"):
         """
         Capture request and response data
@@ -197,43 +496,62 @@ def capture_request_response():
             response: HTTP response object
             test_name: Name for the test step
         """
-        with allure.step(f"{test_name}: {response.request.method} {response.url}"):
-            # Attach request details
-            request_body = response.request.body
-            # Convert bytes to string for JSON serialization
-            if isinstance(request_body, bytes):
-                try:
-                    request_body = request_body.decode('utf-8')
-                except UnicodeDecodeError:
-                    request_body = str(request_body)
-            
-            request_data = {
-                "method": response.request.method,
-                "url": str(response.url),
-                "headers": dict(response.request.headers),
-                "body": request_body
+        # Attach request details
+        request_body = response.request.body
+        # Convert bytes to string for JSON serialization
+        if isinstance(request_body, bytes):
+            try:
+                request_body = request_body.decode('utf-8')
+            except UnicodeDecodeError:
+                request_body = str(request_body)
+        
+        request_data = {
+            "method": response.request.method,
+            "url": str(response.url),
+            "headers": dict(response.request.headers),
+            "body": request_body
+        }
+        
+        # Attach response details
+        response_data = {
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "response_time_seconds": response.elapsed.total_seconds()
+        }
+        
+        timings = getattr(response, "timings", None)
+        if timings:
+            response_data["timings_ms"] = {
+                phase: round(value * 1000, 3) if isinstance(value, float) else value
+                for phase, value in timings.items()
             }
-            
-            allure.attach(
-                json.dumps(request_data, indent=2),
-                name="Request Details",
-                attachment_type=allure.attachment_type.JSON
-            )
-            
-            # Attach response details
-            response_data = {
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "response_time_seconds": response.elapsed.total_seconds()
+        
+        spooled_body = getattr(response, "spooled_body", None)
+        if spooled_body is not None:
+            # Large bodies stay on disk; attach only where to find them
+            response_data["body"] = {
+                "spooled_to": spooled_body.path,
+                "size_bytes": spooled_body.size,
+                "sha256": spooled_body.sha256
             }
-            
+        else:
             try:
                 response_data["body"] = response.json()
             except:
                 response_data["body"] = response.text
-            
+        
+        event_log.record("capture", name=test_name, request=request_data, response=response_data)
+        if not allure_recording:
+            return
+        
+        with allure.step(f"{test_name}: {response.request.method} {response.url}"):
             allure.attach(
-                json.dumps(response_data, indent=2, default=str),
+                codec.dumps(request_data, indent=2),
+                name="Request Details",
+                attachment_type=allure.attachment_type.JSON
+            )
+            allure.attach(
+                codec.dumps(response_data, indent=2, default=str),
                 name="Response Details",
                 attachment_type=allure.attachment_type.JSON
             )
@@ -284,10 +602,11 @@ def assert_response():
     return _assert_response
 
 @pytest.fixture
-def cleanup_created_resources():
+def cleanup_created_resources(pytestconfig):
     """
-    Fixture to track and cleanup created resources
+    Fixture to track created resources; they are deleted in bulk at the end of the session
     """
+    cleanup = pytestconfig.pluginmanager.get_plugin("resource_cleanup")
     created_resources = {
         'products': [],
         'users': [],
@@ -298,6 +617,7 @@ def cleanup_created_resources():
         """Add resource to cleanup list"""
         if resource_type in created_resources:
             created_resources[resource_type].append(resource_id)
+            cleanup.register(resource_type, [resource_id])
     
     yield _add_resource
     
@@ -333,9 +653,42 @@ def pytest_runtest_logreport(report):
                 attachment_type=allure.attachment_type.TEXT
             )
 
+def _combination_options(config) -> tuple:
+    """Read combination strength and shard options"""
+    strength = parse_strength(config.getoption("--combination-strength"))
+    shard_index, shard_count = (int(part) for part in config.getoption("--combination-shard").split("/"))
+    return strength, shard_index, shard_count
+
 # Custom pytest markers for data-driven tests
 def pytest_generate_tests(metafunc):
     """Generate parametrized tests based on test data"""
+    strength, shard_index, shard_count = _combination_options(metafunc.config)
+    
+    if "combination_data" in metafunc.fixturenames:
+        marker = metafunc.definition.get_closest_marker("combinations")
+        if marker is None:
+            raise pytest.UsageError(f"{metafunc.definition.nodeid} uses combination_data without a combinations marker")
+        
+        data_provider = DataProvider()
+        cases = list(data_provider.iter_test_data_combinations(
+            marker.kwargs.get("base", {}),
+            marker.kwargs["variations"],
+            strength=marker.kwargs.get("strength", strength),
+            shard_index=shard_index,
+            shard_count=shard_count
+        ))
+        ids = [f"combo{shard_index + i * shard_count}" for i in range(len(cases))]
+        metafunc.parametrize("combination_data", cases, ids=ids)
+    
+    for suite in ("products", "users", "carts"):
+        fixture_name = f"{suite}_parameter_data"
+        if fixture_name in metafunc.fixturenames:
+            data_provider = DataProvider()
+            test_data = list(data_provider.get_parametrized_data(
+                suite, strength=strength, shard_index=shard_index, shard_count=shard_count
+            ))
+            metafunc.parametrize(fixture_name, test_data)
+    
     if "product_test_data" in metafunc.fixturenames:
         data_provider = DataProvider()
         test_data = data_provider.get_positive_test_data("products")
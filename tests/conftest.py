@@ -0,0 +1,50 @@
+import pytest
+from typing import Any, Callable, Dict, Generator, Optional
+from config import get_config
+from utils import APIClient
+from utils.fault_injection import FaultInjector, FaultProfile, FaultRule
+from utils.stub_server import StubServer
+
+
+@pytest.fixture(scope="module")
+def stub_url() -> Generator[str, None, None]:
+    """
+    Run a local FakeStore API stub for the tests of one module
+
+    Yields:
+        Base URL of the stub
+    """
+    with StubServer() as server:
+        yield server.url
+
+
+@pytest.fixture
+def stub_client_factory(stub_url) -> Generator[Callable[..., APIClient], None, None]:
+    """
+    Provide a factory of API clients talking to the stub, closed after the test
+
+    The factory takes an optional fault rule for the "/products/{id}" endpoint and
+    configuration sections replacing those of the test settings.
+
+    Args:
+        stub_url: Base URL of the module's stub
+
+    Yields:
+        Client factory
+    """
+    clients = []
+
+    def _make(rule_spec: Optional[Dict[str, Any]] = None, **sections: Any) -> APIClient:
+        config = get_config()
+        config["base_url"] = stub_url
+        config.update(sections)
+        injector = None
+        if rule_spec is not None:
+            injector = FaultInjector(FaultProfile([FaultRule({"endpoint": "/products/{id}", **rule_spec})]))
+        client = APIClient(config, fault_injector=injector)
+        clients.append(client)
+        return client
+
+    yield _make
+    for client in clients:
+        client.close()
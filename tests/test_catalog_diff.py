@@ -0,0 +1,81 @@
+import copy
+import pytest
+import allure
+from utils.catalog_diff import CatalogDiff
+
+USERS = [{"id": i, "username": f"user{i}", "__v": 0} for i in range(1, 11)]
+PRODUCTS = [{"id": i, "title": f"Product {i}", "price": float(i), "__v": 0} for i in range(1, 251)]
+
+
+class InMemoryCatalogDiff(CatalogDiff):
+    """Catalog diff reading collections from memory instead of the environments"""
+
+    def __init__(self, collections, snapshot_dir):
+        super().__init__(resources=("products", "users"), snapshot_dir=str(snapshot_dir))
+        for client in self.clients.values():
+            client.close()
+        self.collections = collections
+        self.fetched_buckets = []
+
+    def _fetch_collection(self, env, resource):
+        return copy.deepcopy(self.collections[env][resource])
+
+    def _fetch_buckets(self, env, resource, buckets, snapshots):
+        self.fetched_buckets.append((env, resource, sorted(buckets)))
+        bucket_of = snapshots[env].bucket_of
+        return {record["id"]: copy.deepcopy(record)
+                for record in self.collections[env][resource] if bucket_of(record["id"]) in buckets}
+
+
+@pytest.fixture
+def collections():
+    target_products = copy.deepcopy(PRODUCTS)
+    target_products[6]["price"] = 99.0                                   # id 7, bucket 0
+    target_products[149]["__v"] = 3                                      # id 150, ignored field
+    target_products = [p for p in target_products if p["id"] != 205]     # bucket 2
+    target_products.append({"id": 260, "title": "Product 260", "price": 260.0, "__v": 0})
+    return {
+        "staging": {"products": copy.deepcopy(PRODUCTS), "users": copy.deepcopy(USERS)},
+        "prod": {"products": target_products, "users": copy.deepcopy(USERS)},
+    }
+
+
+@allure.feature("Environment Comparison")
+@allure.story("Catalog Diff")
+class TestCatalogDiff:
+    """Bucketed digest comparison of two in-memory catalogs"""
+
+    @allure.title("Identical collections are skipped at the root digest")
+    def test_identical_roots_are_skipped(self, collections, tmp_path):
+        report = InMemoryCatalogDiff(collections, tmp_path).run()
+
+        users = report["resources"]["users"]
+        assert users["identical"] is True
+        assert users["buckets_compared"] == 0
+        assert report["partial"] is False
+
+    @allure.title("Only differing buckets, ids and fields are reported")
+    def test_reports_only_differences(self, collections, tmp_path):
+        report = InMemoryCatalogDiff(collections, tmp_path).run()
+
+        products = report["resources"]["products"]
+        assert products["identical"] is False
+        assert products["buckets_compared"] == 3
+        assert products["buckets_differing"] == 2
+        assert products["only_in_source"] == [205]
+        assert products["only_in_target"] == [260]
+        assert products["changed"] == {"7": [{"field": "price", "source": 7.0, "target": 99.0}]}
+
+    @allure.title("A recheck refetches only differing buckets and is marked partial")
+    def test_recheck_is_partial(self, collections, tmp_path):
+        InMemoryCatalogDiff(collections, tmp_path).run()
+        collections["prod"] = copy.deepcopy(collections["staging"])
+
+        diff = InMemoryCatalogDiff(collections, tmp_path)
+        report = diff.recheck()
+
+        assert report["partial"] is True
+        assert report["resources"]["products"]["identical"] is None
+        assert report["resources"]["products"]["buckets_compared"] == 2
+        assert {tuple(buckets) for _, resource, buckets in diff.fetched_buckets
+                if resource == "products"} == {(0, 2)}
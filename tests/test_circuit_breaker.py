@@ -0,0 +1,83 @@
+import time
+import pytest
+import allure
+import requests
+from utils.circuit_breaker import BreakerStore, CircuitBreakerRegistry, CircuitOpenError, OPEN
+
+NO_RETRY = {"retry_count": 0, "retry_delay": 0}
+
+
+def breaker_settings(tmp_path, reset_timeout=30):
+    return {"enabled": True, "failure_threshold": 2, "reset_timeout": reset_timeout,
+            "state_path": str(tmp_path / "breakers.sqlite")}
+
+
+@allure.feature("Resilience")
+@allure.story("Circuit Breaker")
+class TestCircuitBreaker:
+    """Per-host and per-endpoint circuits shared through a SQLite store"""
+
+    @allure.title("Consecutive failures open the circuit and later calls are rejected without a request")
+    def test_opens_after_threshold(self, stub_client_factory, tmp_path):
+        client = stub_client_factory({"faults": {"reset": 1.0}}, retry=NO_RETRY,
+                                     circuit_breaker=breaker_settings(tmp_path))
+
+        for _ in range(2):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                client.products.get_by_id(1)
+
+        started = time.monotonic()
+        with pytest.raises(CircuitOpenError):
+            client.products.get_by_id(1)
+        assert time.monotonic() - started < 0.1
+        assert client.metrics.counter("circuit_rejected") == 1
+
+    @allure.title("A successful half-open probe closes the circuit")
+    def test_half_open_probe_closes(self, stub_client_factory, tmp_path):
+        breakers = breaker_settings(tmp_path, reset_timeout=0.2)
+        failing = stub_client_factory({"faults": {"reset": 1.0}}, retry=NO_RETRY, circuit_breaker=breakers)
+        for _ in range(2):
+            with pytest.raises(requests.exceptions.ConnectionError):
+                failing.products.get_by_id(1)
+
+        healthy = stub_client_factory(retry=NO_RETRY, circuit_breaker=breakers)
+        with pytest.raises(CircuitOpenError):
+            healthy.products.get_by_id(1)
+        time.sleep(0.3)
+
+        assert healthy.products.get_by_id(1).status_code == 200
+        assert all(state["state"] == "closed" for state in healthy.breakers.store.snapshot().values())
+
+    @allure.title("Circuit state is shared by every process using the same store")
+    def test_state_shared_through_store(self, tmp_path):
+        path = tmp_path / "shared.sqlite"
+        first = CircuitBreakerRegistry({"failure_threshold": 1}, BreakerStore(path))
+        second = CircuitBreakerRegistry({"failure_threshold": 1}, BreakerStore(path))
+        url = "http://api.example.test/products/1"
+
+        with pytest.raises(requests.exceptions.ConnectTimeout):
+            with first.guard(url, "products.by_id"):
+                raise requests.exceptions.ConnectTimeout("down")
+
+        assert second.store.get(CircuitBreakerRegistry.host_key(url))["state"] == OPEN
+        with pytest.raises(CircuitOpenError):
+            with second.guard(url, None):
+                pass
+
+    @allure.title("Successes on a clean circuit only read the store")
+    def test_success_on_clean_circuit_does_not_write(self, tmp_path, monkeypatch):
+        registry = CircuitBreakerRegistry({"failure_threshold": 3}, BreakerStore(tmp_path / "breakers.sqlite"))
+        url = "http://api.example.test/products/1"
+        writes = []
+        record_success = registry.store.record_success
+        monkeypatch.setattr(registry.store, "record_success", lambda key: writes.append(key) or record_success(key))
+
+        with pytest.raises(requests.exceptions.ConnectTimeout):
+            with registry.guard(url, None):
+                raise requests.exceptions.ConnectTimeout("down")
+        for _ in range(3):
+            with registry.guard(url, None) as guard:
+                guard.record(200)
+
+        assert writes == [CircuitBreakerRegistry.host_key(url)]
+        assert registry.store.get(CircuitBreakerRegistry.host_key(url))["failures"] == 0
@@ -0,0 +1,113 @@
+import threading
+import time
+import allure
+import requests
+from utils.cleanup import LEFTOVER_NAME, CleanupEngine, CleanupRegistry
+from utils.deadline import deadline_scope
+
+
+def _response(status: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"{}"
+    return response
+
+
+class FakeService:
+    """Resource service answering deletes from a per-id script of status codes"""
+
+    def __init__(self, resource, log, statuses=None, delay=0.0):
+        self.resource = resource
+        self.log = log
+        self.statuses = statuses or {}
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def delete(self, resource_id):
+        time.sleep(self.delay)
+        with self._lock:
+            self.log.append((self.resource, resource_id))
+            script = self.statuses.get(resource_id, [200])
+            status = script.pop(0) if len(script) > 1 else script[0]
+        return _response(status)
+
+
+class FakeClient:
+    """Just the services of an APIClient that cleanup deletes through"""
+
+    def __init__(self, statuses=None, delay=0.0):
+        self.log = []
+        for resource in ("carts", "users", "products"):
+            setattr(self, resource, FakeService(resource, self.log, (statuses or {}).get(resource), delay))
+
+    def deletes(self, resource, resource_id=None):
+        return sum(1 for entry in self.log
+                   if entry[0] == resource and resource_id in (None, entry[1]))
+
+
+def make_engine(client, **options):
+    return CleanupEngine(client, **{"batch_size": 5, "max_workers": 4, "retries": 2, "backoff": 0, **options})
+
+
+@allure.feature("Test Data")
+@allure.story("Cleanup")
+class TestCleanup:
+    """Deleting created resources in order, with retries, deadlines and leftovers"""
+
+    @allure.title("Carts are deleted before the users and products they reference")
+    def test_carts_deleted_first(self):
+        client = FakeClient()
+
+        report = make_engine(client).run({"products": [1, 2], "users": [3], "carts": [4, 5]})
+
+        order = [resource for resource, _ in client.log]
+        assert order == ["carts", "carts", "users", "products", "products"]
+        assert report.deleted == {"carts": 2, "users": 1, "products": 2}
+        assert report.failed == {}
+
+    @allure.title("A delete failing with 503 is retried until it succeeds")
+    def test_transient_failure_is_retried(self):
+        client = FakeClient({"products": {1: [503, 503, 200]}})
+
+        report = make_engine(client).run({"products": [1, 2]})
+
+        assert client.deletes("products", 1) == 3
+        assert client.deletes("products", 2) == 1
+        assert report.deleted == {"products": 2}
+        assert report.leftover_ids() == {}
+
+    @allure.title("A delete failing with 403 is neither retried nor left over")
+    def test_permanent_failure_is_not_retried(self):
+        client = FakeClient({"users": {7: [403]}, "products": {8: [503]}})
+
+        report = make_engine(client).run({"users": [7], "products": [8]})
+
+        assert client.deletes("users", 7) == 1
+        assert report.failed["users"] == [{"id": 7, "error": "permanent HTTP 403"}]
+        assert report.failed["products"] == [{"id": 8, "error": "HTTP 503"}]
+        assert report.leftover_ids() == {"products": [8]}
+
+    @allure.title("Deletes cut by the cleanup deadline are reported and left over")
+    def test_deadline_cut_is_reported(self):
+        client = FakeClient(delay=0.05)
+
+        with deadline_scope(0.08, label="cleanup deadline"):
+            report = make_engine(client, batch_size=2, max_workers=2).run({"products": list(range(1, 7))})
+
+        cut = [failure["id"] for failure in report.failed["products"]
+               if failure["error"] == "cleanup deadline exceeded"]
+        assert cut
+        assert client.deletes("products") + len(cut) == 6
+        assert report.deleted == {"products": 6 - len(cut)}
+        assert report.leftover_ids() == {"products": cut}
+
+    @allure.title("Leftover ids are claimed by exactly one later run")
+    def test_leftovers_claimed_by_next_run(self, tmp_path):
+        CleanupRegistry(str(tmp_path), name=LEFTOVER_NAME).add_many("products", [8, 9])
+        CleanupRegistry(str(tmp_path), run_id="next").add("carts", 3)
+
+        ids, files = CleanupRegistry.collect(str(tmp_path), "next")
+
+        assert ids == {"carts": [3], "products": [8, 9]}
+        assert not (tmp_path / f"{LEFTOVER_NAME}.jsonl").exists()
+        assert CleanupRegistry.collect(str(tmp_path), "other") == ({}, [])
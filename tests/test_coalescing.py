@@ -0,0 +1,118 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import allure
+import requests
+from utils.coalescing import SingleFlight
+from utils.deadline import DeadlineExceeded, deadline_scope
+
+
+def _response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.headers["X-Body"] = body.decode()
+    return response
+
+
+def run_concurrently(flight, fn, callers=4):
+    """Call flight.do from several threads once the first caller is leading"""
+    leading = threading.Event()
+    release = threading.Event()
+
+    def led():
+        leading.set()
+        release.wait(2)
+        return fn()
+
+    def follow():
+        leading.wait(2)
+        return flight.do("key", fn)
+
+    with ThreadPoolExecutor(callers) as pool:
+        first = pool.submit(flight.do, "key", led)
+        others = [pool.submit(follow) for _ in range(callers - 1)]
+        # Let the followers reach the in-flight call before the leader finishes
+        time.sleep(0.1)
+        release.set()
+        futures = [first] + others
+        return [future.exception() or future.result() for future in futures]
+
+
+@allure.feature("API Client")
+@allure.story("Request Coalescing")
+class TestSingleFlight:
+    """Concurrent identical requests sharing one network call"""
+
+    @allure.title("Concurrent callers share one call and get independent copies")
+    def test_concurrent_callers_share_one_call(self):
+        calls = []
+
+        def fn():
+            calls.append(1)
+            return _response(b"payload")
+
+        results = run_concurrently(SingleFlight(), fn)
+
+        assert len(calls) == 1
+        assert [shared for _, shared in results] == [False, True, True, True]
+        responses = [response for response, _ in results]
+        assert all(response.content == b"payload" for response in responses)
+        assert len({id(response) for response in responses}) == len(responses)
+
+        responses[1].headers["X-Body"] = "changed"
+        responses[1]._content = b"changed"
+        assert responses[2].headers["X-Body"] == "payload"
+        assert responses[0].content == responses[2].content == b"payload"
+
+    @allure.title("Followers get a fresh exception chained to the leader's error")
+    def test_followers_get_fresh_chained_error(self):
+        error = requests.exceptions.ConnectionError("refused")
+
+        def fn():
+            raise error
+
+        results = run_concurrently(SingleFlight(), fn, callers=3)
+
+        assert results[0] is error
+        for follower_error in results[1:]:
+            assert isinstance(follower_error, requests.exceptions.ConnectionError)
+            assert follower_error is not error
+            assert follower_error.__cause__ is error
+        assert results[1] is not results[2]
+
+    @allure.title("A follower stops waiting when its own deadline runs out")
+    def test_follower_wait_respects_deadline(self):
+        flight = SingleFlight()
+        leading = threading.Event()
+        release = threading.Event()
+
+        def led():
+            leading.set()
+            release.wait(2)
+            return _response(b"late")
+
+        with ThreadPoolExecutor(1) as pool:
+            leader = pool.submit(flight.do, "key", led)
+            leading.wait(2)
+            started = time.monotonic()
+            with deadline_scope(0.1, "follower"):
+                with pytest.raises(DeadlineExceeded):
+                    flight.do("key", led)
+            waited = time.monotonic() - started
+            release.set()
+            assert leader.result()[1] is False
+
+        assert waited < 0.5
+
+    @allure.title("Identical concurrent client requests are counted as coalesced")
+    def test_client_counts_coalesced_requests(self, stub_client_factory):
+        client = stub_client_factory({"latency": {"distribution": "fixed", "ms": 200}})
+
+        with ThreadPoolExecutor(4) as pool:
+            responses = list(pool.map(lambda _: client.products.get_by_id(1), range(4)))
+
+        assert all(response.json()["id"] == 1 for response in responses)
+        assert client.fault_injector.report()["attempts"] == 1
+        assert client.metrics.counter("coalesced_requests", endpoint="products.get_by_id") == 3
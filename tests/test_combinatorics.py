@@ -0,0 +1,51 @@
+from collections import Counter
+from itertools import combinations, product
+import allure
+from utils.combinatorics import CombinationGenerator, shard
+
+
+def uncovered_interactions(parameters, rows, t):
+    """Value combinations of every t parameters that no row contains"""
+    missing = []
+    for names in combinations(parameters, t):
+        seen = {tuple(row[name] for name in names) for row in rows}
+        missing.extend((names, values) for values in product(*(parameters[name] for name in names))
+                       if values not in seen)
+    return missing
+
+
+@allure.feature("Test Data")
+@allure.story("Combinations")
+class TestCombinations:
+    """Covering arrays and deterministic sharding of generated combinations"""
+
+    @allure.title("Pairwise rows of 12 fields x 6 values cover every value pair")
+    def test_pairwise_covers_every_pair(self):
+        parameters = {f"field_{i}": [f"v{j}" for j in range(6)] for i in range(12)}
+
+        rows = list(CombinationGenerator(parameters, strength=2))
+
+        assert uncovered_interactions(parameters, rows, 2) == []
+        assert len(rows) < 100  # against 6 ** 12 = 2176782336 for the full product
+
+    @allure.title("3-wise rows cover every value triple")
+    def test_three_wise_covers_every_triple(self):
+        parameters = {f"field_{i}": [0, 1, 2] for i in range(5)}
+
+        rows = list(CombinationGenerator(parameters, strength=3))
+
+        assert uncovered_interactions(parameters, rows, 3) == []
+        assert len(rows) < 3 ** 5
+
+    @allure.title("Shards are disjoint, deterministic and together give the full set")
+    def test_shards_partition_rows(self):
+        parameters = {f"field_{i}": [f"v{j}" for j in range(6)] for i in range(12)}
+        generator = CombinationGenerator(parameters, strength=2, seed=7)
+        rows = [tuple(row.values()) for row in generator]
+
+        shards = [[tuple(row.values()) for row in shard(CombinationGenerator(parameters, strength=2, seed=7), i, 2)]
+                  for i in range(2)]
+
+        assert Counter(row for rows_of_shard in shards for row in rows_of_shard) == Counter(rows)
+        assert sum(len(rows_of_shard) for rows_of_shard in shards) == len(rows)
+        assert all(abs(len(a) - len(b)) <= 1 for a, b in combinations(shards, 2))
@@ -0,0 +1,83 @@
+import os
+import pytest
+import allure
+from utils.data_store import LRUCache, TestDataStore
+from utils.json_codec import codec
+
+
+@allure.feature("Test Data")
+@allure.story("Indexed Data Store")
+class TestDataStoreIndex:
+    """Indexed SQLite test data store built from test_data/*_test_data.json"""
+
+    @pytest.fixture
+    def data_dir(self, tmp_path):
+        data_dir = tmp_path / "test_data"
+        data_dir.mkdir()
+        cases = [{"test_type": ("positive", "negative", "boundary")[i % 3], "name": f"case_{i}", "data": {"i": i}}
+                 for i in range(30)]
+        codec.dump({"test_cases": cases, "categories": ["a"]}, data_dir / "products_test_data.json")
+        return data_dir
+
+    @pytest.fixture
+    def store(self, data_dir, tmp_path):
+        store = TestDataStore(data_dir, tmp_path / "store.sqlite", cache_size=4)
+        yield store
+        store.close()
+
+    @allure.title("Cases are filtered by test type in file order")
+    def test_filter_by_test_type(self, store):
+        negative = store.get_cases("products", "negative")
+
+        assert [case["name"] for case in negative] == [f"case_{i}" for i in range(1, 30, 3)]
+        assert store.count("products") == 30
+        assert store.count("users") == 0
+
+    @allure.title("Cases are looked up by name")
+    def test_get_case_by_name(self, store):
+        assert store.get_case_by_name("products", "case_7")["data"] == {"i": 7}
+        assert store.get_case_by_name("products", "missing") is None
+
+    @allure.title("Decoded cases are bounded by the LRU cache")
+    def test_cache_is_bounded(self, store):
+        for _ in store.iter_cases("products"):
+            pass
+
+        assert len(store.cache) == 4
+
+    @allure.title("Changed source files are re-indexed")
+    def test_rebuild_on_source_change(self, store, data_dir):
+        assert store.count("products") == 30
+
+        source = data_dir / "products_test_data.json"
+        codec.dump({"test_cases": [{"test_type": "positive", "name": "only"}]}, source)
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        assert [case["name"] for case in store.get_cases("products")] == ["only"]
+
+    @allure.title("A second store reuses the index built by the first")
+    def test_index_shared_between_stores(self, store, data_dir, tmp_path):
+        store.refresh()
+        other = TestDataStore(data_dir, tmp_path / "store.sqlite")
+
+        assert other.refresh() is False
+        assert other.count("products", "boundary") == 10
+        other.close()
+
+
+@allure.feature("Test Data")
+@allure.story("LRU Cache")
+class TestLRUCache:
+    """Bounded least recently used cache"""
+
+    @allure.title("Least recently used entries are evicted first")
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(2)
+        cache["a"] = 1
+        cache["b"] = 2
+        assert cache["a"] == 1
+        cache["c"] = 3
+
+        assert "b" not in cache
+        assert list(cache) == ["a", "c"]
@@ -0,0 +1,49 @@
+import time
+import pytest
+import allure
+from utils.deadline import DeadlineExceeded, current_deadline, deadline_scope
+
+
+@allure.feature("Resilience")
+@allure.story("Deadlines")
+class TestDeadlines:
+    """Per-test and per-endpoint deadlines bounding requests, retries and backoff"""
+
+    @allure.title("Nested scopes never extend the enclosing deadline")
+    def test_nested_scope_keeps_earlier_deadline(self):
+        with deadline_scope(1, label="outer") as outer:
+            with deadline_scope(60, label="inner") as inner:
+                assert inner.expires_at == outer.expires_at
+                assert current_deadline().label == "outer"
+            with deadline_scope(0.5, label="inner") as inner:
+                assert inner.expires_at < outer.expires_at
+
+    @allure.title("Tests run under the configured per-test deadline")
+    @pytest.mark.deadline(42)
+    def test_marker_sets_test_deadline(self):
+        deadline = current_deadline()
+
+        assert deadline.label == "test deadline"
+        assert deadline.seconds == 42
+
+    @allure.title("Slow responses fail once the deadline passes, not after the read timeout")
+    def test_read_timeout_capped_by_deadline(self, stub_client_factory):
+        client = stub_client_factory({"latency": {"distribution": "fixed", "ms": 2000}},
+                                     retry={"retry_count": 5, "retry_delay": 0})
+
+        started = time.monotonic()
+        with deadline_scope(0.3), pytest.raises(DeadlineExceeded):
+            client.products.get_by_id(1)
+
+        assert time.monotonic() - started < 1.0
+        assert client.metrics.counter("deadline_exceeded") == 1
+
+    @allure.title("Retries stop when the backoff would overrun the deadline")
+    def test_backoff_capped_by_deadline(self, stub_client_factory):
+        client = stub_client_factory({"faults": {"status_5xx": 1.0}}, retry={"retry_count": 5, "retry_delay": 1})
+
+        started = time.monotonic()
+        with deadline_scope(1.5), pytest.raises(DeadlineExceeded):
+            client.products.get_by_id(1)
+
+        assert time.monotonic() - started < 1.5
@@ -0,0 +1,77 @@
+import xml.etree.ElementTree as ET
+from pathlib import Path
+import pytest
+import allure
+from utils.event_log import EventLog, read_events
+from utils.json_codec import codec
+from utils.report_renderers import RunResults, render_reports
+
+
+@pytest.fixture
+def event_dir(tmp_path):
+    log = EventLog(tmp_path / "events-gw0.jsonl")
+    for nodeid, outcome in (("tests/test_a.py::TestA::test_ok", "passed"),
+                            ("tests/test_a.py::TestA::test_broken", "failed")):
+        log.write("test", nodeid=nodeid, worker="gw0", name=nodeid.rsplit("::", 1)[-1],
+                  location=["tests/test_a.py", 1, ""], markers=["smoke"], labels=[["feature", "Products API"]],
+                  title=None, description="")
+        log.write("phase", nodeid=nodeid, when="setup", outcome="passed", duration=0.01, start=1.0, stop=1.01)
+        log.write("request", nodeid=nodeid, method="GET", url="http://stub/products/1",
+                  endpoint="products.get_by_id", status=200, elapsed=0.02, error=None)
+        log.write("phase", nodeid=nodeid, when="call", outcome=outcome, duration=0.1, start=1.01, stop=1.11,
+                  longrepr="AssertionError: boom" if outcome == "failed" else None)
+        log.write("phase", nodeid=nodeid, when="teardown", outcome="passed", duration=0.01, start=1.11, stop=1.12)
+    log.write("metrics", nodeid=None, worker="gw0", snapshot={"counters": {"requests": 2}})
+    log.close()
+    # A process killed mid-write leaves a truncated last line behind
+    with open(tmp_path / "events-gw0.jsonl", "ab") as f:
+        f.write(b'{"event": "pha')
+    return tmp_path
+
+
+@allure.feature("Reporting")
+@allure.story("Event Log")
+class TestEventLog:
+    """Reports rendered after the run from the event log"""
+
+    @allure.title("Truncated events are skipped when reading the log")
+    def test_truncated_event_skipped(self, event_dir):
+        run = RunResults.load(event_dir)
+
+        assert sum(1 for _ in read_events(event_dir)) == 11
+        assert run.summary() == {"passed": 1, "failed": 1}
+
+    @allure.title("JUnit, Allure and metrics reports are rendered from the same log")
+    def test_render_reports(self, event_dir, tmp_path):
+        paths = render_reports(event_dir, ["junit", "allure", "metrics"], tmp_path / "reports")
+
+        suite = ET.parse(paths["junit"]).getroot().find("testsuite")
+        assert suite.get("tests") == "2" and suite.get("failures") == "1"
+
+        results = [codec.load(path) for path in Path(paths["allure"]).glob("*-result.json")]
+        assert sorted(result["status"] for result in results) == ["failed", "passed"]
+        assert {"name": "feature", "value": "Products API"} in results[0]["labels"]
+
+        metrics = codec.load(paths["metrics"])
+        assert metrics["endpoints"]["products.get_by_id"]["count"] == 2
+        assert metrics["counters"]["requests"] == 2
+
+    @allure.title("The HTML report lists every test with its requests")
+    def test_render_html(self, event_dir, tmp_path):
+        pytest.importorskip("jinja2")
+        paths = render_reports(event_dir, ["html"], tmp_path / "reports")
+
+        with open(paths["html"], encoding="utf-8") as f:
+            html = f.read()
+        assert "tests/test_a.py::TestA::test_broken" in html
+        assert "AssertionError: boom" in html
+
+    @allure.title("An event log root is read from its latest run directory")
+    def test_latest_run_is_read(self, tmp_path):
+        for run_id, nodeid in (("20260101-000000-aaaaaa", "tests/test_a.py::test_old"),
+                               ("20260102-000000-bbbbbb", "tests/test_a.py::test_new")):
+            log = EventLog(tmp_path / run_id / "events-main.jsonl")
+            log.write("test", nodeid=nodeid, worker="main")
+            log.close()
+
+        assert [event["nodeid"] for event in read_events(tmp_path)] == ["tests/test_a.py::test_new"]
@@ -0,0 +1,94 @@
+import random
+import pytest
+import allure
+import requests
+from utils.fault_injection import FaultRule
+
+RETRY = {"retry_count": 2, "retry_delay": 0}
+
+
+@allure.feature("Resilience")
+@allure.story("Fault Injection")
+class TestFaultInjection:
+    """Latency and faults injected at the transport against the local stub"""
+
+    @allure.title("Injected 5xx responses are retried by the client")
+    def test_status_5xx_is_retried(self, stub_client_factory):
+        client = stub_client_factory({"faults": {"status_5xx": 1.0}, "status_codes": [502]}, retry=RETRY)
+        injector = client.fault_injector
+
+        with pytest.raises(requests.exceptions.RetryError):
+            client.products.get_by_id(1)
+
+        report = injector.report()
+        assert report["attempts"] == 3
+        assert report["retries"] == 2
+        assert report["faults"]["status_5xx"] == 3
+
+    @allure.title("Injected connection resets surface as connection errors")
+    def test_reset_raises_connection_error(self, stub_client_factory):
+        client = stub_client_factory({"faults": {"reset": 1.0}}, retry=RETRY)
+        injector = client.fault_injector
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            client.products.get_by_id(1)
+        assert injector.report()["faults"]["reset"] == 3
+
+    @allure.title("Partial reads fail while reading the body")
+    def test_partial_read_breaks_body(self, stub_client_factory):
+        client = stub_client_factory({"faults": {"partial_read": 1.0}}, retry=RETRY)
+
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            client.products.get_by_id(1)
+
+    @allure.title("Only requests matching the endpoint template are affected")
+    def test_unmatched_requests_pass_through(self, stub_client_factory):
+        client = stub_client_factory({"faults": {"status_5xx": 1.0}}, retry=RETRY)
+        injector = client.fault_injector
+
+        response = client.products.get_all(limit=3)
+
+        assert response.status_code == 200
+        assert len(response.json()) == 3
+        assert injector.report()["faults"]["status_5xx"] == 0
+
+    @allure.title("Injected latency is added to each attempt")
+    def test_fixed_latency(self, stub_client_factory):
+        client = stub_client_factory({"latency": {"distribution": "fixed", "ms": 50}}, retry=RETRY)
+        injector = client.fault_injector
+
+        response = client.products.get_by_id(1)
+
+        assert response.status_code == 200
+        assert response.elapsed.total_seconds() >= 0.05
+        assert injector.report()["injected_latency"] == pytest.approx(0.05)
+
+
+@allure.feature("Resilience")
+@allure.story("Fault Profiles")
+class TestFaultProfile:
+    """Fault profile parsing and sampling"""
+
+    @allure.title("Templates match path parameters but not extra segments")
+    def test_template_matching(self):
+        rule = FaultRule({"endpoint": "/products/{id}", "methods": ["get"]})
+
+        assert rule.matches("GET", "/products/7?x=1")
+        assert not rule.matches("GET", "/products/category/jewelery")
+        assert not rule.matches("DELETE", "/products/7")
+
+    @allure.title("Fault rates above 1 are rejected")
+    def test_rates_are_validated(self):
+        with pytest.raises(ValueError):
+            FaultRule({"faults": {"reset": 0.6, "status_5xx": 0.6}})
+
+    @allure.title("Faults are drawn at the configured rates")
+    def test_fault_rates(self):
+        rule = FaultRule({"faults": {"status_429": 0.2, "reset": 0.1}})
+        rng = random.Random(1)
+
+        draws = [rule.sample_fault(rng) for _ in range(10000)]
+
+        assert draws.count("status_429") / len(draws) == pytest.approx(0.2, abs=0.02)
+        assert draws.count("reset") / len(draws) == pytest.approx(0.1, abs=0.02)
+        assert draws.count(None) / len(draws) == pytest.approx(0.7, abs=0.02)
@@ -0,0 +1,121 @@
+import itertools
+import socket
+import threading
+import time
+import pytest
+import allure
+import requests
+from config import get_config
+from utils.circuit_breaker import BreakerStore, CircuitBreakerRegistry
+from utils.deadline import current_deadline, deadline_scope
+from utils.hedging import HedgingPolicy
+from utils.metrics import MetricsCollector
+from utils.transport import FrameworkHTTPAdapter
+
+
+def _response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    return response
+
+
+@allure.feature("Resilience")
+@allure.story("Hedged Requests")
+class TestHedging:
+    """Second copies of slow idempotent requests racing the first"""
+
+    @allure.title("A hedge that answers first wins and the straggler is cancelled")
+    def test_hedge_wins_over_straggler(self):
+        metrics = MetricsCollector()
+        policy = HedgingPolicy({"enabled": True, "delay_ms": 50}, metrics)
+        calls = itertools.count()
+        straggler_cancelled = threading.Event()
+
+        started = time.monotonic()
+
+        def attempt():
+            if next(calls) == 0:
+                # Stands in for a blocked socket read, which cancelling the attempt interrupts
+                while time.monotonic() - started < 0.5:
+                    if current_deadline().expired:
+                        straggler_cancelled.set()
+                        raise requests.exceptions.ConnectionError("aborted")
+                    time.sleep(0.005)
+                return _response(b"slow")
+            return _response(b"fast")
+
+        assert policy.run(attempt, "products.get_by_id").content == b"fast"
+        assert time.monotonic() - started < 0.3
+        assert straggler_cancelled.wait(1)
+        assert policy.stats()["win_rate"] == 1.0
+        policy.close()
+
+    @allure.title("Hedges stop once the extra-load budget is spent")
+    def test_budget_caps_hedges(self):
+        metrics = MetricsCollector()
+        policy = HedgingPolicy({"enabled": True, "delay_ms": 10, "max_hedge_ratio": 0, "burst": 1}, metrics)
+
+        def attempt():
+            time.sleep(0.05)
+            return _response(b"ok")
+
+        for _ in range(3):
+            policy.run(attempt, "products.get_by_id")
+
+        assert metrics.counter("hedged_requests") == 1
+        assert metrics.counter("hedge_budget_exhausted") == 2
+        policy.close()
+
+    @allure.title("Hedging applies only to listed idempotent endpoints")
+    def test_only_idempotent_listed_endpoints(self):
+        policy = HedgingPolicy({"enabled": True, "endpoints": ["products.get_by_id"]}, MetricsCollector())
+
+        assert policy.applies("GET", "products.get_by_id", {})
+        assert not policy.applies("POST", "products.get_by_id", {})
+        assert not policy.applies("GET", "products.get_all", {})
+        assert not policy.applies("GET", "products.get_by_id", {"stream": True})
+
+    @allure.title("The client hedges slow GETs and returns a complete response")
+    def test_client_hedges_slow_get(self, stub_client_factory):
+        client_settings = get_config()["client"]
+        client = stub_client_factory(
+            {"latency": {"distribution": "fixed", "ms": 200}},
+            client={**client_settings, "hedging": {"enabled": True, "delay_ms": 50}}
+        )
+
+        response = client.products.get_by_id(1)
+
+        assert response.status_code == 200
+        assert response.json()["id"] == 1
+        assert client.metrics.counter("hedged_requests", endpoint="products.get_by_id") == 1
+
+    @allure.title("Cancelling an attempt interrupts its blocked socket read")
+    def test_cancel_aborts_socket_read(self):
+        with socket.socket() as listener:
+            listener.bind(("127.0.0.1", 0))
+            listener.listen()
+            session = requests.Session()
+            session.mount("http://", FrameworkHTTPAdapter())
+
+            with deadline_scope(float("inf")) as deadline:
+                threading.Timer(0.1, deadline.cancel).start()
+                started = time.monotonic()
+                with pytest.raises(requests.exceptions.RequestException):
+                    session.get(f"http://127.0.0.1:{listener.getsockname()[1]}/products/1", timeout=5)
+            session.close()
+
+        assert time.monotonic() - started < 1
+
+    @allure.title("Cancelled losers do not count as failures of the target")
+    def test_cancelled_attempt_leaves_breakers_alone(self, tmp_path):
+        registry = CircuitBreakerRegistry({"failure_threshold": 1}, BreakerStore(tmp_path / "breakers.sqlite"))
+        url = "http://api.example.test/products/1"
+
+        with deadline_scope(float("inf")) as deadline:
+            with pytest.raises(requests.exceptions.ConnectionError):
+                with registry.guard(url, "products.get_by_id"):
+                    deadline.cancel()
+                    raise requests.exceptions.ConnectionError("aborted")
+
+        assert registry.store.get(CircuitBreakerRegistry.host_key(url))["failures"] == 0
@@ -0,0 +1,81 @@
+import pytest
+import allure
+from utils.integrity import IntegrityChecker
+from utils.json_codec import codec
+
+
+@allure.feature("Data Integrity")
+@allure.story("Cart References")
+class TestCartReferences:
+    """Cross-resource referential integrity of carts"""
+    
+    @pytest.mark.regression
+    @pytest.mark.carts
+    @allure.title("Carts reference existing users and products")
+    @allure.description("Fetch all products, users and carts and verify every cart foreign key")
+    def test_carts_reference_existing_resources(self, api_client):
+        """Test that every cart references a real user and real products"""
+        with allure.step("Fetch collections and check references"):
+            report = IntegrityChecker(api_client).run()
+            report_path = report.save()
+        
+        allure.attach(
+            codec.dumps(report.to_dict(), indent=2, default=str),
+            name="Integrity Report",
+            attachment_type=allure.attachment_type.JSON
+        )
+        
+        assert report.is_clean, f"{report.summary()} - see {report_path}"
+
+
+@allure.feature("Data Integrity")
+@allure.story("Integrity Checker")
+class TestIntegrityChecker:
+    """Integrity checker behaviour on synthetic collections"""
+    
+    @pytest.fixture
+    def collections(self):
+        products = [{"id": i} for i in range(1, 6)]
+        users = [{"id": i} for i in range(1, 4)]
+        carts = [
+            {"id": 1, "userId": 1, "products": [{"productId": 1, "quantity": 2}]},
+            {"id": 2, "userId": 2, "products": [{"productId": 5, "quantity": 1}, {"productId": 3, "quantity": 4}]},
+        ]
+        return products, users, carts
+    
+    @pytest.mark.regression
+    def test_clean_collections(self, collections):
+        report = IntegrityChecker().check(*collections)
+        assert report.is_clean
+        assert report.totals == {"products": 5, "users": 3, "carts": 2, "references": 5}
+    
+    @pytest.mark.regression
+    def test_orphans_and_duplicates(self, collections):
+        products, users, carts = collections
+        products.append({"id": 2})
+        carts.append({"id": 3, "userId": 99, "products": [
+            {"productId": 42, "quantity": 1},
+            {"productId": 1, "quantity": 0},
+            {"productId": 1, "quantity": 1},
+        ]})
+        carts.append({"id": 1, "userId": 1, "products": []})
+        
+        report = IntegrityChecker().check(products, users, carts)
+        
+        assert report.counts == {
+            "products_duplicate_id": 1,
+            "carts_duplicate_id": 1,
+            "orphan_cart_user": 1,
+            "orphan_cart_product": 1,
+            "invalid_cart_quantity": 1,
+            "duplicate_cart_item": 1,
+        }
+        assert report.examples["orphan_cart_user"] == [{"cart_id": 3, "user_id": 99}]
+        assert report.examples["orphan_cart_product"] == [{"cart_id": 3, "product_id": 42}]
+    
+    @pytest.mark.regression
+    def test_examples_are_capped(self):
+        carts = [{"id": i, "userId": 0, "products": []} for i in range(1, 1001)]
+        report = IntegrityChecker(max_examples=10).check([], [], carts)
+        assert report.counts["orphan_cart_user"] == 1000
+        assert len(report.examples["orphan_cart_user"]) == 10
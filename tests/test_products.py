@@ -1,6 +1,7 @@
 import pytest
 import allure
 from typing import Dict, Any
+from utils.models import Product
 
 
 @allure.feature("Products API")
@@ -24,9 +25,9 @@ class TestGetProducts:
             assert validator.validate_content_type(response, "application/json")
             assert validator.validate_response_time(response, max_time=5.0)
             
-            data = response.json()
-            assert isinstance(data, list)
-            assert len(data) > 0
+            products = validator.validate_model(response, Product, many=True)
+            assert products is not None
+            assert len(products) > 0
     
     @pytest.mark.smoke
     @pytest.mark.products
@@ -60,8 +61,9 @@ class TestGetProducts:
             assert validator.validate_status_code(response, 200)
             assert validator.validate_required_fields(response, ["id", "title", "price", "category"])
             
-            data = response.json()
-            assert data["id"] == product_id
+            product = validator.validate_model(response, Product)
+            assert product is not None
+            assert product.id == product_id
     
     @pytest.mark.products
     @pytest.mark.negative
@@ -137,7 +139,8 @@ class TestCreateProduct:
     @pytest.mark.positive
     @allure.title("Create product successfully")
     @allure.description("Test creating a new product")
-    def test_create_product(self, api_client, validator, capture_request_response, random_product_data):
+    def test_create_product(self, api_client, validator, capture_request_response, random_product_data,
+                            cleanup_created_resources):
         """Test creating a product"""
         with allure.step("Send POST request to create product"):
             response = api_client.products.create(random_product_data)
@@ -146,6 +149,7 @@ class TestCreateProduct:
         with allure.step("Validate response"):
             assert validator.validate_status_code(response, 200)  # FakeStore returns 200 instead of 201
             assert validator.validate_required_fields(response, ["id"])
+            cleanup_created_resources("products", response.json()["id"])
     
     @pytest.mark.products
     @pytest.mark.negative
@@ -175,9 +179,10 @@ class TestUpdateProduct:
     @pytest.mark.positive
     @allure.title("Update product successfully")
     @allure.description("Test updating an existing product")
-    def test_update_product(self, api_client, validator, capture_request_response, random_product_data):
+    def test_update_product(self, api_client, validator, capture_request_response, random_product_data,
+                            leased_product):
         """Test updating a product"""
-        product_id = 1
+        product_id = leased_product.id
         
         with allure.step(f"Send PUT request to update product {product_id}"):
             response = api_client.products.update(product_id, random_product_data)
@@ -191,9 +196,9 @@ class TestUpdateProduct:
     @pytest.mark.positive
     @allure.title("Partially update product")
     @allure.description("Test partially updating a product using PATCH")
-    def test_patch_product(self, api_client, validator, capture_request_response):
+    def test_patch_product(self, api_client, validator, capture_request_response, leased_product):
         """Test patching a product"""
-        product_id = 1
+        product_id = leased_product.id
         partial_data = {"title": "Updated Test Product"}
         
         with allure.step(f"Send PATCH request to update product {product_id}"):
@@ -213,12 +218,13 @@ class TestDeleteProduct:
     @pytest.mark.positive
     @allure.title("Delete product successfully")
     @allure.description("Test deleting a product")
-    def test_delete_product(self, api_client, validator, capture_request_response):
+    def test_delete_product(self, api_client, validator, capture_request_response, leased_product):
         """Test deleting a product"""
-        product_id = 1
+        product_id = leased_product.id
         
         with allure.step(f"Send DELETE request to delete product {product_id}"):
             response = api_client.products.delete(product_id)
+            leased_product.mark_deleted()
             capture_request_response(response, f"Delete Product {product_id}")
         
         with allure.step("Validate response"):
@@ -0,0 +1,127 @@
+import itertools
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import allure
+import requests
+from utils.resource_pool import ResourcePool, ResourcePoolError
+
+
+def _response(status: int, body: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body).encode("utf-8")
+    return response
+
+
+class FakeService:
+    """In-memory products service recording the calls a pool makes"""
+
+    def __init__(self, ids=None, fail=False):
+        self.ids = ids if ids is not None else itertools.count(1)
+        self.fail = fail
+        self.gate = threading.Event()
+        self.gate.set()
+        self.updates = []
+
+    def create(self, data):
+        self.gate.wait(2)
+        if self.fail:
+            return _response(500, {"error": "unavailable"})
+        return _response(200, {**data, "id": next(self.ids)})
+
+    def update(self, record_id, data):
+        self.updates.append((record_id, data))
+        return _response(200, {**data, "id": record_id})
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+def make_pool(service, executor, recycle="restore"):
+    return ResourcePool("products", service, lambda n: {"title": f"Product {n}"}, executor, recycle)
+
+
+@allure.feature("Test Data")
+@allure.story("Resource Pools")
+class TestResourcePool:
+    """Leasing, recycling and error reporting of pre-created resources"""
+
+    @allure.title("An empty pool with nothing pending creates a resource on the spot")
+    def test_acquire_while_empty_creates(self, executor):
+        pool = make_pool(FakeService(), executor)
+
+        lease = pool.acquire(timeout=1)
+
+        assert lease.id == 1
+        assert lease.data == {"title": "Product 1"}
+        assert pool.created == [1]
+
+    @allure.title("An empty pool waits for a pending background creation")
+    def test_acquire_waits_for_pending_creation(self, executor):
+        service = FakeService()
+        service.gate.clear()
+        pool = make_pool(service, executor)
+        pool.fill(1)
+
+        threading.Timer(0.05, service.gate.set).start()
+        lease = pool.acquire(timeout=1)
+
+        assert lease.id == 1
+        assert pool.created == [1]
+
+    @allure.title("Restore puts the original data back and recycles the same resource")
+    def test_restore_recycles_same_resource(self, executor):
+        service = FakeService()
+        pool = make_pool(service, executor, recycle="restore")
+        lease = pool.acquire()
+
+        pool.release(lease)
+        recycled = pool.acquire()
+
+        assert recycled.id == lease.id
+        assert service.updates == [(lease.id, {"title": "Product 1"})]
+        assert pool.created == [1]
+
+    @allure.title("Replace, or a deleted lease, discards the resource and creates a new one")
+    @pytest.mark.parametrize("recycle,deleted", [("replace", False), ("restore", True)])
+    def test_replace_creates_new_resource(self, executor, recycle, deleted):
+        service = FakeService()
+        pool = make_pool(service, executor, recycle=recycle)
+        lease = pool.acquire()
+        if deleted:
+            lease.mark_deleted()
+
+        pool.release(lease)
+        replacement = pool.acquire()
+
+        assert replacement.id == 2
+        assert service.updates == []
+        assert pool.created == [1, 2]
+
+    @allure.title("A failing synchronous creation reports the background errors")
+    def test_errors_are_reported(self, executor):
+        pool = make_pool(FakeService(fail=True), executor)
+        pool.fill(2)
+
+        with pytest.raises(ResourcePoolError, match="2 background errors") as excinfo:
+            pool.acquire(timeout=1)
+
+        assert isinstance(excinfo.value.__cause__, requests.exceptions.HTTPError)
+        assert len(pool.errors) == 2
+        assert pool.created == []
+
+    @allure.title("An id handed out twice by the API is rejected")
+    def test_duplicate_id_is_rejected(self, executor):
+        pool = make_pool(FakeService(ids=itertools.repeat(21)), executor)
+        first = pool.acquire()
+
+        with pytest.raises(ResourcePoolError, match="id 21 again"):
+            pool.acquire()
+
+        assert first.id == 21
+        assert pool.created == [21]
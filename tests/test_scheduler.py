@@ -0,0 +1,66 @@
+import pytest
+import allure
+from utils.test_scheduler import DurationStore, TestScheduler
+
+
+class FakeItem:
+    """Just enough of a pytest item for scheduling"""
+
+    def __init__(self, nodeid, fixturenames=(), group=None):
+        self.nodeid = nodeid
+        self.fixturenames = list(fixturenames)
+        self.marker = pytest.mark.xdist_group(name=group).mark if group else None
+
+    def get_closest_marker(self, name):
+        return self.marker if name == "xdist_group" else None
+
+    def __repr__(self):
+        return self.nodeid
+
+
+def make_scheduler(tmp_path, durations, group_fixtures=()):
+    store = DurationStore(str(tmp_path / "durations.json"))
+    store.durations = dict(durations)
+    return TestScheduler(store, group_fixtures)
+
+
+@allure.feature("Test Execution")
+@allure.story("Duration Scheduling")
+class TestScheduling:
+    """Longest-first ordering, grouping and CI partitioning by recorded durations"""
+
+    @allure.title("Tests run longest first, unknown ones at the median duration")
+    def test_longest_first(self, tmp_path):
+        scheduler = make_scheduler(tmp_path, {"a": 1.0, "b": 5.0, "c": 3.0})
+        items = [FakeItem(nodeid) for nodeid in ("a", "b", "c", "new")]
+
+        assert [item.nodeid for item in scheduler.order(items)] == ["b", "c", "new", "a"]
+
+    @allure.title("Grouped tests stay together as one unit")
+    def test_groups_stay_one_unit(self, tmp_path):
+        scheduler = make_scheduler(tmp_path, {"a": 2.0, "b": 2.0, "c": 3.0, "d": 1.0, "e": 1.0},
+                                   group_fixtures=["shared_cart"])
+        items = [FakeItem("a", group="db"), FakeItem("b"), FakeItem("c"),
+                 FakeItem("d", group="db"), FakeItem("e", fixturenames=["shared_cart"])]
+
+        units = scheduler.units(items)
+
+        assert (3.0, [items[0], items[3]]) in units
+        assert (1.0, [items[4]]) in units
+        assert scheduler.group_of(items[4]) == "shared_cart"
+        assert scheduler.group_of(items[1]) is None
+        bucket = next(bucket for bucket in scheduler.partition(items, 3) if items[0] in bucket)
+        assert items[3] in bucket
+
+    @allure.title("CI split buckets have balanced predicted durations")
+    def test_ci_split_balance(self, tmp_path):
+        durations = {f"t{i}": float(d) for i, d in enumerate([9, 8, 7, 6, 5, 4, 3, 2, 1, 1, 1, 1])}
+        scheduler = make_scheduler(tmp_path, durations)
+        items = [FakeItem(nodeid) for nodeid in durations]
+
+        buckets = scheduler.partition(items, 4)
+        loads = [sum(scheduler.predicted(item) for item in bucket) for bucket in buckets]
+
+        assert sorted(item.nodeid for bucket in buckets for item in bucket) == sorted(durations)
+        assert max(loads) - min(loads) <= max(durations.values()) / 3
+        assert max(loads) <= sum(durations.values()) / 4 + 1
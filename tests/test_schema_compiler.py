@@ -0,0 +1,124 @@
+import copy
+import pytest
+import allure
+import jsonschema
+from utils.schema_compiler import SchemaCompiler
+from utils.json_codec import codec
+
+VALID_PRODUCT = {
+    "id": 1,
+    "title": "Fjallraven Backpack",
+    "price": 109.95,
+    "description": "Your perfect pack for everyday use",
+    "category": "men's clothing",
+    "image": "https://fakestoreapi.com/img/81fPKd-2AYL._AC_SL1500_.jpg",
+    "rating": {"rate": 3.9, "count": 120}
+}
+
+# (field path, replacement value); None path means the whole instance
+PRODUCT_MUTATIONS = [
+    (None, []),
+    (("id",), "1"),
+    (("id",), True),
+    (("id",), 1.0),
+    (("id",), 1.5),
+    (("id",), 0),
+    (("title",), ""),
+    (("price",), -0.01),
+    (("price",), 10),
+    (("category",), "toys"),
+    (("category",), 3),
+    (("image",), "not a uri"),
+    (("rating", "rate"), 5.1),
+    (("rating", "count"), -1),
+    (("rating",), "good"),
+]
+
+@pytest.fixture(scope="module")
+def product_schema():
+    return codec.load("test_data/schemas/product_schema.json")
+
+@pytest.fixture(scope="module")
+def compiled_validator(product_schema, tmp_path_factory):
+    compiler = SchemaCompiler(str(tmp_path_factory.mktemp("compiled_schemas")))
+    return compiler.get_validator("product_schema", product_schema)
+
+def mutate(instance, path, value):
+    if path is None:
+        return value
+    mutated = copy.deepcopy(instance)
+    target = mutated
+    for key in path[:-1]:
+        target = target[key]
+    target[path[-1]] = value
+    return mutated
+
+@allure.feature("Schema Compiler")
+class TestSchemaCompiler:
+    """Compiled validators must agree with jsonschema"""
+
+    @pytest.mark.regression
+    @pytest.mark.parametrize("path,value", PRODUCT_MUTATIONS)
+    def test_matches_jsonschema(self, product_schema, compiled_validator, path, value):
+        instance = mutate(VALID_PRODUCT, path, value)
+        expected_valid = jsonschema.Draft7Validator(product_schema).is_valid(instance)
+        # jsonschema only checks "uri" when rfc3987 is installed
+        if path == ("image",):
+            expected_valid = False
+
+        assert (compiled_validator(instance) is None) == expected_valid
+
+    @pytest.mark.regression
+    @pytest.mark.parametrize("missing", ["id", "rating"])
+    def test_required_fields(self, compiled_validator, missing):
+        instance = {k: v for k, v in VALID_PRODUCT.items() if k != missing}
+        message, path = compiled_validator(instance)
+        assert message == f"'{missing}' is a required property"
+        assert path == ()
+
+    @pytest.mark.regression
+    def test_error_path(self, compiled_validator):
+        message, path = compiled_validator(mutate(VALID_PRODUCT, ("rating", "count"), -1))
+        assert path == ("rating", "count")
+
+    @pytest.mark.regression
+    def test_unsupported_schema_falls_back(self, tmp_path):
+        compiler = SchemaCompiler(str(tmp_path))
+        assert compiler.get_validator("ref_schema", {"$ref": "#/definitions/x"}) is None
+
+    @pytest.mark.regression
+    def test_module_regenerated_on_schema_change(self, product_schema, tmp_path):
+        compiler = SchemaCompiler(str(tmp_path))
+        compiler.get_validator("product_schema", product_schema)
+        changed = copy.deepcopy(product_schema)
+        changed["properties"]["price"]["minimum"] = 200
+
+        validator = SchemaCompiler(str(tmp_path)).get_validator("product_schema", changed)
+        assert validator(VALID_PRODUCT) is not None
+        assert len(list(tmp_path.glob("product_schema_*.py"))) == 1
+
+    @pytest.mark.regression
+    def test_stale_sweep_spares_schemas_sharing_the_prefix(self, product_schema, tmp_path):
+        compiler = SchemaCompiler(str(tmp_path))
+        compiler.get_validator("product_schema_v2", product_schema)
+        compiler.get_validator("product_schema", {**product_schema, "title": "Product"})
+
+        assert len(list(tmp_path.glob("product_schema_v2_*.py"))) == 1
+
+    @pytest.mark.regression
+    def test_module_removed_before_load_is_regenerated(self, product_schema, tmp_path, monkeypatch):
+        compiler = SchemaCompiler(str(tmp_path))
+        compiler.get_validator("product_schema", product_schema)
+        load_module = SchemaCompiler._load_module
+
+        def load_after_removal(module_path):
+            # Another worker's sweep removing the module between the check and the load
+            if not hasattr(load_after_removal, "removed"):
+                load_after_removal.removed = True
+                module_path.unlink()
+            return load_module(module_path)
+
+        monkeypatch.setattr(SchemaCompiler, "_load_module", staticmethod(load_after_removal))
+        validator = SchemaCompiler(str(tmp_path)).get_validator("product_schema", product_schema)
+
+        assert validator(VALID_PRODUCT) is None
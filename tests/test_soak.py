@@ -0,0 +1,95 @@
+import random
+import time
+import pytest
+import allure
+from config import get_config
+from utils.circuit_breaker import CircuitOpenError
+from utils.json_codec import codec
+from utils.soak import Cusum, LatencyHistogram, PageHinkley, SoakRunner, soak_client_config
+
+
+@pytest.fixture
+def stub_client(stub_client_factory):
+    config = soak_client_config(get_config())
+    return stub_client_factory(circuit_breaker=config["circuit_breaker"], client=config["client"])
+
+
+# One window per scenario iteration keeps the tests independent of how fast the stub answers
+SOAK_CONFIG = {"window_seconds": 0, "warmup_windows": 3}
+
+
+@allure.feature("Soak")
+@allure.story("Drift Detection")
+class TestSoak:
+    """Rolling-window statistics and drift detection of long soak runs"""
+
+    @allure.title("Histogram percentiles stay within a bucket of the exact value")
+    def test_histogram_percentiles(self):
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.add(ms / 1000)
+
+        assert histogram.count == 1000
+        assert 0.95 <= histogram.percentile(0.95) <= 0.95 * 1.1
+        assert histogram.percentile(1.0) == pytest.approx(1.0)
+
+    @allure.title("Page-Hinkley and CUSUM flag latency creep but not stationary noise")
+    def test_detectors(self):
+        rng = random.Random(1)
+        stationary = [0.1 * rng.uniform(0.9, 1.1) for _ in range(200)]
+        creeping = [0.1 * (1 + i / 50) * rng.uniform(0.9, 1.1) for i in range(200)]
+
+        for detector in (PageHinkley, Cusum):
+            quiet, drifting = detector(), detector()
+            assert not any(quiet.update(value) for value in stationary)
+            assert any(drifting.update(value) for value in creeping)
+
+    @allure.title("Windows are checkpointed to disk and an interrupted run resumes")
+    def test_checkpoint_and_resume(self, stub_client, tmp_path):
+        report = SoakRunner(stub_client, soak_config=SOAK_CONFIG, output_dir=tmp_path).run(0.3)
+
+        with open(tmp_path / "windows.jsonl", "rb") as f:
+            windows = [codec.loads(line) for line in f]
+        assert report["windows"] == len(windows) >= 1
+        assert windows[0]["series"]["all"]["errors"] == 0
+        assert {"products.get", "products.churn", "carts.user"} <= set(windows[0]["series"])
+
+        resumed = SoakRunner(stub_client, soak_config=SOAK_CONFIG, output_dir=tmp_path)
+        assert resumed.resume()
+        first = report
+        report = resumed.run(first["elapsed_seconds"] + 0.2)
+        with open(tmp_path / "windows.jsonl", "rb") as f:
+            indexes = [codec.loads(line)["window"] for line in f]
+        assert indexes == list(range(report["windows"]))
+        assert report["windows"] > first["windows"]
+        assert report["elapsed_seconds"] >= first["elapsed_seconds"] + 0.2
+
+    @allure.title("A step whose latency creeps over the run raises a drift alert")
+    def test_latency_creep_alert(self, stub_client, tmp_path):
+        started = time.monotonic()
+
+        def creeping(client, rng):
+            time.sleep(0.001 + (time.monotonic() - started) * 0.2)
+            return client.products.get_by_id(1)
+
+        runner = SoakRunner(stub_client, scenario=[("products.get", creeping)],
+                            soak_config=SOAK_CONFIG, output_dir=tmp_path)
+        report = runner.run(1.0)
+
+        assert report["drift_detected"]
+        assert any(alert["metric"] == "products.get.p95" for alert in report["alerts"])
+        assert codec.load(tmp_path / "soak_report.json")["alerts"] == report["alerts"]
+
+    @allure.title("Calls rejected by an open circuit are counted apart from latency samples")
+    def test_rejected_calls_not_sampled(self, stub_client, tmp_path):
+        def rejected(client, rng):
+            raise CircuitOpenError("circuit host:stub is open")
+
+        runner = SoakRunner(stub_client, scenario=[("products.get", rejected)],
+                            soak_config=SOAK_CONFIG, output_dir=tmp_path)
+        runner.run(0.05)
+
+        with open(tmp_path / "windows.jsonl", "rb") as f:
+            series = codec.loads(f.readline())["series"]["products.get"]
+        assert series["rejected"] >= 1
+        assert series["count"] == 0 and series["p95"] is None
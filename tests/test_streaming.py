@@ -0,0 +1,57 @@
+import gzip
+import io
+import tracemalloc
+import pytest
+import allure
+import urllib3
+from requests.structures import CaseInsensitiveDict
+from utils import compression
+from utils.streaming import BodyStreamer, ResponseTooLargeError
+from utils.transport import APIResponse
+
+
+def streamed_response(body: bytes, content_encoding: str) -> APIResponse:
+    response = APIResponse()
+    response.status_code = 200
+    response.url = "http://stub/products"
+    response.headers = CaseInsensitiveDict({"content-encoding": content_encoding})
+    response.raw = urllib3.HTTPResponse(body=io.BytesIO(body), headers=dict(response.headers),
+                                        preload_content=False, decode_content=False)
+    return response
+
+
+@allure.feature("Transport")
+@allure.story("Body Streaming")
+class TestBodyStreaming:
+    """Size caps and content decoding of streamed response bodies"""
+
+    @allure.title("A compression bomb hits the size cap without being inflated in memory")
+    def test_compression_bomb_capped(self):
+        bomb = gzip.compress(b"\0" * (100 * 1024 * 1024))
+
+        # --memory-track may already be tracing; measure from here either way
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            with pytest.raises(ResponseTooLargeError):
+                BodyStreamer({"max_body_bytes": 1024 * 1024}).consume(streamed_response(bomb, "gzip"))
+            peak = tracemalloc.get_traced_memory()[1] - before
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+
+        assert peak < 16 * 1024 * 1024
+
+    @allure.title("Encodings the framework cannot decode fall back to requests' decoding")
+    def test_unsupported_encoding_falls_back(self, monkeypatch):
+        def unsupported(encoding):
+            raise ValueError(f"Unsupported content encoding: {encoding}")
+        monkeypatch.setattr(compression.ContentDecoder, "_decoder_for", staticmethod(unsupported))
+
+        response = streamed_response(gzip.compress(b'{"id": 1}'), "gzip")
+        BodyStreamer().consume(response)
+
+        assert response.json() == {"id": 1}
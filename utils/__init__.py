@@ -2,5 +2,8 @@ from .api_client import APIClient
 from .data_provider import DataProvider
 from .validators import ResponseValidator
 from .helpers import TestHelper
+from .data_generator import SeededDataGenerator
+from .models import Product, User, Cart, AuthToken
 
-__all__ = ['APIClient', 'DataProvider', 'ResponseValidator', 'TestHelper'] 
\ No newline at end of file
+__all__ = ['APIClient', 'DataProvider', 'ResponseValidator', 'TestHelper', 'SeededDataGenerator',
+           'Product', 'User', 'Cart', 'AuthToken'] 
\ No newline at end of file
@@ -1,23 +1,69 @@
+import functools
 import requests
 import time
 
-from typing import Dict, Any, Optional, Union
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from typing import Callable, Dict, Any, Iterator, Optional, Union, cast
 from config import get_config
+from .hooks import HookRegistry
+from .metrics import MetricsCollector
+from .coalescing import SingleFlight
+from .hedging import HedgingPolicy
+from .json_codec import codec
+from .transport import APIResponse, FrameworkHTTPAdapter
+from .deadline import DeadlineAwareRetry, DeadlineExceeded, deadline_scope
+from .circuit_breaker import CircuitBreakerRegistry, CircuitOpenError
+from .streaming import BodyStreamer
+from .compression import accept_encoding_header, compress_body
+from .pagination import PageIterator, IdRangePager, date_windows, ordered_parallel
+
+class Endpoint(str):
+    """Formatted endpoint path that remembers its endpoints.json key and options"""
+    
+    key: Optional[str]
+    options: Dict[str, Any]
+    
+    def __new__(cls, path: str, key: Optional[str] = None, options: Optional[Dict[str, Any]] = None):
+        endpoint = super().__new__(cls, path)
+        endpoint.key = key
+        endpoint.options = options or {}
+        return endpoint
 
 class APIClient:
 
-    def __init__(self, config: Optional[Dict] = None):
+    def __init__(self, config: Optional[Dict] = None, fault_injector=None):
         """
         Initialize API client
         
         Args:
             config: Configuration dictionary (optional)
+            fault_injector: FaultInjector applying latency and faults to every request (optional)
         """
         self.config = config or get_config()
+        self.fault_injector = fault_injector
         self.base_url = self.config["base_url"]
-        self.timeout = self.config["timeout"]
+        # Separate (connect, read) timeouts; both are further capped by the current deadline
+        self.timeout = (self.config.get("connect_timeout", self.config["timeout"]), self.config["timeout"])
+        self.hooks = HookRegistry()
+        self.metrics = MetricsCollector()
+        
+        # Concurrent identical safe requests share one network call
+        coalescing_config = self.config.get("client", {}).get("coalescing", {})
+        self.coalescing_enabled = coalescing_config.get("enabled", False)
+        self.coalescing_methods = {m.upper() for m in coalescing_config.get("methods", ["GET", "HEAD"])}
+        self.single_flight = SingleFlight()
+        
+        # Slow idempotent requests may be raced by a second copy (opt-in)
+        self.hedging = HedgingPolicy(self.config.get("client", {}).get("hedging", {}), self.metrics)
+        
+        # Bodies are read incrementally so size caps apply and large bodies can be spooled
+        self.streamer = BodyStreamer(self.config.get("client", {}).get("streaming"))
+        
+        # Response compression is negotiated; large request bodies are optionally compressed
+        self.compression = self.config.get("client", {}).get("compression", {})
+        
+        # Per-host and per-endpoint circuits, shared by all workers, reject calls during outages
+        breaker_config = self.config.get("circuit_breaker", {})
+        self.breakers = CircuitBreakerRegistry(breaker_config) if breaker_config.get("enabled", False) else None
         
         # Create and configure session
         self.session = self._create_session()
@@ -34,17 +80,18 @@ class APIClient:
         
         # Set default headers
         session.headers.update(self.config["headers"])
+        session.headers["Accept-Encoding"] = accept_encoding_header(self.compression.get("accept_encodings"))
         
-        # Configure retry strategy
+        # Configure retry strategy; retries and backoff stop at the current deadline
         retry_config = self.config["retry"]
-        retry_strategy = Retry(
+        retry_strategy = DeadlineAwareRetry(
             total=retry_config["retry_count"],
             backoff_factor=retry_config["retry_delay"],
             status_forcelist=[500, 502, 503, 504],
             allowed_methods=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE"]
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = FrameworkHTTPAdapter(max_retries=retry_strategy, fault_injector=self.fault_injector)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
@@ -63,28 +110,207 @@ class APIClient:
             Response object
         """
         url = f"{self.base_url}{endpoint}"
+        endpoint_key = getattr(endpoint, "key", None)
+        endpoint_options = getattr(endpoint, "options", {})
         kwargs.setdefault("timeout", self.timeout)
         
+        # Encode JSON bodies with the framework codec instead of requests' encoder
+        if kwargs.get("json") is not None:
+            kwargs["data"] = codec.dumps_bytes(kwargs.pop("json"))
+            headers = dict(kwargs.get("headers") or {})
+            if not any(k.lower() == "content-type" for k in headers):
+                headers["Content-Type"] = "application/json"
+            kwargs["headers"] = headers
+        
+        if isinstance(kwargs.get("data"), bytes):
+            self._compress_request_body(method, endpoint_key, kwargs)
+        
+        with deadline_scope(endpoint_options.get("deadline"), label=f"{endpoint_key or endpoint} deadline") as deadline:
+            return self._request(method, url, endpoint_key, endpoint_options, deadline, **kwargs)
+    
+    def _request(self, method: str, url: str, endpoint_key: Optional[str], endpoint_options: Dict[str, Any],
+                 deadline, **kwargs) -> requests.Response:
+        """
+        Send request under the given deadline, recording metrics and emitting the request hook
+        
+        Args:
+            method: HTTP method
+            url: Full request URL
+            endpoint_key: endpoints.json key of the request (if known)
+            endpoint_options: Endpoint options from endpoints.json
+            deadline: Deadline of the request, or None
+            **kwargs: Additional request parameters
+            
+        Returns:
+            Response object
+            
+        Raises:
+            DeadlineExceeded: If the deadline passed before the request completed
+        """
         # Record request start time
         start_time = time.time()
         
         try:
-            response = self.session.request(method, url, **kwargs)
+            if deadline is not None:
+                deadline.check(f"{method} {url} was sent")
+            response = self._send(method, url, endpoint_key, endpoint_options, **kwargs)
             
             # Calculate response time
             response_time = time.time() - start_time
+            self.metrics.increment("requests", endpoint=endpoint_key)
+            self.metrics.observe("response_time", response_time, endpoint=endpoint_key)
             
             # Check response time threshold
             max_response_time = self.config["performance"]["max_response_time"]
             if response_time > max_response_time:
                 print(f"Response time exceeded threshold: {response_time:.3f}s > {max_response_time}s")
             
+            self.hooks.emit("request", method=method, url=url, endpoint_key=endpoint_key,
+                            response=response, elapsed=response_time, error=None)
             return response
             
         except requests.exceptions.RequestException as e:
-            print(f"Request failed: {e}")
+            error = e
+            if deadline is not None and not isinstance(e, DeadlineExceeded) and (deadline.expired or deadline.retries_cut):
+                # Report the budget running out rather than whichever attempt happened to be last
+                error = DeadlineExceeded(f"{deadline.label} of {deadline.seconds:g}s exceeded: {method} {url} ({e})",
+                                         request=e.request, response=e.response)
+            if isinstance(error, DeadlineExceeded):
+                self.metrics.increment("deadline_exceeded", endpoint=endpoint_key)
+            elif isinstance(error, CircuitOpenError):
+                self.metrics.increment("circuit_rejected", endpoint=endpoint_key)
+            print(f"Request failed: {error}")
+            self.metrics.increment("request_errors", endpoint=endpoint_key)
+            self.hooks.emit("request", method=method, url=url, endpoint_key=endpoint_key,
+                            response=None, elapsed=time.time() - start_time, error=error)
+            if error is not e:
+                raise error from e
             raise
     
+    def _send(self, method: str, url: str, endpoint_key: Optional[str],
+              endpoint_options: Dict[str, Any], **kwargs) -> requests.Response:
+        """
+        Send request, coalescing identical concurrent safe requests and hedging slow idempotent ones
+        
+        Args:
+            method: HTTP method
+            url: Full request URL
+            endpoint_key: endpoints.json key of the request (if known)
+            endpoint_options: Endpoint options from endpoints.json
+            **kwargs: Additional request parameters
+            
+        Returns:
+            Response object (an independent copy when coalesced)
+        """
+        def transmit():
+            return self._transmit(method, url, endpoint_key, endpoint_options, **kwargs)
+        
+        send: Callable[[], requests.Response]
+        if self.hedging.applies(method, endpoint_key, endpoint_options) and not kwargs.get("stream"):
+            send = functools.partial(self.hedging.run, transmit, endpoint_key)
+        else:
+            send = transmit
+        
+        key = None
+        # Spooled bodies live in temp files and are not shared between callers
+        if (self.coalescing_enabled and method.upper() in self.coalescing_methods
+                and not endpoint_options.get("stream")):
+            key = SingleFlight.make_key(method, url, kwargs)
+        
+        if key is None:
+            return send()
+        
+        response, shared = self.single_flight.do(key, send)
+        if shared:
+            self.metrics.increment("coalesced_requests", endpoint=endpoint_key)
+        return response
+    
+    def _transmit(self, method: str, url: str, endpoint_key: Optional[str],
+                  endpoint_options: Dict[str, Any], **kwargs) -> requests.Response:
+        """
+        Perform the network call through the circuit breakers and read the body under the size cap
+        
+        Args:
+            method: HTTP method
+            url: Full request URL
+            endpoint_key: endpoints.json key of the request (if known)
+            endpoint_options: Endpoint options from endpoints.json
+            **kwargs: Additional request parameters
+            
+        Returns:
+            Response object with its body read (or spooled to disk)
+        """
+        if self.breakers is None:
+            return self._exchange(method, url, endpoint_key, endpoint_options, **kwargs)
+        
+        with self.breakers.guard(url, endpoint_key) as guard:
+            response = self._exchange(method, url, endpoint_key, endpoint_options, **kwargs)
+            guard.record(response.status_code)
+        return response
+    
+    def _exchange(self, method: str, url: str, endpoint_key: Optional[str],
+                  endpoint_options: Dict[str, Any], **kwargs) -> requests.Response:
+        """Send the request and read its body"""
+        # Callers asking for a raw stream handle the body themselves
+        if kwargs.get("stream"):
+            return self.session.request(method, url, **kwargs)
+        
+        kwargs["stream"] = True
+        # The mounted FrameworkHTTPAdapter builds APIResponse objects
+        response = cast(APIResponse, self.session.request(method, url, **kwargs))
+        self.streamer.consume(
+            response,
+            spool=endpoint_options.get("stream", False),
+            max_body_bytes=endpoint_options.get("max_body_bytes")
+        )
+        
+        if response.spooled_body is not None:
+            self.metrics.increment("spooled_responses", endpoint=endpoint_key)
+        body_size = response.body_size or 0
+        self.metrics.observe("body_bytes", body_size, endpoint=endpoint_key)
+        self.metrics.increment("response_body_bytes", body_size, endpoint=endpoint_key)
+        self.metrics.increment("response_wire_bytes", response.wire_size or 0, endpoint=endpoint_key)
+        self._record_timings(response, endpoint_key)
+        return response
+    
+    def _record_timings(self, response: requests.Response, endpoint_key: Optional[str]):
+        """Aggregate per-phase transport timings into metrics"""
+        timings = getattr(response, "timings", None)
+        if not timings:
+            return
+        
+        self.metrics.increment("connections_reused" if timings.get("reused") else "connections_opened",
+                               endpoint=endpoint_key)
+        for phase in ("dns", "connect", "tls", "send", "ttfb", "download"):
+            if phase in timings:
+                self.metrics.observe(f"timing_{phase}", timings[phase], endpoint=endpoint_key)
+    
+    def _compress_request_body(self, method: str, endpoint_key: Optional[str], kwargs: Dict[str, Any]):
+        """
+        Compress a bytes request body in place when enabled and above the size threshold
+        
+        Args:
+            method: HTTP method
+            endpoint_key: endpoints.json key of the request (if known)
+            kwargs: Request parameters holding the body in "data"
+        """
+        body = kwargs["data"]
+        headers = dict(kwargs.get("headers") or {})
+        wire_body = body
+        
+        already_encoded = any(k.lower() == "content-encoding" for k in headers)
+        if (self.compression.get("compress_requests", False) and not already_encoded
+                and method.upper() in ("POST", "PUT", "PATCH")
+                and len(body) >= self.compression.get("request_min_bytes", 1024)):
+            encoding = self.compression.get("request_encoding", "gzip")
+            wire_body = compress_body(body, encoding)
+            headers["Content-Encoding"] = encoding
+            kwargs["data"] = wire_body
+            kwargs["headers"] = headers
+        
+        self.metrics.increment("request_body_bytes", len(body), endpoint=endpoint_key)
+        self.metrics.increment("request_wire_bytes", len(wire_body), endpoint=endpoint_key)
+    
     def get(self, endpoint: str, **kwargs) -> requests.Response:
         """GET request"""
         return self.request("GET", endpoint, **kwargs)
@@ -109,10 +335,16 @@ class APIClient:
         """Close session"""
         if self.session:
             self.session.close()
+        self.hedging.close()
+        if self.breakers is not None:
+            self.breakers.store.close()
 
 class BaseAPI:
     """Base class for API services"""
     
+    # Resource name in endpoints.json
+    resource = ""
+    
     def __init__(self, client: APIClient):
         """
         Initialize API service
@@ -122,10 +354,84 @@ class BaseAPI:
         """
         self.client = client
         self.endpoints = client.config["endpoints"]
+        self.pagination = client.config.get("client", {}).get("pagination", {})
+    
+    def _endpoint(self, name: str, **params) -> Endpoint:
+        """
+        Build endpoint path from its endpoints.json template
+        
+        Args:
+            name: Endpoint name within this resource
+            **params: Template parameters
+            
+        Returns:
+            Formatted endpoint path carrying its endpoints.json key
+        """
+        spec = self.endpoints[self.resource][name]
+        
+        # Endpoints are either a path template or {"path": ..., <options>}
+        if isinstance(spec, dict):
+            template = spec["path"]
+            options = {k: v for k, v in spec.items() if k != "path"}
+        else:
+            template = spec
+            options = {}
+        
+        return Endpoint(template.format(**params), key=f"{self.resource}.{name}", options=options)
 
-class ProductsAPI(BaseAPI):
+class RecordAPI(BaseAPI):
+    """Base class for API services over a collection of records with ids"""
+    
+    def get_by_id(self, record_id: Union[int, str]) -> requests.Response:
+        """Get record by ID"""
+        endpoint = self._endpoint("get_by_id", id=record_id)
+        return self.client.get(endpoint)
+    
+    def iter_all(self, page_size: Optional[int] = None, prefetch: Optional[bool] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over every record of the resource one page at a time
+        
+        Pages use the resource's "page" endpoint (limit/offset) when endpoints.json
+        defines one, otherwise consecutive id ranges fetched in parallel via get_by_id.
+        Only the current and the prefetched page are held in memory.
+        
+        Args:
+            page_size: Records per page (defaults to client.pagination.page_size)
+            prefetch: Fetch the next page in the background (defaults to configuration)
+            
+        Returns:
+            Iterator yielding records one at a time
+        """
+        page_size = page_size or self.pagination.get("page_size", 50)
+        if prefetch is None:
+            prefetch = self.pagination.get("prefetch", True)
+        
+        fetch_page: Callable[[int], Optional[list]]
+        if "page" in self.endpoints[self.resource]:
+            fetch_page = functools.partial(self._fetch_offset_page, page_size=page_size)
+        else:
+            fetch_page = IdRangePager(
+                self.get_by_id,
+                page_size=page_size,
+                max_workers=self.pagination.get("max_workers", 8),
+                max_empty_pages=self.pagination.get("max_empty_pages", 3)
+            )
+        
+        return iter(PageIterator(fetch_page, prefetch=prefetch))
+    
+    def _fetch_offset_page(self, page_number: int, page_size: int) -> Optional[list]:
+        """Fetch one page through the "page" endpoint (None once a page comes back empty)"""
+        endpoint = self._endpoint("page", limit=page_size, offset=page_number * page_size)
+        response = self.client.get(endpoint)
+        response.raise_for_status()
+        records = response.json()
+        return records or None
+
+class ProductsAPI(RecordAPI):
     """Products API service"""
     
+    resource = "products"
+    
     def get_all(self, limit: Optional[int] = None, sort: Optional[str] = None) -> requests.Response:
         """
         Get all products
@@ -138,13 +444,13 @@ class ProductsAPI(BaseAPI):
             Response object
         """
         if limit and sort:
-            endpoint = self.endpoints["products"]["limit_sort"].format(limit=limit, sort=sort)
+            endpoint = self._endpoint("limit_sort", limit=limit, sort=sort)
         elif limit:
-            endpoint = self.endpoints["products"]["limit"].format(limit=limit)
+            endpoint = self._endpoint("limit", limit=limit)
         elif sort:
-            endpoint = self.endpoints["products"]["sort"].format(sort=sort)
+            endpoint = self._endpoint("sort", sort=sort)
         else:
-            endpoint = self.endpoints["products"]["get_all"]
+            endpoint = self._endpoint("get_all")
         
         return self.client.get(endpoint)
     
@@ -158,7 +464,7 @@ class ProductsAPI(BaseAPI):
         Returns:
             Response object
         """
-        endpoint = self.endpoints["products"]["get_by_id"].format(id=product_id)
+        endpoint = self._endpoint("get_by_id", id=product_id)
         return self.client.get(endpoint)
     
     def create(self, product_data: Dict[str, Any]) -> requests.Response:
@@ -171,7 +477,7 @@ class ProductsAPI(BaseAPI):
         Returns:
             Response object
         """
-        endpoint = self.endpoints["products"]["create"]
+        endpoint = self._endpoint("create")
         return self.client.post(endpoint, json=product_data)
     
     def update(self, product_id: Union[int, str], product_data: Dict[str, Any]) -> requests.Response:
@@ -185,7 +491,7 @@ class ProductsAPI(BaseAPI):
         Returns:
             Response object
         """
-        endpoint = self.endpoints["products"]["update"].format(id=product_id)
+        endpoint = self._endpoint("update", id=product_id)
         return self.client.put(endpoint, json=product_data)
     
     def patch(self, product_id: Union[int, str], product_data: Dict[str, Any]) -> requests.Response:
@@ -199,7 +505,7 @@ class ProductsAPI(BaseAPI):
         Returns:
             Response object
         """
-        endpoint = self.endpoints["products"]["patch"].format(id=product_id)
+        endpoint = self._endpoint("patch", id=product_id)
         return self.client.patch(endpoint, json=product_data)
     
     def delete(self, product_id: Union[int, str]) -> requests.Response:
@@ -212,7 +518,7 @@ class ProductsAPI(BaseAPI):
         Returns:
             Response object
         """
-        endpoint = self.endpoints["products"]["delete"].format(id=product_id)
+        endpoint = self._endpoint("delete", id=product_id)
         return self.client.delete(endpoint)
     
     def get_categories(self) -> requests.Response:
@@ -222,7 +528,7 @@ class ProductsAPI(BaseAPI):
         Returns:
             Response object
         """
-        endpoint = self.endpoints["products"]["categories"]
+        endpoint = self._endpoint("categories")
         return self.client.get(endpoint)
     
     def get_by_category(self, category: str) -> requests.Response:
@@ -235,102 +541,142 @@ class ProductsAPI(BaseAPI):
         Returns:
             Response object
         """
-        endpoint = self.endpoints["products"]["by_category"].format(category=category)
+        endpoint = self._endpoint("by_category", category=category)
         return self.client.get(endpoint)
 
-class UsersAPI(BaseAPI):
+class UsersAPI(RecordAPI):
     """Users API service"""
     
+    resource = "users"
+    
     def get_all(self, limit: Optional[int] = None, sort: Optional[str] = None) -> requests.Response:
         """Get all users"""
         if limit and sort:
-            endpoint = self.endpoints["users"]["limit_sort"].format(limit=limit, sort=sort)
+            endpoint = self._endpoint("limit_sort", limit=limit, sort=sort)
         elif limit:
-            endpoint = self.endpoints["users"]["limit"].format(limit=limit)
+            endpoint = self._endpoint("limit", limit=limit)
         elif sort:
-            endpoint = self.endpoints["users"]["sort"].format(sort=sort)
+            endpoint = self._endpoint("sort", sort=sort)
         else:
-            endpoint = self.endpoints["users"]["get_all"]
+            endpoint = self._endpoint("get_all")
         
         return self.client.get(endpoint)
     
     def get_by_id(self, user_id: Union[int, str]) -> requests.Response:
         """Get user by ID"""
-        endpoint = self.endpoints["users"]["get_by_id"].format(id=user_id)
+        endpoint = self._endpoint("get_by_id", id=user_id)
         return self.client.get(endpoint)
     
     def create(self, user_data: Dict[str, Any]) -> requests.Response:
         """Create user"""
-        endpoint = self.endpoints["users"]["create"]
+        endpoint = self._endpoint("create")
         return self.client.post(endpoint, json=user_data)
     
     def update(self, user_id: Union[int, str], user_data: Dict[str, Any]) -> requests.Response:
         """Update user"""
-        endpoint = self.endpoints["users"]["update"].format(id=user_id)
+        endpoint = self._endpoint("update", id=user_id)
         return self.client.put(endpoint, json=user_data)
     
     def patch(self, user_id: Union[int, str], user_data: Dict[str, Any]) -> requests.Response:
         """Partially update user"""
-        endpoint = self.endpoints["users"]["patch"].format(id=user_id)
+        endpoint = self._endpoint("patch", id=user_id)
         return self.client.patch(endpoint, json=user_data)
     
     def delete(self, user_id: Union[int, str]) -> requests.Response:
         """Delete user"""
-        endpoint = self.endpoints["users"]["delete"].format(id=user_id)
+        endpoint = self._endpoint("delete", id=user_id)
         return self.client.delete(endpoint)
 
-class CartsAPI(BaseAPI):
+class CartsAPI(RecordAPI):
     """Carts API service"""
     
+    resource = "carts"
+    
     def get_all(self, limit: Optional[int] = None, sort: Optional[str] = None) -> requests.Response:
         """Get all carts"""
         if limit:
-            endpoint = self.endpoints["carts"]["limit"].format(limit=limit)
+            endpoint = self._endpoint("limit", limit=limit)
         elif sort:
-            endpoint = self.endpoints["carts"]["sort"].format(sort=sort)
+            endpoint = self._endpoint("sort", sort=sort)
         else:
-            endpoint = self.endpoints["carts"]["get_all"]
+            endpoint = self._endpoint("get_all")
         
         return self.client.get(endpoint)
     
     def get_by_id(self, cart_id: Union[int, str]) -> requests.Response:
         """Get cart by ID"""
-        endpoint = self.endpoints["carts"]["get_by_id"].format(id=cart_id)
+        endpoint = self._endpoint("get_by_id", id=cart_id)
         return self.client.get(endpoint)
     
     def create(self, cart_data: Dict[str, Any]) -> requests.Response:
         """Create cart"""
-        endpoint = self.endpoints["carts"]["create"]
+        endpoint = self._endpoint("create")
         return self.client.post(endpoint, json=cart_data)
     
     def update(self, cart_id: Union[int, str], cart_data: Dict[str, Any]) -> requests.Response:
         """Update cart"""
-        endpoint = self.endpoints["carts"]["update"].format(id=cart_id)
+        endpoint = self._endpoint("update", id=cart_id)
         return self.client.put(endpoint, json=cart_data)
     
     def patch(self, cart_id: Union[int, str], cart_data: Dict[str, Any]) -> requests.Response:
         """Partially update cart"""
-        endpoint = self.endpoints["carts"]["patch"].format(id=cart_id)
+        endpoint = self._endpoint("patch", id=cart_id)
         return self.client.patch(endpoint, json=cart_data)
     
     def delete(self, cart_id: Union[int, str]) -> requests.Response:
         """Delete cart"""
-        endpoint = self.endpoints["carts"]["delete"].format(id=cart_id)
+        endpoint = self._endpoint("delete", id=cart_id)
         return self.client.delete(endpoint)
     
     def get_user_carts(self, user_id: Union[int, str]) -> requests.Response:
         """Get user's carts"""
-        endpoint = self.endpoints["carts"]["user_carts"].format(user_id=user_id)
+        endpoint = self._endpoint("user_carts", user_id=user_id)
         return self.client.get(endpoint)
     
     def get_by_date_range(self, start_date: str, end_date: str) -> requests.Response:
         """Get carts by date range"""
-        endpoint = self.endpoints["carts"]["date_range"].format(start=start_date, end=end_date)
+        endpoint = self._endpoint("date_range", start=start_date, end=end_date)
         return self.client.get(endpoint)
+    
+    def iter_by_date_range(self, start_date: str, end_date: str, window_days: Optional[int] = None,
+                           max_workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over carts in a date range, fetching sub-windows in parallel
+        
+        Args:
+            start_date: First day (YYYY-MM-DD)
+            end_date: Last day (YYYY-MM-DD)
+            window_days: Days per sub-window (defaults to client.pagination.date_window_days)
+            max_workers: Sub-windows fetched concurrently (defaults to client.pagination.max_workers)
+            
+        Returns:
+            Iterator yielding carts in window order, each cart once
+        """
+        window_days = window_days or self.pagination.get("date_window_days", 30)
+        max_workers = max_workers or self.pagination.get("max_workers", 8)
+        
+        def fetch_window(window):
+            response = self.get_by_date_range(*window)
+            response.raise_for_status()
+            return response.json()
+        
+        previous_ids = set()
+        windows = date_windows(start_date, end_date, window_days)
+        for carts in ordered_parallel(fetch_window, windows, max_workers):
+            window_ids = set()
+            for cart in carts:
+                # Carts on a window boundary may be returned by both adjacent windows
+                if cart.get("id") in previous_ids or cart.get("id") in window_ids:
+                    continue
+                window_ids.add(cart.get("id"))
+                yield cart
+            previous_ids = window_ids
 
 class AuthAPI(BaseAPI):
     """Authentication API service"""
     
+    resource = "auth"
+    
     def login(self, credentials: Dict[str, str]) -> requests.Response:
         """
         User login
@@ -341,5 +687,5 @@ class AuthAPI(BaseAPI):
         Returns:
             Response object containing authentication token
         """
-        endpoint = self.endpoints["auth"]["login"]
+        endpoint = self._endpoint("login")
         return self.client.post(endpoint, json=credentials) 
\ No newline at end of file
@@ -0,0 +1,413 @@
+import argparse
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+from config import get_config_for
+from .api_client import APIClient
+from .json_codec import codec
+
+RESOURCES = ("products", "users", "carts")
+
+def record_hash(record: Dict[str, Any], ignore_fields: Iterable[str] = ()) -> str:
+    """
+    Canonical hash of a record (key order and ignored fields do not matter)
+
+    Args:
+        record: Record to hash
+        ignore_fields: Top-level fields excluded from the hash
+
+    Returns:
+        Hex digest
+    """
+    if ignore_fields:
+        record = {k: v for k, v in record.items() if k not in ignore_fields}
+    return hashlib.sha256(codec.dumps_bytes(record, sort_keys=True)).hexdigest()
+
+def diff_fields(source: Any, target: Any, path: str = "") -> List[Dict[str, Any]]:
+    """
+    List differing fields between two values
+
+    Args:
+        source: Value from the source environment
+        target: Value from the target environment
+        path: Dotted path of the values
+
+    Returns:
+        List of {"field", "source", "target"} entries
+    """
+    if isinstance(source, dict) and isinstance(target, dict):
+        differences = []
+        for key in sorted(set(source) | set(target), key=str):
+            field = f"{path}.{key}" if path else str(key)
+            if key not in source:
+                differences.append({"field": field, "source": None, "target": target[key], "missing": "source"})
+            elif key not in target:
+                differences.append({"field": field, "source": source[key], "target": None, "missing": "target"})
+            else:
+                differences.extend(diff_fields(source[key], target[key], field))
+        return differences
+
+    if isinstance(source, list) and isinstance(target, list) and len(source) == len(target):
+        differences = []
+        for index, (source_item, target_item) in enumerate(zip(source, target)):
+            differences.extend(diff_fields(source_item, target_item, f"{path}[{index}]"))
+        return differences
+
+    if type(source) is not type(target) or source != target:
+        return [{"field": path, "source": source, "target": target}]
+    return []
+
+class CatalogSnapshot:
+    """Merkle-style digests of one environment's collections, bucketed by id"""
+
+    def __init__(self, env: str, bucket_size: int = 100):
+        """
+        Initialize catalog snapshot
+
+        Args:
+            env: Environment name
+            bucket_size: Number of consecutive integer ids per bucket
+        """
+        self.env = env
+        self.bucket_size = bucket_size
+        # resource -> bucket -> {id: record hash}
+        self.buckets: Dict[str, Dict[int, Dict[Any, str]]] = {}
+
+    def bucket_of(self, record_id: Any) -> int:
+        """Bucket number of a record id"""
+        if type(record_id) is int:
+            return record_id // self.bucket_size
+        # Non-integer ids are spread over negative bucket numbers
+        return -1 - zlib.crc32(str(record_id).encode("utf-8")) % 1024
+
+    def set_bucket(self, resource: str, bucket: int, hashes: Dict[Any, str]):
+        """Replace the record hashes of one bucket"""
+        buckets = self.buckets.setdefault(resource, {})
+        if hashes:
+            buckets[bucket] = hashes
+        else:
+            buckets.pop(bucket, None)
+
+    def add_collection(self, resource: str, records: Iterable[Dict[str, Any]],
+                       ignore_fields: Iterable[str] = ()):
+        """Hash a full collection, replacing previous digests of the resource"""
+        buckets: Dict[int, Dict[Any, str]] = {}
+        for record in records:
+            record_id = record.get("id")
+            buckets.setdefault(self.bucket_of(record_id), {})[record_id] = record_hash(record, ignore_fields)
+        self.buckets[resource] = buckets
+
+    def bucket_digest(self, resource: str, bucket: int) -> Optional[str]:
+        """Digest over the sorted (id, hash) pairs of a bucket"""
+        hashes = self.buckets.get(resource, {}).get(bucket)
+        if not hashes:
+            return None
+        hasher = hashlib.sha256()
+        for record_id, digest in sorted(hashes.items(), key=lambda item: str(item[0])):
+            hasher.update(f"{record_id}:{digest};".encode("utf-8"))
+        return hasher.hexdigest()
+
+    def root_digest(self, resource: str) -> str:
+        """Digest over all bucket digests of a resource"""
+        hasher = hashlib.sha256()
+        for bucket in sorted(self.buckets.get(resource, {})):
+            hasher.update(f"{bucket}:{self.bucket_digest(resource, bucket)};".encode("utf-8"))
+        return hasher.hexdigest()
+
+    def save(self, path: Path):
+        """Atomically write snapshot to disk"""
+        payload = {
+            "env": self.env,
+            "bucket_size": self.bucket_size,
+            "resources": {
+                resource: [[bucket, list(hashes.items())] for bucket, hashes in buckets.items()]
+                for resource, buckets in self.buckets.items()
+            }
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(codec.dumps_bytes(payload))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to save catalog snapshot {path}: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["CatalogSnapshot"]:
+        """Load snapshot from disk (None if missing or unreadable)"""
+        if not path.exists():
+            return None
+        try:
+            payload = codec.load(path)
+            snapshot = cls(payload["env"], payload["bucket_size"])
+            for resource, buckets in payload["resources"].items():
+                snapshot.buckets[resource] = {
+                    bucket: {record_id: digest for record_id, digest in hashes}
+                    for bucket, hashes in buckets
+                }
+            return snapshot
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError, IOError) as e:
+            print(f"Ignoring unreadable catalog snapshot {path}: {e}")
+            return None
+
+class CatalogDiff:
+    """Diffs resource collections between two environments"""
+
+    def __init__(self, source_env: str = "staging", target_env: str = "prod",
+                 resources: Iterable[str] = RESOURCES, bucket_size: int = 100,
+                 ignore_fields: Iterable[str] = ("__v",), snapshot_dir: str = ".cache/catalog_diff",
+                 max_workers: int = 8):
+        """
+        Initialize catalog diff
+
+        Args:
+            source_env: Source environment from environments.json
+            target_env: Target environment from environments.json
+            resources: Resources to compare
+            bucket_size: Number of consecutive integer ids per digest bucket
+            ignore_fields: Top-level fields excluded from comparison
+            snapshot_dir: Directory for persisted digests
+            max_workers: Parallel requests when refetching buckets
+        """
+        self.source_env = source_env
+        self.target_env = target_env
+        self.resources = list(resources)
+        self.bucket_size = bucket_size
+        self.ignore_fields = set(ignore_fields)
+        self.snapshot_dir = Path(snapshot_dir)
+        self.max_workers = max_workers
+        self.clients = {env: APIClient(get_config_for(env)) for env in (source_env, target_env)}
+
+    @property
+    def state_path(self) -> Path:
+        """File recording which buckets differed in the last diff"""
+        return self.snapshot_dir / f"{self.source_env}-vs-{self.target_env}.state.json"
+
+    def snapshot_path(self, env: str) -> Path:
+        """Digest snapshot file of an environment"""
+        return self.snapshot_dir / f"{env}.json"
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Fetch full collections from both environments and diff them
+
+        Returns:
+            Diff report
+        """
+        jobs = [(env, resource) for env in self.clients for resource in self.resources]
+        with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+            results = list(executor.map(lambda job: self._fetch_collection(*job), jobs))
+        collections = {job: records for job, records in zip(jobs, results)}
+
+        snapshots = {env: CatalogSnapshot(env, self.bucket_size) for env in self.clients}
+        for (env, resource), records in collections.items():
+            snapshots[env].add_collection(resource, records, self.ignore_fields)
+
+        records_by_id = {
+            job: {record.get("id"): record for record in records} for job, records in collections.items()
+        }
+        return self._diff(snapshots, records_by_id, buckets=None)
+
+    def recheck(self) -> Dict[str, Any]:
+        """
+        Refetch only the buckets that differed in the last diff
+
+        Buckets that were identical are not looked at, so new drift there goes unnoticed:
+        the report is marked partial and a resource whose rechecked buckets now match is
+        reported with "identical" None (unknown) rather than True. Falls back to a full
+        run() when there is no previous diff.
+
+        Returns:
+            Diff report
+        """
+        state = self._load_state()
+        snapshots: Dict[str, CatalogSnapshot] = {}
+        for env in self.clients:
+            snapshot = CatalogSnapshot.load(self.snapshot_path(env))
+            if snapshot is not None and snapshot.bucket_size == self.bucket_size:
+                snapshots[env] = snapshot
+        if state is None or len(snapshots) != len(self.clients):
+            print("No previous catalog diff to recheck, running full diff")
+            return self.run()
+
+        records_by_id: Dict[Tuple[str, str], Dict[Any, Dict[str, Any]]] = {}
+        for resource in self.resources:
+            buckets = state.get(resource, [])
+            for env, snapshot in snapshots.items():
+                records = self._fetch_buckets(env, resource, buckets, snapshots)
+                records_by_id[(env, resource)] = records
+                for bucket in buckets:
+                    snapshot.set_bucket(resource, bucket, {
+                        record_id: record_hash(record, self.ignore_fields)
+                        for record_id, record in records.items() if snapshot.bucket_of(record_id) == bucket
+                    })
+
+        return self._diff(snapshots, records_by_id, buckets=state)
+
+    def _diff(self, snapshots: Dict[str, CatalogSnapshot],
+              records_by_id: Dict[Tuple[str, str], Dict[Any, Dict[str, Any]]],
+              buckets: Optional[Dict[str, List[int]]]) -> Dict[str, Any]:
+        """Compare snapshots top-down, descending only into differing buckets"""
+        source, target = snapshots[self.source_env], snapshots[self.target_env]
+        partial = buckets is not None
+        report: Dict[str, Any] = {"source": self.source_env, "target": self.target_env,
+                                  "partial": partial, "resources": {}}
+        state: Dict[str, List[int]] = {}
+
+        for resource in self.resources:
+            result: Dict[str, Any] = {"identical": True, "buckets_compared": 0, "buckets_differing": 0,
+                                      "only_in_source": [], "only_in_target": [], "changed": {}}
+            report["resources"][resource] = result
+            state[resource] = []
+
+            if buckets is None and source.root_digest(resource) == target.root_digest(resource):
+                continue
+
+            if buckets is None:
+                candidates = set(source.buckets.get(resource, {})) | set(target.buckets.get(resource, {}))
+            else:
+                candidates = set(buckets.get(resource, []))
+
+            for bucket in sorted(candidates):
+                result["buckets_compared"] += 1
+                if source.bucket_digest(resource, bucket) == target.bucket_digest(resource, bucket):
+                    continue
+
+                result["buckets_differing"] += 1
+                state[resource].append(bucket)
+                source_hashes = source.buckets.get(resource, {}).get(bucket, {})
+                target_hashes = target.buckets.get(resource, {}).get(bucket, {})
+
+                for record_id in sorted(set(source_hashes) | set(target_hashes), key=str):
+                    if record_id not in target_hashes:
+                        result["only_in_source"].append(record_id)
+                    elif record_id not in source_hashes:
+                        result["only_in_target"].append(record_id)
+                    elif source_hashes[record_id] != target_hashes[record_id]:
+                        result["changed"][str(record_id)] = self._record_diff(
+                            records_by_id[(self.source_env, resource)].get(record_id),
+                            records_by_id[(self.target_env, resource)].get(record_id)
+                        )
+
+            if state[resource]:
+                result["identical"] = False
+            elif partial:
+                # Only previously differing buckets were compared
+                result["identical"] = None
+
+        for env, snapshot in snapshots.items():
+            snapshot.save(self.snapshot_path(env))
+        self._save_state(state)
+        self._print_summary(report)
+        return report
+
+    def _record_diff(self, source: Optional[Dict[str, Any]], target: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if source is None or target is None:
+            return []
+        return diff_fields(
+            {k: v for k, v in source.items() if k not in self.ignore_fields},
+            {k: v for k, v in target.items() if k not in self.ignore_fields}
+        )
+
+    def _fetch_collection(self, env: str, resource: str) -> List[Dict[str, Any]]:
+        """Fetch a full collection from an environment"""
+        response = getattr(self.clients[env], resource).get_all()
+        response.raise_for_status()
+        return response.json()
+
+    def _fetch_buckets(self, env: str, resource: str, buckets: List[int],
+                       snapshots: Dict[str, CatalogSnapshot]) -> Dict[Any, Dict[str, Any]]:
+        """Fetch every record that may live in the given buckets, by id"""
+        ids: Set[Any] = set()
+        for bucket in buckets:
+            if bucket >= 0:
+                ids.update(range(max(bucket * self.bucket_size, 1), (bucket + 1) * self.bucket_size))
+            for snapshot in snapshots.values():
+                ids.update(snapshot.buckets.get(resource, {}).get(bucket, {}))
+
+        service = getattr(self.clients[env], resource)
+
+        def fetch(record_id):
+            response = service.get_by_id(record_id)
+            if response.status_code != 200 or not response.content.strip():
+                return record_id, None
+            return record_id, response.json()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(fetch, sorted(ids, key=str))
+            return {record_id: record for record_id, record in results if isinstance(record, dict)}
+
+    def _load_state(self) -> Optional[Dict[str, List[int]]]:
+        if not self.state_path.exists():
+            return None
+        try:
+            return codec.load(self.state_path)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Ignoring unreadable catalog diff state {self.state_path}: {e}")
+            return None
+
+    def _save_state(self, state: Dict[str, List[int]]):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        codec.dump(state, self.state_path)
+
+    @staticmethod
+    def _print_summary(report: Dict[str, Any]):
+        print(f"Catalog diff {report['source']} vs {report['target']}:")
+        for resource, result in report["resources"].items():
+            if result["identical"]:
+                print(f"  {resource}: identical")
+            elif result["identical"] is None:
+                print(f"  {resource}: rechecked buckets match, other buckets were not compared "
+                      f"(run a full diff to confirm)")
+            else:
+                print(f"  {resource}: {result['buckets_differing']}/{result['buckets_compared']} buckets differ, "
+                      f"{len(result['changed'])} changed, {len(result['only_in_source'])} only in source, "
+                      f"{len(result['only_in_target'])} only in target")
+
+    @staticmethod
+    def save_report(report: Dict[str, Any], path: Optional[str] = None) -> str:
+        """
+        Save diff report to JSON file
+
+        Args:
+            report: Report returned by run() or recheck()
+            path: Output file path (defaults to reports/catalog_diff/<source>-vs-<target>.json)
+
+        Returns:
+            Full path of saved file
+        """
+        output_path = Path(path or f"reports/catalog_diff/{report['source']}-vs-{report['target']}.json")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        codec.dump(report, output_path, indent=2, default=str)
+        return str(output_path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Diff resource catalogs between two environments")
+    parser.add_argument("--source", default="staging", help="Source environment")
+    parser.add_argument("--target", default="prod", help="Target environment")
+    parser.add_argument("--resources", nargs="+", default=list(RESOURCES), help="Resources to compare")
+    parser.add_argument("--bucket-size", type=int, default=100, help="Integer ids per digest bucket")
+    parser.add_argument("--recheck", action="store_true",
+                        help="Only refetch buckets that differed last time (partial check, exit code 2 if they match)")
+    parser.add_argument("--output", default=None, help="Report file path")
+    args = parser.parse_args()
+
+    diff = CatalogDiff(args.source, args.target, resources=args.resources, bucket_size=args.bucket_size)
+    report = diff.recheck() if args.recheck else diff.run()
+    print(f"Report saved: {CatalogDiff.save_report(report, args.output)}")
+
+    results = [result["identical"] for result in report["resources"].values()]
+    if False in results:
+        raise SystemExit(1)
+    # A recheck cannot prove the catalogs identical
+    raise SystemExit(0 if all(results) else 2)
+
+if __name__ == "__main__":
+    main()
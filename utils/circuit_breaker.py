@@ -0,0 +1,419 @@
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
+import pytest
+import requests
+from .deadline import DeadlineExceeded, current_deadline
+
+# Checkout-wide default; pytest runs use a copy of it per run (see run_state_path)
+DEFAULT_STATE_PATH = ".cache/circuit_breakers.sqlite"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS breakers (
+    key TEXT PRIMARY KEY,
+    state TEXT NOT NULL,
+    failures INTEGER NOT NULL,
+    opened_at REAL NOT NULL,
+    probe_until REAL NOT NULL,
+    reason TEXT
+);
+"""
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while its host or endpoint circuit is open"""
+
+# Errors that say the target is unhealthy, as opposed to a bad request or test
+NETWORK_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.RetryError,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+class BreakerStore:
+    """Circuit state in SQLite, shared by every process (xdist worker) using the same file"""
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_STATE_PATH):
+        """
+        Initialize breaker store
+
+        Args:
+            path: SQLite file holding the circuit states
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit mode; read-modify-write updates use BEGIN IMMEDIATE to serialize workers
+            connection = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> Dict[str, Any]:
+        """State of one circuit (closed with no failures if never recorded)"""
+        row = self._connection().execute(
+            "SELECT state, failures, opened_at, probe_until, reason FROM breakers WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return {"state": CLOSED, "failures": 0, "opened_at": 0.0, "probe_until": 0.0, "reason": None}
+        return dict(zip(("state", "failures", "opened_at", "probe_until", "reason"), row))
+
+    def record_failure(self, key: str, threshold: int, reason: str) -> str:
+        """
+        Count a consecutive failure, opening the circuit at the threshold or after a failed probe
+
+        Returns:
+            State after the failure
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            current = self.get(key)
+            failures = current["failures"] + 1
+            if current["state"] == HALF_OPEN or failures >= threshold:
+                state, opened_at = OPEN, time.time()
+            else:
+                state, opened_at = current["state"], current["opened_at"]
+            connection.execute("INSERT OR REPLACE INTO breakers VALUES (?, ?, ?, ?, 0, ?)",
+                               (key, state, failures, opened_at, reason))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return state
+
+    def record_success(self, key: str):
+        """Close the circuit and clear its failures (no write when already clean)"""
+        self._connection().execute(
+            "UPDATE breakers SET state = ?, failures = 0, probe_until = 0, reason = NULL "
+            "WHERE key = ? AND (state != ? OR failures > 0)", (CLOSED, key, CLOSED))
+
+    def try_probe(self, key: str, reset_timeout: float, probe_timeout: float) -> bool:
+        """
+        Claim the single half-open probe of a circuit whose reset timeout elapsed
+
+        Returns:
+            True if this caller may send the probe request
+        """
+        now = time.time()
+        cursor = self._connection().execute(
+            "UPDATE breakers SET state = ?, probe_until = ? WHERE key = ? AND "
+            "((state = ? AND opened_at <= ?) OR (state = ? AND probe_until <= ?))",
+            (HALF_OPEN, now + probe_timeout, key, OPEN, now - reset_timeout, HALF_OPEN, now))
+        return cursor.rowcount == 1
+
+    def release_probe(self, key: str):
+        """Give up a claimed probe without a verdict, so another caller can probe"""
+        self._connection().execute(
+            "UPDATE breakers SET probe_until = 0 WHERE key = ? AND state = ?", (key, HALF_OPEN))
+
+    def trip(self, key: str, reason: str):
+        """Open a circuit immediately"""
+        self._connection().execute("INSERT OR REPLACE INTO breakers VALUES (?, ?, 0, ?, 0, ?)",
+                                   (key, OPEN, time.time(), reason))
+
+    def reset(self):
+        """Forget every circuit, e.g. the state left by an earlier run"""
+        self._connection().execute("DELETE FROM breakers")
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """State of every recorded circuit"""
+        rows = self._connection().execute("SELECT key FROM breakers").fetchall()
+        return {key: self.get(key) for (key,) in rows}
+
+    def close(self):
+        """Close this thread's connection"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+class CircuitBreaker:
+    """Closed, open or half-open circuit of one host or endpoint"""
+
+    def __init__(self, key: str, store: BreakerStore, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0, probe_timeout: float = 15.0):
+        """
+        Initialize circuit breaker
+
+        Args:
+            key: Circuit name ("host:<netloc>" or "endpoint:<netloc>/<endpoints.json key>")
+            store: Shared state store
+            failure_threshold: Consecutive failures opening the circuit
+            reset_timeout: Seconds an open circuit rejects calls before allowing a probe
+            probe_timeout: Seconds after which an unanswered probe may be retried by another caller
+        """
+        self.key = key
+        self.store = store
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_timeout = probe_timeout
+        # Whether the state read by the last admission was closed without failures;
+        # successes then need no write, so healthy traffic only reads the store
+        self._known_clean = False
+
+    def blocked(self) -> Optional[str]:
+        """Why calls are currently rejected, or None (does not claim the probe)"""
+        current = self.store.get(self.key)
+        now = time.time()
+        if current["state"] == OPEN and now - current["opened_at"] < self.reset_timeout:
+            retry_in = self.reset_timeout - (now - current["opened_at"])
+            return f"circuit {self.key} is open ({current['reason']}); next probe in {retry_in:.0f}s"
+        if current["state"] == HALF_OPEN and current["probe_until"] > now:
+            return f"circuit {self.key} is half-open and already probing"
+        return None
+
+    def before_call(self) -> bool:
+        """
+        Admit a call
+
+        Returns:
+            True if the call is the half-open probe
+
+        Raises:
+            CircuitOpenError: If the circuit rejects the call
+        """
+        current = self.store.get(self.key)
+        self._known_clean = current["state"] == CLOSED and current["failures"] == 0
+        if current["state"] == CLOSED:
+            return False
+        reason = self.blocked()
+        if reason is None and self.store.try_probe(self.key, self.reset_timeout, self.probe_timeout):
+            return True
+        raise CircuitOpenError(reason or f"circuit {self.key} is half-open and already probing")
+
+    def record_success(self):
+        if self._known_clean:
+            return
+        self.store.record_success(self.key)
+        self._known_clean = True
+
+    def record_failure(self, reason: str):
+        self._known_clean = False
+        previous = self.store.get(self.key)["state"]
+        if self.store.record_failure(self.key, self.failure_threshold, reason) == OPEN and previous != OPEN:
+            print(f"Circuit {self.key} opened: {reason}")
+
+class _Guard:
+    """Outcome recorder of one guarded call"""
+
+    def __init__(self, breakers: List[CircuitBreaker], failure_statuses: List[int]):
+        self.breakers = breakers
+        self.failure_statuses = failure_statuses
+        self.recorded = False
+
+    def record(self, status_code: int):
+        """Record the HTTP status of the call"""
+        self.recorded = True
+        if status_code in self.failure_statuses:
+            for breaker in self.breakers:
+                breaker.record_failure(f"HTTP {status_code}")
+        else:
+            for breaker in self.breakers:
+                breaker.record_success()
+
+class CircuitBreakerRegistry:
+    """Per-host and per-endpoint circuit breakers of a client"""
+
+    def __init__(self, breaker_config: Optional[Dict[str, Any]] = None, store: Optional[BreakerStore] = None):
+        """
+        Initialize circuit breaker registry
+
+        Args:
+            breaker_config: "circuit_breaker" configuration section
+            store: Shared state store (defaults to the configured state_path)
+        """
+        self.config = breaker_config or {}
+        self.store = store or BreakerStore(self.config.get("state_path", DEFAULT_STATE_PATH))
+        self.failure_statuses = self.config.get("failure_statuses", [502, 503, 504])
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        return f"host:{urlsplit(url).netloc}"
+
+    def breaker(self, key: str) -> CircuitBreaker:
+        """Circuit breaker of one key"""
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(
+                    key, self.store,
+                    failure_threshold=self.config.get("failure_threshold", 5),
+                    reset_timeout=self.config.get("reset_timeout", 30),
+                    probe_timeout=self.config.get("probe_timeout", 15)
+                )
+            return self._breakers[key]
+
+    def breakers_for(self, url: str, endpoint_key: Optional[str]) -> List[CircuitBreaker]:
+        """Host breaker, plus the endpoint breaker when the endpoints.json key is known"""
+        breakers = [self.breaker(self.host_key(url))]
+        if endpoint_key:
+            breakers.append(self.breaker(f"endpoint:{urlsplit(url).netloc}/{endpoint_key}"))
+        return breakers
+
+    @contextmanager
+    def guard(self, url: str, endpoint_key: Optional[str]) -> Iterator[_Guard]:
+        """
+        Admit a call through its host and endpoint circuits and record its outcome
+
+        Connection errors, timeouts, exhausted retries and broken bodies count as
+        failures; the caller records the response status through the yielded guard.
+
+        Raises:
+            CircuitOpenError: If a circuit rejects the call
+        """
+        breakers = self.breakers_for(url, endpoint_key)
+        admitted = []
+        try:
+            for breaker in breakers:
+                breaker.before_call()
+                admitted.append(breaker)
+        except CircuitOpenError:
+            # Do not keep probes claimed for a call that is not made
+            for breaker in admitted:
+                self.store.release_probe(breaker.key)
+            raise
+
+        guard = _Guard(breakers, self.failure_statuses)
+        try:
+            yield guard
+        except NETWORK_ERRORS as e:
+            # Running out of a test's own budget, or being cancelled as a losing hedge,
+            # says nothing about the target
+            deadline = current_deadline()
+            if not isinstance(e, DeadlineExceeded) and not (deadline is not None and deadline.expired):
+                for breaker in breakers:
+                    breaker.record_failure(f"{type(e).__name__}")
+            else:
+                for breaker in breakers:
+                    self.store.release_probe(breaker.key)
+            raise
+        except BaseException:
+            for breaker in breakers:
+                self.store.release_probe(breaker.key)
+            raise
+        if not guard.recorded:
+            for breaker in breakers:
+                self.store.release_probe(breaker.key)
+
+def run_state_path(state_path: Union[str, Path], run_id: str) -> str:
+    """State file of one test run, next to the configured one"""
+    path = Path(state_path)
+    return str(path.with_name(f"{path.stem}-{run_id}{path.suffix}"))
+
+def probe_health(base_url: str, path: str = "/products?limit=1", timeout: float = 5.0,
+                 attempts: int = 2) -> Optional[str]:
+    """
+    Check that the target answers at all
+
+    Args:
+        base_url: API base URL
+        path: Cheap endpoint to request
+        timeout: Connect and read timeout of each attempt
+        attempts: Attempts before giving up
+
+    Returns:
+        None if the target answered with a status below 500, else what went wrong
+    """
+    problem = None
+    for attempt in range(attempts):
+        if attempt:
+            time.sleep(1)
+        try:
+            response = requests.get(f"{base_url}{path}", timeout=(timeout, timeout))
+        except requests.RequestException as e:
+            problem = f"{type(e).__name__}: {e}"
+            continue
+        if response.status_code < 500:
+            return None
+        problem = f"HTTP {response.status_code}"
+    return problem
+
+class HealthGatePlugin:
+    """pytest plugin probing the target once per session and failing or skipping network tests fast while it is down"""
+
+    def __init__(self, config, base_url: str, on_unreachable: str = "fail",
+                 health_config: Optional[Dict[str, Any]] = None,
+                 breaker_config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize health gate plugin
+
+        Args:
+            config: pytest config
+            base_url: API base URL
+            on_unreachable: "fail" or "skip" network tests while the host circuit is open
+            health_config: "health_check" configuration section
+            breaker_config: "circuit_breaker" configuration section
+        """
+        self.config = config
+        self.base_url = base_url
+        self.on_unreachable = on_unreachable
+        self.health_config = health_config or {}
+        # Circuits live in a state file of this run, so concurrent runs in one checkout neither
+        # see nor wipe each other's; workers receive the run id through workerinput
+        workerinput = getattr(config, "workerinput", None)
+        self.run_id = workerinput["breaker_run_id"] if workerinput else uuid.uuid4().hex[:12]
+        self.breaker_config = dict(breaker_config or {})
+        self.breaker_config["state_path"] = run_state_path(
+            self.breaker_config.get("state_path", DEFAULT_STATE_PATH), self.run_id)
+        self.registry = CircuitBreakerRegistry(self.breaker_config)
+        self.host_breaker = self.registry.breaker(CircuitBreakerRegistry.host_key(base_url))
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        # xdist controller: hand the run id to a worker before it starts
+        node.workerinput["breaker_run_id"] = self.run_id
+
+    def pytest_sessionstart(self, session):
+        # The xdist controller runs this before starting workers; workers only read the shared state
+        if hasattr(self.config, "workerinput"):
+            return
+        started = time.perf_counter()
+        problem = probe_health(self.base_url, self.health_config.get("path", "/products?limit=1"),
+                               self.health_config.get("timeout", 5), self.health_config.get("attempts", 2))
+        if problem is None:
+            return
+        self.registry.store.trip(self.host_breaker.key, f"health check failed: {problem}")
+        print(f"\nHealth check: {self.base_url} unreachable after {time.perf_counter() - started:.1f}s "
+              f"({problem}); network tests will {self.on_unreachable} until it recovers")
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        # Network tests are those using the API client, directly or through other fixtures
+        if "api_client" not in getattr(item, "fixturenames", ()):
+            return
+        reason = self.host_breaker.blocked()
+        if reason is None:
+            return
+        if self.on_unreachable == "skip":
+            pytest.skip(f"Target unavailable: {reason}")
+        pytest.fail(f"Target unavailable: {reason}", pytrace=False)
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        # Runs once workers are done: in the xdist controller, or in the only process
+        if hasattr(self.config, "workerinput"):
+            return
+        self.registry.store.close()
+        path = self.registry.store.path
+        for state_file in (path, path.with_name(f"{path.name}-wal"), path.with_name(f"{path.name}-shm")):
+            try:
+                state_file.unlink(missing_ok=True)
+            except OSError as e:
+                print(f"Failed to remove circuit breaker state {state_file}: {e}")
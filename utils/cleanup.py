@@ -0,0 +1,292 @@
+import contextvars
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+import pytest
+import requests
+from .api_client import APIClient
+from .deadline import current_deadline, deadline_scope
+from .json_codec import codec
+
+# Carts reference users and products, so they go first
+DELETE_ORDER = ("carts", "users", "products")
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Ids a finished run could not delete; the next run to start cleaning claims them
+LEFTOVER_NAME = "leftover"
+
+class CleanupRegistry:
+    """Append-only spool of created resource ids, one file per process"""
+
+    def __init__(self, spool_dir: str = ".cache/cleanup", name: Optional[str] = None,
+                 run_id: str = "run"):
+        """
+        Initialize cleanup registry
+
+        Args:
+            spool_dir: Directory shared by all workers, and by concurrent runs
+            name: Spool file name (defaults to run id, xdist worker id and pid)
+            run_id: Id of the test run the spooled resources belong to
+        """
+        self.spool_dir = Path(spool_dir)
+        worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        self.path = self.spool_dir / f"{name or f'{run_id}-{worker}-{os.getpid()}'}.jsonl"
+        self._lock = threading.Lock()
+
+    def add(self, resource: str, resource_id: Any):
+        """Record one created resource"""
+        self.add_many(resource, [resource_id])
+
+    def add_many(self, resource: str, resource_ids: Iterable[Any]):
+        """Record created resources; lines are flushed immediately so a crashed worker loses nothing"""
+        lines = "".join(codec.dumps({"resource": resource, "id": resource_id}) + "\n"
+                        for resource_id in resource_ids)
+        if not lines:
+            return
+        with self._lock:
+            self.spool_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+
+    @staticmethod
+    def collect(spool_dir: str = ".cache/cleanup",
+                run_id: str = "run") -> Tuple[Dict[str, List[Any]], List[Path]]:
+        """
+        Read the spool files of one run, plus the leftovers of earlier runs
+
+        Spool files of other runs sharing the directory are left alone. The leftover
+        file is renamed to this run first, so only one concurrent run retries it.
+
+        Args:
+            spool_dir: Spool directory
+            run_id: Id of the run being cleaned up
+
+        Returns:
+            Deduplicated ids per resource, and the spool files read
+        """
+        leftover = Path(spool_dir) / f"{LEFTOVER_NAME}.jsonl"
+        try:
+            os.replace(leftover, Path(spool_dir) / f"{run_id}-{LEFTOVER_NAME}.jsonl")
+        except FileNotFoundError:
+            pass
+
+        ids: Dict[str, Dict[Any, None]] = {}
+        files = sorted(Path(spool_dir).glob(f"{run_id}-*.jsonl"))
+        for path in files:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = codec.loads(line)
+                    except ValueError:
+                        continue  # Torn last line of a killed worker
+                    ids.setdefault(entry["resource"], {})[entry["id"]] = None
+        return {resource: list(resource_ids) for resource, resource_ids in ids.items()}, files
+
+class CleanupReport:
+    """Outcome of a cleanup run"""
+
+    def __init__(self):
+        self.deleted: Dict[str, int] = {}
+        self.failed: Dict[str, List[Dict[str, Any]]] = {}
+        self.durations: Dict[str, float] = {}
+        self.duration = 0.0
+
+    @property
+    def total_deleted(self) -> int:
+        return sum(self.deleted.values())
+
+    @property
+    def total_failed(self) -> int:
+        return sum(len(failures) for failures in self.failed.values())
+
+    def leftover_ids(self) -> Dict[str, List[Any]]:
+        """Ids that failed transiently, for the next run to retry; permanent failures never succeed"""
+        leftovers = {resource: [failure["id"] for failure in failures
+                                if not failure["error"].startswith("permanent")]
+                     for resource, failures in self.failed.items()}
+        return {resource: ids for resource, ids in leftovers.items() if ids}
+
+    def summary(self) -> str:
+        """One-line human readable summary"""
+        phases = ", ".join(f"{resource} {self.deleted.get(resource, 0)} in {seconds:.2f}s"
+                           for resource, seconds in self.durations.items())
+        return (f"Cleanup deleted {self.total_deleted} resources in {self.duration:.2f}s "
+                f"({phases}), {self.total_failed} failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Report as JSON-serializable dict"""
+        return {
+            "duration": round(self.duration, 3),
+            "durations": {k: round(v, 3) for k, v in self.durations.items()},
+            "deleted": dict(self.deleted),
+            "failed": {k: list(v) for k, v in self.failed.items()}
+        }
+
+    def save(self, path: str = "reports/cleanup/cleanup_report.json") -> str:
+        """Save report to JSON file"""
+        output_path = Path(path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        codec.dump(self.to_dict(), output_path, indent=2)
+        return str(output_path)
+
+class CleanupEngine:
+    """Deletes created resources in dependency order with concurrent, retried batches"""
+
+    def __init__(self, client, batch_size: int = 20, max_workers: int = 8,
+                 retries: int = 3, backoff: float = 0.5):
+        """
+        Initialize cleanup engine
+
+        Args:
+            client: APIClient used for the deletes
+            batch_size: Deletes submitted together
+            max_workers: Concurrent deletes
+            retries: Extra attempts for deletes failing with a transient error
+            backoff: Base delay in seconds before a retry, doubled per attempt
+        """
+        self.client = client
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.retries = retries
+        self.backoff = backoff
+
+    def _delete(self, resource: str, resource_id: Any) -> Optional[str]:
+        """Delete one resource; returns None once it is gone (404 included), else the error"""
+        try:
+            response = getattr(self.client, resource).delete(resource_id)
+        except requests.RequestException as e:
+            return f"{type(e).__name__}: {e}"
+        if response.status_code in RETRYABLE_STATUS:
+            return f"HTTP {response.status_code}"
+        if response.status_code >= 400 and response.status_code != 404:
+            # Permanent failure; retrying will not help
+            return f"permanent HTTP {response.status_code}"
+        return None
+
+    def _delete_all(self, executor: ThreadPoolExecutor, resource: str,
+                    resource_ids: List[Any]) -> List[Dict[str, Any]]:
+        """Delete ids batch by batch, retrying transient failures after each full pass"""
+        pending = resource_ids
+        failed: List[Dict[str, Any]] = []
+        deadline = current_deadline()
+        for attempt in range(self.retries + 1):
+            if attempt:
+                delay = self.backoff * 2 ** (attempt - 1)
+                time.sleep(deadline.cap(delay) if deadline is not None else delay)
+            transient = []
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+                if deadline is not None and deadline.expired:
+                    transient.extend(batch)
+                    continue
+                # Each delete runs in a copy of this context so it sees the cleanup deadline
+                contexts = [contextvars.copy_context() for _ in batch]
+                errors = executor.map(
+                    lambda context, resource_id: context.run(self._delete, resource, resource_id), contexts, batch)
+                for resource_id, error in zip(batch, errors):
+                    if error is None:
+                        continue
+                    if error.startswith("permanent") or attempt == self.retries:
+                        failed.append({"id": resource_id, "error": error})
+                    else:
+                        transient.append(resource_id)
+            pending = transient
+            if not pending:
+                break
+            if deadline is not None and deadline.expired:
+                failed.extend({"id": resource_id, "error": "cleanup deadline exceeded"} for resource_id in pending)
+                break
+        return failed
+
+    def run(self, ids: Dict[str, List[Any]]) -> CleanupReport:
+        """
+        Delete resources, finishing each resource kind before starting the next
+
+        Args:
+            ids: Resource ids per resource name
+
+        Returns:
+            Cleanup report
+        """
+        report = CleanupReport()
+        started = time.perf_counter()
+        order = [r for r in DELETE_ORDER if r in ids] + [r for r in ids if r not in DELETE_ORDER]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="cleanup") as executor:
+            for resource in order:
+                resource_ids = ids[resource]
+                if not resource_ids:
+                    continue
+                phase_started = time.perf_counter()
+                failed = self._delete_all(executor, resource, resource_ids)
+                report.deleted[resource] = len(resource_ids) - len(failed)
+                if failed:
+                    report.failed[resource] = failed
+                report.durations[resource] = time.perf_counter() - phase_started
+
+        report.duration = time.perf_counter() - started
+        return report
+
+class CleanupPlugin:
+    """pytest plugin deleting the resources created by every worker once the session ends"""
+
+    def __init__(self, config, cleanup_config: Optional[Dict[str, Any]] = None):
+        self.config = config
+        self.cleanup_config = cleanup_config or {}
+        self.enabled = self.cleanup_config.get("enabled", True) and not config.getoption("--keep-created")
+        self.spool_dir = self.cleanup_config.get("spool_dir", ".cache/cleanup")
+        # The controller names the run; workers receive the id through workerinput
+        workerinput = getattr(config, "workerinput", None)
+        self.run_id = workerinput["cleanup_run_id"] if workerinput else uuid.uuid4().hex[:12]
+        self.registry = CleanupRegistry(self.spool_dir, run_id=self.run_id)
+
+    def register(self, resource: str, resource_ids: Iterable[Any]):
+        """Schedule created resources for deletion at session end"""
+        if self.enabled:
+            self.registry.add_many(resource, resource_ids)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        # xdist controller: hand the run id to a worker before it starts
+        node.workerinput["cleanup_run_id"] = self.run_id
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session):
+        # Runs once: in the xdist controller after all workers finished, or in the only process
+        if not self.enabled or hasattr(self.config, "workerinput"):
+            return
+
+        ids, files = CleanupRegistry.collect(self.spool_dir, self.run_id)
+        if not any(ids.values()):
+            return
+
+        client = APIClient()
+        try:
+            engine = CleanupEngine(
+                client,
+                batch_size=self.cleanup_config.get("batch_size", 20),
+                max_workers=self.cleanup_config.get("max_workers", 8),
+                retries=self.cleanup_config.get("retries", 3),
+                backoff=self.cleanup_config.get("backoff", 0.5)
+            )
+            with deadline_scope(self.cleanup_config.get("deadline"), label="cleanup deadline"):
+                report = engine.run(ids)
+        finally:
+            client.close()
+
+        for path in files:
+            path.unlink(missing_ok=True)
+        leftovers = CleanupRegistry(self.spool_dir, name=LEFTOVER_NAME)
+        for resource, resource_ids in report.leftover_ids().items():
+            leftovers.add_many(resource, resource_ids)
+
+        print(f"\n{report.summary()}")
+        print(f"Cleanup report written to {report.save()}")
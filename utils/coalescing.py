@@ -0,0 +1,140 @@
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, cast
+import requests
+from requests.structures import CaseInsensitiveDict
+from .deadline import DeadlineExceeded, current_deadline
+
+# Per-caller request options; requests using them are never shared with other callers
+PRIVATE_OPTIONS = ("auth", "cookies", "cert", "verify", "proxies", "allow_redirects")
+
+def clone_response(response: requests.Response) -> requests.Response:
+    """
+    Create an independent copy of a fully read response
+
+    Args:
+        response: Response whose body has been consumed
+
+    Returns:
+        Response sharing no mutable state with the original
+    """
+    clone = response.__class__.__new__(response.__class__)
+    clone.__dict__.update(response.__dict__)
+    clone._content = response.content
+    clone._content_consumed = True
+    clone.raw = None
+    clone.headers = CaseInsensitiveDict(response.headers)
+    clone.cookies = response.cookies.copy()
+    clone.history = list(response.history)
+    clone.request = response.request.copy() if response.request is not None else None
+    return clone
+
+def _follower_error(error: BaseException) -> BaseException:
+    """
+    Create a fresh exception for a follower from the leader's error
+
+    Args:
+        error: Exception raised by the leader
+
+    Returns:
+        Exception of the same type where it can be copied, else a RequestException
+    """
+    try:
+        fresh = copy.copy(error)
+    except Exception:
+        fresh = requests.exceptions.RequestException(f"Coalesced request failed: {error!r}")
+    if fresh is error:
+        fresh = requests.exceptions.RequestException(f"Coalesced request failed: {error!r}")
+    fresh.__traceback__ = None
+    return fresh
+
+class _Call:
+    """In-flight call shared by concurrent callers"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[requests.Response] = None
+        self.error: Optional[BaseException] = None
+
+class SingleFlight:
+    """Deduplicates concurrent identical calls so only one reaches the network"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], requests.Response]) -> Tuple[requests.Response, bool]:
+        """
+        Execute fn once per key among concurrent callers
+
+        Args:
+            key: Identity of the call
+            fn: Function performing the request
+
+        Returns:
+            Tuple of (response, shared) where shared is True if the caller
+            received a copy of another caller's response
+
+        Raises:
+            DeadlineExceeded: If the caller's deadline runs out while waiting for the leader
+        """
+        with self._lock:
+            leading = self._calls.get(key)
+            if leading is None:
+                call = self._calls[key] = _Call()
+
+        if leading is not None:
+            deadline = current_deadline()
+            if deadline is None:
+                leading.done.wait()
+            elif not leading.done.wait(max(deadline.remaining(), 0.0)):
+                raise DeadlineExceeded(f"{deadline.label or 'Deadline'} of {deadline.seconds:g}s "
+                                       f"exceeded while waiting for a coalesced request")
+            if isinstance(leading.error, DeadlineExceeded):
+                # The leader's budget is not ours; retry on the follower's own deadline
+                return fn(), False
+            if leading.error is not None:
+                raise _follower_error(leading.error) from leading.error
+            # The leader sets either an error or a result before signalling
+            return clone_response(cast(requests.Response, leading.result)), True
+
+        try:
+            response = fn()
+            # Followers copy from a pristine clone, never from the leader's own object
+            call.result = clone_response(response)
+            return response, False
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    @staticmethod
+    def make_key(method: str, url: str, kwargs: Dict[str, Any]) -> Optional[Hashable]:
+        """
+        Build a coalescing key for a request
+
+        Args:
+            method: HTTP method
+            url: Full request URL
+            kwargs: Request keyword arguments
+
+        Returns:
+            Hashable key, or None if the request must not be coalesced
+        """
+        if any(kwargs.get(name) is not None for name in ("data", "json", "files") + PRIVATE_OPTIONS):
+            return None
+        if kwargs.get("stream"):
+            return None
+
+        try:
+            params = kwargs.get("params") or {}
+            params = tuple(sorted(params.items())) if isinstance(params, dict) else tuple(params)
+            headers = tuple(sorted((k.lower(), v) for k, v in (kwargs.get("headers") or {}).items()))
+            key = (method.upper(), url, params, headers)
+            hash(key)
+            return key
+        except TypeError:
+            return None
@@ -0,0 +1,149 @@
+import random
+from itertools import combinations, islice, product
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple, cast
+
+class CombinationGenerator:
+    """Streaming generator for full and n-wise (covering array) test combinations"""
+
+    def __init__(self, parameters: Dict[str, List[Any]], strength: Optional[int] = 2, seed: int = 0,
+                 candidates: int = 10):
+        """
+        Initialize combination generator
+
+        Args:
+            parameters: Dictionary mapping parameter names to lists of values
+            strength: Interaction strength (2 = pairwise); None generates the full product
+            seed: Seed for deterministic tie-breaking
+            candidates: Candidate rows evaluated per emitted row (more = smaller arrays, slower)
+        """
+        self.names = list(parameters.keys())
+        self.values = [list(v) for v in parameters.values()]
+        self.seed = seed
+        self.candidates = max(1, candidates)
+
+        if strength is not None and strength < 1:
+            raise ValueError(f"Combination strength must be >= 1, got {strength}")
+
+        # Full product whenever the requested strength covers every parameter
+        if strength is None or strength >= len(self.names):
+            self.strength = None
+        else:
+            self.strength = strength
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if not self.names or any(len(v) == 0 for v in self.values):
+            return iter(())
+
+        if self.strength is None:
+            return (dict(zip(self.names, row)) for row in product(*self.values))
+
+        return (self._to_dict(row) for row in self._covering_rows(self.strength))
+
+    def full_size(self) -> int:
+        """Number of rows in the full cartesian product"""
+        size = 1
+        for values in self.values:
+            size *= len(values)
+        return size
+
+    def _covering_rows(self, t: int) -> Iterator[Tuple[int, ...]]:
+        """
+        Greedily build a covering array one row at a time
+
+        Several candidate rows are built per step; each is seeded with the first uncovered
+        interaction and fills the remaining parameters in shuffled order with the value
+        covering the most uncovered interactions. The best candidate is emitted.
+        """
+        field_count = len(self.names)
+        field_groups = list(combinations(range(field_count), t))
+        rng = random.Random(self.seed)
+
+        # dict keeps insertion order, so generation is deterministic across processes
+        uncovered: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], None] = {}
+        for group in field_groups:
+            for value_indexes in product(*(range(len(self.values[f])) for f in group)):
+                uncovered[(group, value_indexes)] = None
+
+        while uncovered:
+            best_row: Tuple[int, ...] = ()
+            best_gain = -1
+            for _ in range(self.candidates):
+                row = self._candidate_row(uncovered, rng, t)
+                gain = sum(1 for group in field_groups if (group, tuple(row[f] for f in group)) in uncovered)
+                if gain > best_gain:
+                    best_row, best_gain = row, gain
+
+            for group in field_groups:
+                uncovered.pop((group, tuple(best_row[f] for f in group)), None)
+
+            yield best_row
+
+    def _candidate_row(self, uncovered: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], None],
+                       rng: random.Random, t: int) -> Tuple[int, ...]:
+        """Build one candidate row seeded with the first uncovered interaction"""
+        field_count = len(self.names)
+        seed_group, seed_values = next(iter(uncovered))
+        row: List[Optional[int]] = [None] * field_count
+        for field, value_index in zip(seed_group, seed_values):
+            row[field] = value_index
+
+        fill_order = [f for f in range(field_count) if row[f] is None]
+        rng.shuffle(fill_order)
+
+        for field in fill_order:
+            assigned = [f for f in range(field_count) if row[f] is not None]
+            best_values: List[int] = []
+            best_score = -1
+
+            for value_index in range(len(self.values[field])):
+                row[field] = value_index
+                score = 0
+                for others in combinations(assigned, t - 1):
+                    group = tuple(sorted(others + (field,)))
+                    if (group, tuple(row[f] for f in group)) in uncovered:
+                        score += 1
+                if score > best_score:
+                    best_score = score
+                    best_values = [value_index]
+                elif score == best_score:
+                    best_values.append(value_index)
+
+            row[field] = rng.choice(best_values)
+
+        # Every field is assigned by now
+        return cast(Tuple[int, ...], tuple(row))
+
+    def _to_dict(self, row: Tuple[int, ...]) -> Dict[str, Any]:
+        """Map a row of value indexes back to parameter values"""
+        return {name: self.values[i][value_index] for i, (name, value_index) in enumerate(zip(self.names, row))}
+
+def shard(items: Iterable[Any], shard_index: int = 0, shard_count: int = 1) -> Iterator[Any]:
+    """
+    Deterministically select every shard_count-th item starting at shard_index
+
+    Args:
+        items: Items to shard (consumed lazily)
+        shard_index: Zero-based shard index
+        shard_count: Total number of shards
+
+    Returns:
+        Iterator over the items belonging to the shard
+    """
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"Invalid shard {shard_index}/{shard_count}")
+
+    return islice(items, shard_index, None, shard_count)
+
+def parse_strength(value: Optional[str]) -> Optional[int]:
+    """
+    Parse a combination strength option
+
+    Args:
+        value: Strength as string ("2", "3", ...) or "full"
+
+    Returns:
+        Strength as integer, or None for the full product
+    """
+    if value is None or str(value).lower() == "full":
+        return None
+    return int(value)
@@ -0,0 +1,248 @@
+import gzip
+import zlib
+from typing import Iterator, List, Optional
+
+try:
+    import brotli  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import brotlicffi as brotli  # type: ignore[import-not-found, no-redef]
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Preference order used when the configuration does not list encodings
+DEFAULT_ENCODINGS = ["zstd", "br", "gzip", "deflate"]
+
+# Largest piece of decoded output produced at once
+DEFAULT_MAX_OUTPUT = 64 * 1024
+# Input slice size for decoders that cannot bound their output
+UNBOUNDED_DECODER_INPUT = 256
+
+# Exceptions raised by the decoders on corrupt bodies
+DECODE_ERRORS = tuple(
+    error for error in (
+        zlib.error,
+        getattr(brotli, "error", None),
+        getattr(zstandard, "ZstdError", None)
+    ) if error is not None
+)
+
+def available_encodings() -> List[str]:
+    """
+    List content encodings that can be decoded in this environment
+
+    Returns:
+        Encoding names; gzip and deflate are always available
+    """
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.extend(["gzip", "deflate"])
+    return encodings
+
+def accept_encoding_header(preferred: Optional[List[str]] = None) -> str:
+    """
+    Build the Accept-Encoding header value
+
+    Args:
+        preferred: Encodings in order of preference (unavailable ones are dropped)
+
+    Returns:
+        Header value, "identity" if nothing usable remains
+    """
+    available = set(available_encodings())
+    encodings = [e for e in (preferred or DEFAULT_ENCODINGS) if e in available]
+    return ", ".join(encodings) or "identity"
+
+def compress_body(data: bytes, encoding: str = "gzip", level: int = 6) -> bytes:
+    """
+    Compress a request body
+
+    Args:
+        data: Body to compress
+        encoding: "gzip" or "deflate"
+        level: Compression level
+
+    Returns:
+        Compressed body
+    """
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(data, level)
+    raise ValueError(f"Unsupported request body encoding: {encoding}")
+
+class _ZlibDecoder:
+    """zlib-based decoder whose output per call is bounded by max_length"""
+
+    wbits = zlib.MAX_WBITS
+
+    def __init__(self):
+        self._obj = zlib.decompressobj(self.wbits)
+
+    def decompress(self, data: bytes, max_length: int) -> Iterator[bytes]:
+        yield from self._drain(self._obj.decompress(data, max_length), max_length)
+
+    def _drain(self, output: bytes, max_length: int) -> Iterator[bytes]:
+        """Yield output, then keep inflating the unconsumed input in bounded pieces"""
+        while True:
+            if output:
+                yield output
+            if self._obj.eof:
+                data = self._obj.unused_data
+                if not data or not self._next_member():
+                    return
+                output = self._obj.decompress(data, max_length)
+                continue
+            data = self._obj.unconsumed_tail
+            if not data and len(output) < max_length:
+                return
+            output = self._obj.decompress(data, max_length)
+
+    def _next_member(self) -> bool:
+        """Start decoding data that follows the end of the stream (False to ignore it)"""
+        return False
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+class _GzipDecoder(_ZlibDecoder):
+    """gzip decoder handling multi-member streams"""
+
+    wbits = 16 + zlib.MAX_WBITS
+
+    def _next_member(self) -> bool:
+        # Another gzip member may follow the one that just ended
+        self._obj = zlib.decompressobj(self.wbits)
+        return True
+
+class _DeflateDecoder(_ZlibDecoder):
+    """deflate decoder accepting both zlib-wrapped and raw streams"""
+
+    def __init__(self):
+        super().__init__()
+        self._first_chunk = True
+
+    def decompress(self, data: bytes, max_length: int) -> Iterator[bytes]:
+        if not self._first_chunk:
+            yield from super().decompress(data, max_length)
+            return
+
+        self._first_chunk = False
+        try:
+            output = self._obj.decompress(data, max_length)
+        except zlib.error:
+            # Some servers send raw deflate without the zlib header
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+            output = self._obj.decompress(data, max_length)
+        yield from self._drain(output, max_length)
+
+class _BrotliDecoder:
+    def __init__(self):
+        self._obj = brotli.Decompressor()
+        # brotli >= 1.2 can bound the output of each call
+        self._bounded = "output_buffer_limit" in (getattr(self._obj.process, "__doc__", None) or "")
+
+    def decompress(self, data: bytes, max_length: int) -> Iterator[bytes]:
+        if self._bounded:
+            output = self._obj.process(data, output_buffer_limit=max_length)
+            # Output stays buffered in the decompressor until a call returns nothing
+            while output:
+                yield output
+                output = self._obj.process(b"", output_buffer_limit=max_length)
+            return
+
+        for piece in _slices(data):
+            output = self._obj.process(piece) if hasattr(self._obj, "process") else self._obj.decompress(piece)
+            if output:
+                yield output
+
+    def flush(self) -> bytes:
+        return b""
+
+class _ZstdDecoder:
+    def __init__(self):
+        self._obj = zstandard.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes, max_length: int) -> Iterator[bytes]:
+        for piece in _slices(data):
+            output = self._obj.decompress(piece)
+            if output:
+                yield output
+
+    def flush(self) -> bytes:
+        return b""
+
+def _slices(data: bytes) -> Iterator[bytes]:
+    """Feed decoders without an output bound small inputs, limiting what one call can expand to"""
+    for start in range(0, len(data), UNBOUNDED_DECODER_INPUT):
+        yield data[start:start + UNBOUNDED_DECODER_INPUT]
+
+class ContentDecoder:
+    """Incremental decoder for a Content-Encoding header value"""
+
+    def __init__(self, content_encoding: str):
+        """
+        Initialize content decoder
+
+        Args:
+            content_encoding: Content-Encoding header value, e.g. "gzip" or "deflate, gzip"
+
+        Raises:
+            ValueError: If an encoding cannot be decoded in this environment
+        """
+        encodings = [e.strip().lower() for e in content_encoding.split(",") if e.strip()]
+        # Encodings are listed in the order they were applied, so undo them in reverse
+        self._decoders = [self._decoder_for(e) for e in reversed(encodings) if e != "identity"]
+
+    @staticmethod
+    def _decoder_for(encoding: str):
+        if encoding in ("gzip", "x-gzip"):
+            return _GzipDecoder()
+        if encoding == "deflate":
+            return _DeflateDecoder()
+        if encoding == "br" and brotli is not None:
+            return _BrotliDecoder()
+        if encoding == "zstd" and zstandard is not None:
+            return _ZstdDecoder()
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    def decompress(self, data: bytes, max_length: int = DEFAULT_MAX_OUTPUT) -> Iterator[bytes]:
+        """
+        Decode the next chunk of the body
+
+        Output is produced in pieces so that callers can enforce size caps before a highly
+        compressed chunk is inflated in full. gzip, deflate and brotli >= 1.2 never return more
+        than max_length bytes per piece; zstd and older brotli are fed small input slices.
+
+        Args:
+            data: Next chunk of the encoded body
+            max_length: Upper bound of each decoded piece
+
+        Yields:
+            Decoded pieces
+        """
+        return self._through(0, data, max_length)
+
+    def flush(self, max_length: int = DEFAULT_MAX_OUTPUT) -> Iterator[bytes]:
+        """Decode whatever remains buffered at the end of the body"""
+        for stage, decoder in enumerate(self._decoders):
+            remainder = decoder.flush()
+            if remainder:
+                yield from self._through(stage + 1, remainder, max_length)
+
+    def _through(self, stage: int, data: bytes, max_length: int) -> Iterator[bytes]:
+        """Pass data through the decoders from stage on"""
+        if stage == len(self._decoders):
+            if data:
+                yield data
+            return
+        for piece in self._decoders[stage].decompress(data, max_length):
+            yield from self._through(stage + 1, piece, max_length)
@@ -0,0 +1,155 @@
+import hashlib
+import inspect
+import json
+import os
+import random
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Callable
+from config import get_config
+from .helpers import TestHelper
+from .json_codec import codec
+
+# Memoized payloads are only valid for the generators that produced them
+GENERATOR_VERSION = hashlib.sha256(inspect.getsource(TestHelper).encode("utf-8")).hexdigest()[:12]
+
+class SeededDataGenerator:
+    """Deterministic test data generator keyed by pytest node id"""
+
+    def __init__(self, seed: Optional[int] = None, cache_dir: Optional[str] = None,
+                 memoize: Optional[bool] = None):
+        """
+        Initialize seeded data generator
+
+        Args:
+            seed: Base seed (defaults to the configured faker seed)
+            cache_dir: Directory for memoized payloads (defaults to configuration)
+            memoize: Whether generated payloads are memoized on disk
+        """
+        self.config = get_config()
+        generation_config = self.config["data_generation"]
+
+        self.seed = seed if seed is not None else self.config["faker"].get("seed", 0)
+        self.memoize = generation_config.get("memoize", True) if memoize is None else memoize
+        self.cache_dir = Path(cache_dir or generation_config.get("cache_dir", ".cache/generated_data"))
+
+        date_range = generation_config.get("date_range", {})
+        self.start_date = datetime.fromisoformat(date_range.get("start", "2019-01-01"))
+        self.end_date = datetime.fromisoformat(date_range.get("end", "2020-12-31"))
+        # Generation settings that shape payloads, part of every memo cache key
+        self.settings_key = f"{self.start_date.isoformat()}..{self.end_date.isoformat()}"
+
+        if self.memoize:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def rng_for(self, node_id: str, kind: str = "default") -> random.Random:
+        """
+        Derive an independent random stream for a test
+
+        Args:
+            node_id: pytest node id
+            kind: Payload kind, so different payloads of one test do not share a stream
+
+        Returns:
+            Seeded random number generator
+        """
+        digest = hashlib.sha256(f"{self.seed}:{kind}:{node_id}".encode("utf-8")).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def product_data(self, node_id: str, custom_fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Generate reproducible product data for a test
+
+        Args:
+            node_id: pytest node id
+            custom_fields: Custom fields to override defaults
+
+        Returns:
+            Product data dictionary
+        """
+        data = self._generate("product", node_id, lambda rng: TestHelper.generate_product_data(rng=rng))
+        return self._apply_custom_fields(data, custom_fields)
+
+    def user_data(self, node_id: str, custom_fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Generate reproducible user data for a test
+
+        Args:
+            node_id: pytest node id
+            custom_fields: Custom fields to override defaults
+
+        Returns:
+            User data dictionary
+        """
+        data = self._generate("user", node_id, lambda rng: TestHelper.generate_user_data(rng=rng))
+        return self._apply_custom_fields(data, custom_fields)
+
+    def cart_data(self, node_id: str, user_id: int,
+                  custom_fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Generate reproducible cart data for a test
+
+        Args:
+            node_id: pytest node id
+            user_id: User ID for the cart
+            custom_fields: Custom fields to override defaults
+
+        Returns:
+            Cart data dictionary
+        """
+        data = self._generate(
+            f"cart:{user_id}", node_id,
+            lambda rng: TestHelper.generate_cart_data(
+                user_id, rng=rng, start_date=self.start_date, end_date=self.end_date
+            )
+        )
+        return self._apply_custom_fields(data, custom_fields)
+
+    def clear_cache(self):
+        """Remove all memoized payloads"""
+        if self.cache_dir.exists():
+            for cache_file in self.cache_dir.glob("*.json"):
+                cache_file.unlink(missing_ok=True)
+        print("Generated data cache cleared")
+
+    def _generate(self, kind: str, node_id: str,
+                  factory: Callable[[random.Random], Dict[str, Any]]) -> Dict[str, Any]:
+        """Generate payload or load it from the memo cache"""
+        if not self.memoize:
+            return factory(self.rng_for(node_id, kind))
+
+        cache_key = hashlib.sha256(
+            f"{GENERATOR_VERSION}:{self.settings_key}:{self.seed}:{kind}:{node_id}".encode("utf-8")
+        ).hexdigest()
+        cache_file = self.cache_dir / f"{cache_key}.json"
+
+        if cache_file.exists():
+            try:
+                return codec.load(cache_file)["data"]
+            except (json.JSONDecodeError, KeyError, IOError) as e:
+                print(f"Ignoring corrupt generated data cache {cache_file.name}: {e}")
+
+        data = factory(self.rng_for(node_id, kind))
+        self._write_atomic(cache_file, {"node_id": node_id, "kind": kind, "seed": self.seed,
+                                       "generator_version": GENERATOR_VERSION, "settings": self.settings_key,
+                                       "data": data})
+        return data
+
+    def _write_atomic(self, path: Path, payload: Dict[str, Any]):
+        """Write cache file atomically so concurrent workers never see partial files"""
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(codec.dumps_bytes(payload))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Failed to memoize generated data {path.name}: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+
+    @staticmethod
+    def _apply_custom_fields(data: Dict[str, Any], custom_fields: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply custom field overrides on top of generated data"""
+        if custom_fields:
+            data.update(custom_fields)
+        return data
@@ -1,10 +1,14 @@
+import copy
 import json
 import random
 from typing import Dict, Any, List, Optional, Iterator, Union
 from pathlib import Path
-from itertools import product
 from config import get_config
 from .helpers import TestHelper
+from .hooks import HookRegistry
+from .json_codec import codec
+from .combinatorics import CombinationGenerator, shard
+from .data_store import LRUCache, TestDataStore
 
 class DataProvider:
     def __init__(self, data_dir: str = "test_data"):
@@ -16,14 +20,29 @@ class DataProvider:
         """
         self.config = get_config()
         self.data_dir = Path(data_dir)
-        self.data_cache = {}
+        test_data_config = self.config.get("test_data", {})
+        self.data_cache = LRUCache(test_data_config.get("file_cache_size", 16))
+        self.store_config = test_data_config.get("store", {})
+        self._store: Optional[TestDataStore] = None
         self.helper = TestHelper()
+        self.hooks = HookRegistry()
         
         # Ensure data directory exists
         self.data_dir.mkdir(exist_ok=True)
         
         print(f"Data provider initialized - Data directory: {self.data_dir}")
     
+    @property
+    def store(self) -> Optional[TestDataStore]:
+        """Indexed test case store, opened on first use (None when disabled)"""
+        if self._store is None and self.store_config.get("enabled", True):
+            self._store = TestDataStore(
+                self.data_dir,
+                self.store_config.get("path", ".cache/test_data.sqlite"),
+                self.store_config.get("case_cache_size", 1024)
+            )
+        return self._store
+    
     def load_json_data(self, filename: str, use_cache: bool = True) -> Dict[str, Any]:
         """
         Load test data from JSON file
@@ -39,6 +58,8 @@ class DataProvider:
         if not filename.endswith('.json'):
             filename += '.json'
         
+        self.hooks.emit("test_data", name=filename, path=str(self.data_dir / filename))
+        
         # Check cache first
         if use_cache and filename in self.data_cache:
             print(f"Loading cached data: {filename}")
@@ -50,8 +71,7 @@ class DataProvider:
             raise FileNotFoundError(f"Test data file not found: {file_path}")
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = codec.load(file_path)
             
             # Cache the data
             if use_cache:
@@ -76,18 +96,38 @@ class DataProvider:
         Returns:
             List of test case dictionaries
         """
+        return list(self.iter_test_cases(test_suite, test_type))
+    
+    def iter_test_cases(self, test_suite: str, test_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield test cases for a specific test suite
+        
+        With the store enabled the test type filter is an index lookup and
+        each case is decoded only when reached.
+        
+        Args:
+            test_suite: Test suite name (e.g., 'products', 'users')
+            test_type: Specific test type filter (optional)
+            
+        Yields:
+            Test case dictionaries
+        """
         filename = f"{test_suite}_test_data.json"
+        store = self.store
+        if store is not None:
+            file_path = self.data_dir / filename
+            self.hooks.emit("test_data", name=filename, path=str(file_path))
+            if not file_path.exists():
+                raise FileNotFoundError(f"Test data file not found: {file_path}")
+            yield from store.iter_cases(test_suite, test_type)
+            return
+        
         data = self.load_json_data(filename)
         
-        if test_type:
+        for case in data.get('test_cases', []):
             # Filter by test type
-            filtered_cases = []
-            for case in data.get('test_cases', []):
-                if case.get('test_type') == test_type:
-                    filtered_cases.append(case)
-            return filtered_cases
-        
-        return data.get('test_cases', [])
+            if not test_type or case.get('test_type') == test_type:
+                yield case
     
     def get_positive_test_data(self, resource: str) -> List[Dict[str, Any]]:
         """
@@ -125,29 +165,38 @@ class DataProvider:
         """
         return self.get_test_cases(resource, 'boundary')
     
-    def get_parametrized_data(self, test_suite: str, parameter_combinations: bool = True) -> Iterator[Dict[str, Any]]:
+    def get_parametrized_data(self, test_suite: str, parameter_combinations: bool = True,
+                              strength: Optional[int] = 2, shard_index: int = 0,
+                              shard_count: int = 1) -> Iterator[Dict[str, Any]]:
         """
         Get parametrized test data for pytest parametrize
         
         Args:
             test_suite: Test suite name
             parameter_combinations: Whether to generate parameter combinations
+            strength: Interaction strength for combinations (2 = pairwise, None = full product)
+            shard_index: Zero-based shard index of the generated cases
+            shard_count: Total number of shards
             
         Yields:
             Test case data dictionaries
         """
-        test_cases = self.get_test_cases(test_suite)
+        yield from shard(self._iter_parametrized_data(test_suite, parameter_combinations, strength),
+                         shard_index, shard_count)
+    
+    def _iter_parametrized_data(self, test_suite: str, parameter_combinations: bool,
+                                strength: Optional[int]) -> Iterator[Dict[str, Any]]:
+        """Yield test cases, expanding 'parameters' into combinations when requested"""
+        test_cases = self.iter_test_cases(test_suite)
         
         if parameter_combinations:
             # Generate combinations of parameters if specified
             for case in test_cases:
                 if 'parameters' in case and isinstance(case['parameters'], dict):
-                    param_keys = list(case['parameters'].keys())
-                    param_values = [case['parameters'][key] if isinstance(case['parameters'][key], list) 
-                                   else [case['parameters'][key]] for key in param_keys]
+                    parameters = {key: value if isinstance(value, list) else [value]
+                                  for key, value in case['parameters'].items()}
                     
-                    for combination in product(*param_values):
-                        yield dict(zip(param_keys, combination))
+                    yield from CombinationGenerator(parameters, strength)
                 else:
                     yield case
         else:
@@ -183,35 +232,55 @@ class DataProvider:
         return random_data
     
     def create_test_data_combinations(self, base_data: Dict[str, Any], 
-                                    field_variations: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+                                    field_variations: Dict[str, List[Any]],
+                                    strength: Optional[int] = 2) -> List[Dict[str, Any]]:
         """
         Create test data combinations by varying specific fields
         
         Args:
             base_data: Base test data dictionary
             field_variations: Dictionary mapping field names to lists of values
+            strength: Interaction strength (2 = pairwise, None = full product)
             
         Returns:
             List of test data combinations
         """
-        combinations = []
-        field_names = list(field_variations.keys())
-        field_value_lists = list(field_variations.values())
+        return list(self.iter_test_data_combinations(base_data, field_variations, strength))
+    
+    def iter_test_data_combinations(self, base_data: Dict[str, Any],
+                                    field_variations: Dict[str, List[Any]],
+                                    strength: Optional[int] = 2,
+                                    shard_index: int = 0,
+                                    shard_count: int = 1) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily create test data combinations by varying specific fields
         
-        for value_combination in product(*field_value_lists):
-            test_data = base_data.copy()
+        Args:
+            base_data: Base test data dictionary
+            field_variations: Dictionary mapping field names to lists of values
+            strength: Interaction strength (2 = pairwise, None = full product)
+            shard_index: Zero-based shard index of the generated combinations
+            shard_count: Total number of shards
+            
+        Yields:
+            Test data combinations
+        """
+        has_nested_fields = any('.' in field_name for field_name in field_variations)
+        generator = CombinationGenerator(field_variations, strength)
+        
+        for variation in shard(generator, shard_index, shard_count):
+            # Nested variations must not leak into the shared base dictionaries
+            test_data = copy.deepcopy(base_data) if has_nested_fields else base_data.copy()
             
             # Apply field variations
-            for field_name, field_value in zip(field_names, value_combination):
+            for field_name, field_value in variation.items():
                 if '.' in field_name:
                     # Handle nested fields
                     self._set_nested_field(test_data, field_name, field_value)
                 else:
                     test_data[field_name] = field_value
             
-            combinations.append(test_data)
-        
-        return combinations
+            yield test_data
     
     def get_invalid_data_variations(self, resource: str) -> List[Dict[str, Any]]:
         """
@@ -249,8 +318,7 @@ class DataProvider:
         output_path = self.data_dir / "results" / filename
         output_path.parent.mkdir(exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+        codec.dump(results, output_path, indent=2, default=str)
         
         print(f"Test results saved: {output_path}")
         return str(output_path)
@@ -267,16 +335,18 @@ class DataProvider:
         """
         schema_dir = self.data_dir / "schemas"
         schema_file = schema_dir / f"{schema_name}.json"
+        self.hooks.emit("schema", name=schema_name, path=str(schema_file))
         
         if not schema_file.exists():
             raise FileNotFoundError(f"Schema file not found: {schema_file}")
         
-        with open(schema_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return codec.load(schema_file)
     
     def clear_cache(self):
         """Clear cached test data"""
         self.data_cache.clear()
+        if self._store is not None:
+            self._store.cache.clear()
         print("Test data cache cleared")
     
     def _get_invalid_product_variations(self) -> List[Dict[str, Any]]:
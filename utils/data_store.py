@@ -0,0 +1,232 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Hashable, Iterator, List, Optional, Tuple, Union
+from .json_codec import codec
+
+STORE_VERSION = "1"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS sources (
+    filename TEXT PRIMARY KEY,
+    resource TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cases (
+    id INTEGER PRIMARY KEY,
+    resource TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    test_type TEXT,
+    name TEXT,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cases_by_resource ON cases (resource, position);
+CREATE INDEX IF NOT EXISTS cases_by_type ON cases (resource, test_type, position);
+CREATE INDEX IF NOT EXISTS cases_by_name ON cases (resource, name);
+CREATE INDEX IF NOT EXISTS cases_by_file ON cases (filename);
+"""
+
+class LRUCache(OrderedDict):
+    """Dict bounded to maxsize entries, evicting the least recently used"""
+
+    def __init__(self, maxsize: int = 128):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def __setitem__(self, key: Hashable, value: Any):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+class TestDataStore:
+    """Indexed SQLite copy of test_data/*_test_data.json with lazily decoded test cases"""
+
+    __test__ = False  # Not a test class despite the name
+
+    def __init__(self, data_dir: Union[str, Path] = "test_data",
+                 path: Union[str, Path] = ".cache/test_data.sqlite", cache_size: int = 1024):
+        """
+        Initialize test data store
+
+        Args:
+            data_dir: Directory containing the JSON test data sources
+            path: SQLite file holding the indexed cases
+            cache_size: Decoded cases kept in memory
+        """
+        self.data_dir = Path(data_dir)
+        self.path = Path(path)
+        self.cache = LRUCache(cache_size)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[Tuple[str, int, int], ...]] = None
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def resource_of(filename: str) -> str:
+        """Resource name of a source file (products_test_data.json -> products)"""
+        return filename[:-len("_test_data.json")]
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit mode; writes use explicit BEGIN IMMEDIATE so xdist workers serialize rebuilds
+            connection = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            self._local.connection = connection
+        return connection
+
+    def _scan_sources(self) -> Tuple[Tuple[str, int, int], ...]:
+        sources = []
+        for path in sorted(self.data_dir.glob("*_test_data.json")):
+            stat = path.stat()
+            sources.append((path.name, stat.st_mtime_ns, stat.st_size))
+        return tuple(sources)
+
+    def refresh(self) -> bool:
+        """
+        Re-index source files that changed since they were last indexed
+
+        Returns:
+            True if any file was (re)indexed or removed by this call
+        """
+        signature = self._scan_sources()
+        if signature == self._signature:
+            return False
+
+        with self._lock:
+            connection = self._connection()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                changed = self._sync(connection, signature)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            # Case ids change when a file is re-indexed, here or by another worker
+            self.cache.clear()
+            self._signature = signature
+        if changed:
+            print(f"Test data store updated: {', '.join(changed)}")
+        return bool(changed)
+
+    def _sync(self, connection: sqlite3.Connection, signature: Tuple[Tuple[str, int, int], ...]) -> List[str]:
+        version = connection.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if version is None or version[0] != STORE_VERSION:
+            connection.execute("DELETE FROM cases")
+            connection.execute("DELETE FROM sources")
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (STORE_VERSION,))
+
+        indexed = {row[0]: (row[1], row[2]) for row in
+                   connection.execute("SELECT filename, mtime_ns, size FROM sources")}
+        current = {filename: (mtime_ns, size) for filename, mtime_ns, size in signature}
+        changed = []
+
+        for filename in indexed.keys() - current.keys():
+            connection.execute("DELETE FROM cases WHERE filename = ?", (filename,))
+            connection.execute("DELETE FROM sources WHERE filename = ?", (filename,))
+            changed.append(filename)
+
+        for filename, stat in current.items():
+            if indexed.get(filename) == stat:
+                continue
+            connection.execute("DELETE FROM cases WHERE filename = ?", (filename,))
+            self._index_file(connection, filename)
+            connection.execute("INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)",
+                               (filename, self.resource_of(filename), stat[0], stat[1]))
+            changed.append(filename)
+
+        return changed
+
+    def _index_file(self, connection: sqlite3.Connection, filename: str):
+        document = codec.load(self.data_dir / filename)
+        cases = document.get("test_cases", []) if isinstance(document, dict) else []
+        resource = self.resource_of(filename)
+        connection.executemany(
+            "INSERT INTO cases (resource, filename, position, test_type, name, body) VALUES (?, ?, ?, ?, ?, ?)",
+            ((resource, filename, position, case.get("test_type"), case.get("name"), codec.dumps_bytes(case))
+             for position, case in enumerate(cases) if isinstance(case, dict))
+        )
+
+    def case_ids(self, resource: str, test_type: Optional[str] = None) -> List[int]:
+        """
+        Ids of a resource's cases in file order, answered from the indexes alone
+
+        Args:
+            resource: Resource name (products, users, carts)
+            test_type: Only cases of this test type
+
+        Returns:
+            List of case ids
+        """
+        self.refresh()
+        if test_type is None:
+            rows = self._connection().execute(
+                "SELECT id FROM cases WHERE resource = ? ORDER BY position", (resource,))
+        else:
+            rows = self._connection().execute(
+                "SELECT id FROM cases WHERE resource = ? AND test_type = ? ORDER BY position", (resource, test_type))
+        return [row[0] for row in rows]
+
+    def get_case(self, case_id: int) -> Dict[str, Any]:
+        """
+        Decode one case, through the LRU cache
+
+        Raises:
+            KeyError: If the id is unknown
+        """
+        case = self.cache.get(case_id)
+        if case is None:
+            row = self._connection().execute("SELECT body FROM cases WHERE id = ?", (case_id,)).fetchone()
+            if row is None:
+                raise KeyError(case_id)
+            case = self.cache[case_id] = codec.loads(row[0])
+        return case
+
+    def get_case_by_name(self, resource: str, name: str) -> Optional[Dict[str, Any]]:
+        """First case of a resource with the given name, or None"""
+        self.refresh()
+        row = self._connection().execute(
+            "SELECT id FROM cases WHERE resource = ? AND name = ? ORDER BY position LIMIT 1", (resource, name)
+        ).fetchone()
+        return self.get_case(row[0]) if row else None
+
+    def iter_cases(self, resource: str, test_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Yield a resource's cases one at a time, decoding each only when reached"""
+        for case_id in self.case_ids(resource, test_type):
+            yield self.get_case(case_id)
+
+    def get_cases(self, resource: str, test_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List of a resource's cases"""
+        return list(self.iter_cases(resource, test_type))
+
+    def count(self, resource: str, test_type: Optional[str] = None) -> int:
+        """Number of cases without decoding any of them"""
+        self.refresh()
+        if test_type is None:
+            row = self._connection().execute("SELECT COUNT(*) FROM cases WHERE resource = ?", (resource,)).fetchone()
+        else:
+            row = self._connection().execute(
+                "SELECT COUNT(*) FROM cases WHERE resource = ? AND test_type = ?", (resource, test_type)).fetchone()
+        return row[0]
+
+    def close(self):
+        """Close this thread's connection"""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -0,0 +1,145 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple
+import requests
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """The time budget of a test or endpoint ran out before the request completed"""
+
+class Deadline:
+    """Absolute point in time, on the monotonic clock, by which work must be finished"""
+
+    def __init__(self, seconds: float, expires_at: Optional[float] = None, label: str = ""):
+        """
+        Initialize deadline
+
+        Args:
+            seconds: Budget in seconds
+            expires_at: Absolute expiry (defaults to now + seconds)
+            label: What the budget belongs to, for error messages
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds if expires_at is None else expires_at
+        self.label = label
+        # Set when a retry was abandoned because the budget could not fit another attempt
+        self.retries_cut = False
+        self._abort: Optional[Callable[[], None]] = None
+
+    def remaining(self) -> float:
+        """Seconds left (negative once expired)"""
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cap(self, seconds: Optional[float]) -> float:
+        """A timeout no longer than the remaining budget"""
+        remaining = max(self.remaining(), 0.0)
+        return remaining if seconds is None else min(seconds, remaining)
+
+    def bind_abort(self, abort: Optional[Callable[[], None]]):
+        """Register how to interrupt the blocking call currently running under this deadline"""
+        self._abort = abort
+
+    def cancel(self):
+        """Expire now and interrupt the bound blocking call, e.g. a socket read"""
+        self.expires_at = time.monotonic()
+        abort = self._abort
+        if abort is not None:
+            abort()
+
+    def check(self, what: str = "request"):
+        """
+        Raises:
+            DeadlineExceeded: If the deadline has passed
+        """
+        if self.expired:
+            raise DeadlineExceeded(f"{self.label or 'Deadline'} of {self.seconds:g}s exceeded before {what}")
+
+    def __repr__(self) -> str:
+        return f"Deadline({self.label or 'unnamed'}, remaining={self.remaining():.3f}s)"
+
+_current: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("deadline", default=None)
+
+def current_deadline() -> Optional[Deadline]:
+    """Innermost active deadline of the calling context, or None"""
+    return _current.get()
+
+@contextmanager
+def deadline_scope(seconds: Optional[float], label: str = "") -> Iterator[Optional[Deadline]]:
+    """
+    Run a block under a deadline, nested within any enclosing one
+
+    The effective deadline is the earlier of the enclosing deadline and now + seconds,
+    so an endpoint deadline never extends the budget of the test it runs in.
+    With seconds None the enclosing deadline is re-scoped (or there is none).
+
+    Args:
+        seconds: Budget of the block
+        label: What the budget belongs to, for error messages
+
+    Yields:
+        The deadline of the block, or None when unbounded
+    """
+    parent = _current.get()
+    expires_at = time.monotonic() + seconds if seconds is not None else None
+    if parent is not None and (expires_at is None or parent.expires_at <= expires_at):
+        scoped = Deadline(parent.seconds, parent.expires_at, parent.label)
+    elif seconds is not None and expires_at is not None:
+        scoped = Deadline(seconds, expires_at, label)
+    else:
+        yield None
+        return
+    token = _current.set(scoped)
+    try:
+        yield scoped
+    finally:
+        _current.reset(token)
+
+def capped_timeout(connect: Optional[float], read: Optional[float]) -> Tuple[Optional[float], Optional[float]]:
+    """Connect and read timeouts limited to the remaining budget of the current deadline"""
+    deadline = _current.get()
+    if deadline is None:
+        return connect, read
+    # Never zero: urllib3 treats a zero read timeout as non-blocking
+    return max(deadline.cap(connect), 0.001), max(deadline.cap(read), 0.001)
+
+class DeadlineAwareRetry(Retry):
+    """Retry that stops once the current deadline cannot fit the backoff and another attempt"""
+
+    def get_retry_after(self, response) -> Optional[float]:
+        retry_after = super().get_retry_after(response)
+        deadline = _current.get()
+        if retry_after is None or deadline is None:
+            return retry_after
+        return deadline.cap(retry_after)
+
+    def _sleep_backoff(self):
+        deadline = _current.get()
+        backoff = self.get_backoff_time()
+        if deadline is not None:
+            backoff = deadline.cap(backoff)
+        if backoff > 0:
+            time.sleep(backoff)
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        new_retry = super().increment(method, url, response, error, _pool, _stacktrace)
+        deadline = _current.get()
+        if deadline is None:
+            return new_retry
+
+        wait = new_retry.get_backoff_time()
+        if response is not None and self.respect_retry_after_header:
+            wait = max(wait, Retry.get_retry_after(self, response) or 0.0)
+        if deadline.remaining() <= wait:
+            deadline.retries_cut = True
+            reason = error or ResponseError(
+                f"{deadline.label or 'deadline'} leaves {max(deadline.remaining(), 0):.2f}s, "
+                f"not enough for another attempt after {wait:.2f}s"
+            )
+            raise MaxRetryError(_pool, url, reason) from reason
+        return new_retry
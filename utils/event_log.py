@@ -0,0 +1,219 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Union
+import pytest
+from .hooks import HookRegistry
+from .json_codec import codec
+
+EVENT_FILE_PATTERN = "events-*.jsonl"
+
+# Run directories kept below the event log root; older ones are pruned when a run starts
+KEEP_RUNS = 10
+
+class EventLog:
+    """Append-only JSON Lines log of one process; reports are rendered from it after the run"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        Initialize event log
+
+        Args:
+            path: File receiving the events (appended to)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._lock = threading.Lock()
+
+    def write(self, event: str, **fields: Any):
+        """
+        Append one event
+
+        Args:
+            event: Event kind ("test", "phase", "request", "capture", "metrics", ...)
+            **fields: Event payload (JSON-serializable, other values are stringified)
+        """
+        line = codec.dumps_bytes({"event": event, "ts": time.time(), **fields}, default=str) + b"\n"
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line)
+
+    def flush(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+def run_directories(root: Union[str, Path]) -> List[Path]:
+    """Run directories below an event log root, oldest first (names start with the start time)"""
+    return sorted(path for path in Path(root).glob("*") if path.is_dir())
+
+def run_directory(directory: Union[str, Path]) -> Path:
+    """Directory of the latest run below an event log root, or the directory itself if it has no runs"""
+    runs = run_directories(directory)
+    return runs[-1] if runs else Path(directory)
+
+def event_files(directory: Union[str, Path]) -> List[Path]:
+    """Event log files of a run, one per process"""
+    return sorted(run_directory(directory).glob(EVENT_FILE_PATTERN))
+
+def read_events(directory: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the events of all processes of a run
+
+    A truncated last line (a process killed mid-write) is skipped.
+
+    Args:
+        directory: Directory holding the event log files, or an event log root
+                   (its latest run is read)
+
+    Yields:
+        Event dictionaries, file by file in write order
+    """
+    for path in event_files(directory):
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield codec.loads(line)
+                except ValueError:
+                    print(f"Skipping unreadable event in {path}")
+
+def _allure_labels(item) -> List[List[str]]:
+    """Allure labels set by decorators (feature, story, severity, ...) as [name, value] pairs"""
+    labels: List[List[str]] = []
+    for marker in item.iter_markers("allure_label"):
+        label_type = marker.kwargs.get("label_type")
+        labels.extend([label_type, str(value)] for value in marker.args)
+    return labels
+
+class EventLogPlugin:
+    """pytest plugin writing tests, requests and timings of the run to the event log"""
+
+    def __init__(self, config, directory: Union[str, Path] = "reports/events",
+                 render_formats: Optional[List[str]] = None, output_dir: Union[str, Path] = "reports"):
+        """
+        Initialize event log plugin
+
+        Args:
+            config: pytest config
+            directory: Event log root; each run writes one event file per process to its own subdirectory
+            render_formats: Report formats rendered from the log when the session ends
+            output_dir: Root directory of rendered reports
+        """
+        self.config = config
+        self.directory = Path(directory)
+        self.render_formats = render_formats or []
+        self.output_dir = Path(output_dir)
+        self.worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        self.is_worker = hasattr(config, "workerinput")
+        # Under xdist the controller receives every report too; the workers log them
+        self.is_controller = bool(getattr(config.option, "numprocesses", None)) and not self.is_worker
+        self.current_test: Optional[str] = None
+        self.started = time.perf_counter()
+
+        # Concurrent runs never touch each other's log; workers receive the run id through workerinput
+        workerinput = getattr(config, "workerinput", None)
+        if workerinput:
+            self.run_id = workerinput["event_log_run_id"]
+        else:
+            self.run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+            runs = run_directories(self.directory)
+            for old_run in runs[:max(len(runs) - KEEP_RUNS + 1, 0)]:
+                shutil.rmtree(old_run, ignore_errors=True)
+        self.run_dir = self.directory / self.run_id
+        self.log = EventLog(self.run_dir / f"events-{self.worker}.jsonl")
+
+    def record(self, event: str, **fields: Any):
+        """Append an event attributed to the running test"""
+        self.log.write(event, worker=self.worker, nodeid=self.current_test, **fields)
+
+    def observe_hooks(self, hooks: HookRegistry):
+        """Log the requests of a client (called by fixtures)"""
+        hooks.register(self._on_event)
+
+    def _on_event(self, event: str, **data):
+        if event != "request":
+            return
+        response = data.get("response")
+        error = data.get("error")
+        self.record(
+            "request",
+            method=data.get("method"),
+            url=data.get("url"),
+            endpoint=data.get("endpoint_key"),
+            status=response.status_code if response is not None else None,
+            elapsed=data.get("elapsed"),
+            error=f"{type(error).__name__}: {error}" if error is not None else None
+        )
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_configure_node(self, node):
+        # xdist controller: hand the run id to a worker before it starts
+        node.workerinput["event_log_run_id"] = self.run_id
+
+    def pytest_sessionstart(self, session):
+        self.log.write("session_start", worker=self.worker, args=list(self.config.invocation_params.args))
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtest_setup(self, item):
+        self.current_test = item.nodeid
+        function = getattr(item, "function", None)
+        self.record(
+            "test",
+            name=item.name,
+            location=list(item.location),
+            markers=sorted({marker.name for marker in item.iter_markers()}),
+            labels=_allure_labels(item),
+            title=getattr(function, "__allure_display_name__", None),
+            description=(function.__doc__ or "").strip() if function is not None else ""
+        )
+
+    def pytest_runtest_logreport(self, report):
+        if self.is_controller:
+            return
+        longrepr = None
+        if report.failed:
+            longrepr = report.longreprtext
+        elif report.skipped and isinstance(report.longrepr, tuple):
+            # (path, lineno, reason)
+            longrepr = report.longrepr[2]
+        self.log.write(
+            "phase",
+            worker=self.worker,
+            nodeid=report.nodeid,
+            when=report.when,
+            outcome=report.outcome,
+            duration=report.duration,
+            start=getattr(report, "start", None),
+            stop=getattr(report, "stop", None),
+            longrepr=longrepr,
+            wasxfail=getattr(report, "wasxfail", None)
+        )
+        if report.when == "teardown":
+            # Keep what a killed process leaves behind up to date test by test
+            self.log.flush()
+
+    def pytest_runtest_logfinish(self, nodeid, location):
+        self.current_test = None
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_sessionfinish(self, session, exitstatus):
+        self.log.write("session_finish", worker=self.worker, exitstatus=int(exitstatus),
+                       duration=time.perf_counter() - self.started)
+        self.log.close()
+        if self.is_worker or not self.render_formats:
+            return
+
+        from .report_renderers import render_reports
+        print()
+        render_reports(self.run_dir, self.render_formats, self.output_dir)
@@ -0,0 +1,409 @@
+import io
+import math
+import os
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple, Type, Union
+from urllib.parse import urlsplit
+import pytest
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.response import HTTPResponse
+from .hooks import HookRegistry
+from .json_codec import codec
+from .transport import TimedHTTPConnectionPool, TimedHTTPSConnectionPool
+
+# Fault kinds in the order their rates are laid out on the unit interval
+FAULT_KINDS = ("reset", "timeout", "partial_read", "status_429", "status_5xx")
+
+LATENCY_DISTRIBUTIONS = ("none", "fixed", "uniform", "exponential", "normal", "lognormal")
+
+def template_pattern(template: str) -> "re.Pattern":
+    """
+    Compile an endpoints.json style template into a regex
+
+    "/products/{id}" matches "/products/7"; "*" matches every request.
+    Templates without a query string match the request path only.
+    """
+    if template == "*":
+        return re.compile(".*", re.DOTALL)
+    parts = re.split(r"\{[^}]+\}", template)
+    return re.compile("[^/?&]+".join(re.escape(part) for part in parts))
+
+class FaultRule:
+    """Latency distribution and fault rates applied to requests matching one endpoint template"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        """
+        Initialize fault rule
+
+        Args:
+            spec: Rule of a fault profile
+
+        Raises:
+            ValueError: If the rule is malformed
+        """
+        self.endpoint = spec.get("endpoint", "*")
+        self.pattern = template_pattern(self.endpoint)
+        self.match_query = "?" in self.endpoint
+        self.methods = {m.upper() for m in spec.get("methods", [])}
+        self.latency = spec.get("latency") or {"distribution": "none"}
+        self.faults = {kind: float(spec.get("faults", {}).get(kind, 0.0)) for kind in FAULT_KINDS}
+        self.status_codes = spec.get("status_codes", [500, 502, 503, 504])
+        self.retry_after = spec.get("retry_after", 1)
+        self.timeout_after = spec.get("timeout_after")
+        self.partial_fraction = spec.get("partial_fraction", 0.5)
+
+        unknown = set(spec.get("faults", {})) - set(FAULT_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown fault kinds for '{self.endpoint}': {sorted(unknown)}")
+        if self.latency.get("distribution", "fixed") not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution for '{self.endpoint}': {self.latency['distribution']}")
+        if sum(self.faults.values()) > 1.0:
+            raise ValueError(f"Fault rates for '{self.endpoint}' add up to more than 1")
+
+    @property
+    def label(self) -> str:
+        methods = ",".join(sorted(self.methods)) or "*"
+        return f"{methods} {self.endpoint}"
+
+    def matches(self, method: str, url: str) -> bool:
+        """Whether the rule applies to a request (url is the request target, path plus query)"""
+        if self.methods and method.upper() not in self.methods:
+            return False
+        target = url if self.match_query else urlsplit(url).path
+        return self.pattern.fullmatch(target) is not None
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Injected latency in seconds"""
+        spec = self.latency
+        distribution = spec.get("distribution", "fixed")
+        if distribution == "none":
+            return 0.0
+        if distribution == "fixed":
+            millis = spec.get("ms", 0.0)
+        elif distribution == "uniform":
+            millis = rng.uniform(spec.get("min_ms", 0.0), spec["max_ms"])
+        elif distribution == "exponential":
+            millis = rng.expovariate(1.0 / spec["mean_ms"])
+        elif distribution == "normal":
+            millis = rng.gauss(spec["mean_ms"], spec.get("stddev_ms", 0.0))
+        else:
+            # Median and shape of the tail, the usual way service latency is described
+            millis = rng.lognormvariate(math.log(spec["median_ms"]), spec.get("sigma", 0.5))
+        if "cap_ms" in spec:
+            millis = min(millis, spec["cap_ms"])
+        return max(millis, 0.0) / 1000.0
+
+    def sample_fault(self, rng: random.Random) -> Optional[str]:
+        """Fault to inject, or None"""
+        draw = rng.random()
+        for kind in FAULT_KINDS:
+            draw -= self.faults[kind]
+            if draw < 0:
+                return kind
+        return None
+
+class FaultProfile:
+    """Seed and ordered rules of a fault injection run; the first matching rule applies"""
+
+    def __init__(self, rules: List[FaultRule], seed: int = 0, name: str = "profile"):
+        self.rules = rules
+        self.seed = seed
+        self.name = name
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "FaultProfile":
+        """
+        Load a profile file
+
+        Args:
+            path: JSON file with "seed" and "rules"
+
+        Returns:
+            Fault profile
+        """
+        path = Path(path)
+        document = codec.load(path)
+        return cls([FaultRule(spec) for spec in document.get("rules", [])],
+                   seed=document.get("seed", 0), name=document.get("name", path.stem))
+
+    def rule_for(self, method: str, url: str) -> Optional[FaultRule]:
+        """First rule matching a request, or None"""
+        for rule in self.rules:
+            if rule.matches(method, url):
+                return rule
+        return None
+
+if TYPE_CHECKING:
+    _PoolBase = HTTPConnectionPool
+else:
+    _PoolBase = object
+
+class _FaultInjectingPoolMixin(_PoolBase):
+    """
+    Connection pool applying the injector's profile to every request attempt
+
+    Overrides urllib3 2.x's _make_request; requirements.txt pins urllib3 to 2.x for it.
+    """
+
+    injector: "FaultInjector"
+
+    def _make_request(self, conn, method, url, body=None, headers=None, retries=None,
+                      timeout=None, chunked=False, response_conn=None, preload_content=True,
+                      decode_content=True, enforce_content_length=True):
+        forward = dict(body=body, headers=headers, retries=retries, timeout=timeout, chunked=chunked,
+                       response_conn=response_conn, preload_content=preload_content,
+                       decode_content=decode_content, enforce_content_length=enforce_content_length)
+        if timeout is None:
+            del forward["timeout"]  # Keep urllib3's default sentinel
+
+        rule = self.injector.profile.rule_for(method, url)
+        if rule is None:
+            self.injector.record(None, retries)
+            return super()._make_request(conn, method, url, **forward)
+
+        latency, fault = self.injector.sample(rule)
+        self.injector.record(rule, retries, latency, fault)
+        read_timeout = self._get_timeout(timeout).read_timeout
+        if not isinstance(read_timeout, (int, float)):
+            read_timeout = None
+
+        if fault == "timeout" or (read_timeout is not None and latency >= read_timeout):
+            wait = rule.timeout_after if fault == "timeout" and rule.timeout_after is not None else read_timeout
+            time.sleep(wait or 0.0)
+            raise ReadTimeoutError(self, url, f"Read timed out. (read timeout={read_timeout}, injected)")
+        time.sleep(latency)
+
+        if fault == "reset":
+            raise ConnectionResetError(104, "Connection reset by peer (injected)")
+        if fault in ("status_429", "status_5xx"):
+            status = 429 if fault == "status_429" else self.injector.choice(rule.status_codes)
+            return self._synthetic_response(method, url, status, rule, retries, response_conn,
+                                            preload_content, decode_content)
+        if fault == "partial_read":
+            return self._truncated_response(conn, method, url, rule, forward)
+        return super()._make_request(conn, method, url, **forward)
+
+    def _synthetic_response(self, method, url, status, rule, retries, response_conn,
+                            preload_content, decode_content) -> HTTPResponse:
+        payload = codec.dumps_bytes({"error": f"injected HTTP {status}"})
+        headers = {"Content-Type": "application/json", "Content-Length": str(len(payload))}
+        if status in (429, 503) and rule.retry_after is not None:
+            headers["Retry-After"] = str(rule.retry_after)
+        # The connection was never used, so the response hands it straight back to the pool
+        return HTTPResponse(body=io.BytesIO(payload), headers=headers, status=status, version=11,
+                            version_string="HTTP/1.1", reason="Injected", preload_content=preload_content,
+                            decode_content=decode_content, pool=self, connection=response_conn,
+                            retries=retries, request_method=method, request_url=url)
+
+    def _truncated_response(self, conn, method, url, rule, forward) -> HTTPResponse:
+        response_conn = forward["response_conn"]
+        real = super()._make_request(conn, method, url, **dict(forward, response_conn=None, preload_content=False))
+        raw = real.read(decode_content=False)
+        real.release_conn()
+        # Content-Length still announces the full body, so reading the rest fails like a dropped connection
+        headers = real.headers.copy()
+        headers["Content-Length"] = str(len(raw))
+        truncated = raw[:int(len(raw) * rule.partial_fraction)] if len(raw) > 1 else b""
+        response = HTTPResponse(body=io.BytesIO(truncated), headers=headers, status=real.status,
+                                version=real.version, version_string=real.version_string, reason=real.reason,
+                                preload_content=forward["preload_content"], decode_content=forward["decode_content"],
+                                pool=self, connection=response_conn, retries=forward["retries"],
+                                enforce_content_length=True, request_method=method, request_url=url)
+        # Set by the timed connection on the real response, see transport._TimedConnectionMixin
+        response.phase_timings = getattr(real, "phase_timings", None)  # type: ignore[attr-defined]
+        return response
+
+class FaultInjector:
+    """Applies a fault profile to the requests of one client and counts what it injected"""
+
+    def __init__(self, profile: FaultProfile, seed: Optional[Any] = None):
+        """
+        Initialize fault injector
+
+        Args:
+            profile: Fault profile
+            seed: Random seed (defaults to the profile's seed)
+        """
+        self.profile = profile
+        self.rng = random.Random(profile.seed if seed is None else seed)
+        self.stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._pool_classes: Optional[Dict[str, Type]] = None
+
+    def sample(self, rule: FaultRule) -> Tuple[float, Optional[str]]:
+        """Latency and fault of one request attempt"""
+        with self._lock:
+            return rule.sample_latency(self.rng), rule.sample_fault(self.rng)
+
+    def choice(self, options: List[Any]) -> Any:
+        with self._lock:
+            return self.rng.choice(options)
+
+    def record(self, rule: Optional[FaultRule], retries=None, latency: float = 0.0, fault: Optional[str] = None):
+        """Count one request attempt; attempts after the first are urllib3 retries"""
+        retried = bool(getattr(retries, "history", None))
+        label = rule.label if rule is not None else "(unmatched)"
+        with self._lock:
+            stats = self.stats.setdefault(label, {"attempts": 0, "retries": 0, "latency": 0.0,
+                                                  "faults": dict.fromkeys(FAULT_KINDS, 0)})
+            stats["attempts"] += 1
+            stats["retries"] += retried
+            stats["latency"] += latency
+            if fault:
+                stats["faults"][fault] += 1
+
+    def pool_classes(self) -> Dict[str, Type]:
+        """Connection pool classes bound to this injector, by URL scheme"""
+        if self._pool_classes is None:
+            attributes = {"injector": self}
+            self._pool_classes = {
+                "http": type("FaultInjectingHTTPConnectionPool",
+                             (_FaultInjectingPoolMixin, TimedHTTPConnectionPool), attributes),
+                "https": type("FaultInjectingHTTPSConnectionPool",
+                              (_FaultInjectingPoolMixin, TimedHTTPSConnectionPool), attributes),
+            }
+        return self._pool_classes
+
+    def report(self) -> Dict[str, Any]:
+        """Injected latency and faults per rule, plus totals"""
+        with self._lock:
+            rules = {label: {**stats, "faults": dict(stats["faults"]), "latency": round(stats["latency"], 3)}
+                     for label, stats in self.stats.items()}
+        faults = dict.fromkeys(FAULT_KINDS, 0)
+        for stats in rules.values():
+            for kind, count in stats["faults"].items():
+                faults[kind] += count
+        return {
+            "attempts": sum(s["attempts"] for s in rules.values()),
+            "retries": sum(s["retries"] for s in rules.values()),
+            "injected_latency": round(sum(s["latency"] for s in rules.values()), 3),
+            "faults": faults,
+            "rules": rules
+        }
+
+class FaultInjectionPlugin:
+    """pytest plugin running the suite under a fault profile and recording how it copes"""
+
+    def __init__(self, config, profile_path: str, report_dir: str = "reports/resilience"):
+        """
+        Initialize fault injection plugin
+
+        Args:
+            config: pytest config
+            profile_path: Fault profile file
+            report_dir: Directory receiving per-run reports and the run history
+        """
+        self.config = config
+        self.profile = FaultProfile.load(profile_path)
+        self.profile_path = profile_path
+        self.worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+        # Workers draw from distinct streams of the same profile
+        self.injector = FaultInjector(self.profile, seed=f"{self.profile.seed}/{self.worker}")
+        self.report_dir = Path(report_dir)
+        self.requests = 0
+        self.request_errors: Dict[str, int] = {}
+        self.outcomes: Dict[str, int] = {}
+        self.workers: Dict[str, Dict[str, Any]] = {}
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def observe_hooks(self, hooks: HookRegistry):
+        """Count requests and request errors of a client (called by fixtures)"""
+        hooks.register(self._on_event)
+
+    def _on_event(self, event: str, **data):
+        if event != "request":
+            return
+        with self._lock:
+            self.requests += 1
+            error = data.get("error")
+            if error is not None:
+                name = type(error).__name__
+                self.request_errors[name] = self.request_errors.get(name, 0) + 1
+
+    def pytest_sessionstart(self, session):
+        self.started = time.perf_counter()
+
+    def pytest_runtest_logreport(self, report):
+        # In the xdist controller this sees the reports of every worker
+        if report.when == "call" or report.outcome != "passed":
+            self.outcomes[report.outcome] = self.outcomes.get(report.outcome, 0) + 1
+
+    def worker_report(self) -> Dict[str, Any]:
+        """What this process injected and how its client fared"""
+        return {**self.injector.report(), "requests": self.requests, "request_errors": dict(self.request_errors)}
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # xdist controller: collect a worker's report
+        report = getattr(node, "workeroutput", {}).get("fault_report")
+        if report:
+            self.workers[node.workerinput["workerid"]] = report
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(self.config, "workerinput"):
+            self.config.workeroutput["fault_report"] = self.worker_report()
+            return
+        if self.requests or not self.workers:
+            self.workers[self.worker] = self.worker_report()
+
+        faults = dict.fromkeys(FAULT_KINDS, 0)
+        errors: Dict[str, int] = {}
+        for report in self.workers.values():
+            for kind, count in report["faults"].items():
+                faults[kind] += count
+            for name, count in report["request_errors"].items():
+                errors[name] = errors.get(name, 0) + count
+        summary = {
+            "profile": self.profile.name,
+            "profile_path": str(self.profile_path),
+            "seed": self.profile.seed,
+            "baseline": not self.profile.rules,
+            "finished_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "duration": round(time.perf_counter() - self.started, 3),
+            "outcomes": dict(self.outcomes),
+            "requests": sum(r["requests"] for r in self.workers.values()),
+            "attempts": sum(r["attempts"] for r in self.workers.values()),
+            "retries": sum(r["retries"] for r in self.workers.values()),
+            "injected_latency": round(sum(r["injected_latency"] for r in self.workers.values()), 3),
+            "faults": faults,
+            "request_errors": errors,
+        }
+
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        report_path = self.report_dir / f"resilience-{self.profile.name}.json"
+        codec.dump({**summary, "workers": self.workers}, report_path, indent=2)
+        history_path = self.report_dir / "history.jsonl"
+        baseline = self._last_baseline(history_path)
+        with open(history_path, 'a', encoding='utf-8') as f:
+            f.write(codec.dumps(summary) + "\n")
+
+        print(f"\nFault profile '{self.profile.name}': {summary['duration']:.2f}s, "
+              f"{summary['requests']} requests, {summary['retries']} retries, "
+              f"{sum(faults.values())} faults injected, {sum(errors.values())} request errors")
+        if baseline and baseline["duration"]:
+            print(f"Against baseline '{baseline['profile']}': duration x{summary['duration'] / baseline['duration']:.2f}, "
+                  f"retries {summary['retries'] - baseline['retries']:+d}, "
+                  f"failed tests {summary['outcomes'].get('failed', 0) - baseline['outcomes'].get('failed', 0):+d}")
+        print(f"Resilience report written to {report_path}")
+
+    @staticmethod
+    def _last_baseline(history_path: Path) -> Optional[Dict[str, Any]]:
+        """Most recent run recorded with a profile without rules"""
+        if not history_path.exists():
+            return None
+        baseline = None
+        with open(history_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = codec.loads(line)
+                except ValueError:
+                    continue
+                if entry.get("baseline"):
+                    baseline = entry
+        return baseline
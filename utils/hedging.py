@@ -0,0 +1,205 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Callable, Optional, cast
+import requests
+from .deadline import Deadline, deadline_scope
+from .metrics import MetricsCollector
+
+class _Attempt:
+    """One copy of a hedged request, cancelled by expiring its own deadline"""
+
+    def __init__(self, fn: Callable[[], requests.Response]):
+        self.fn = fn
+        self.deadline: Optional[Deadline] = None
+        self.cancelled = False
+        self.started = False
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+
+    def run(self) -> requests.Response:
+        # A scope of its own, so expiring it leaves the caller's deadline untouched
+        try:
+            with deadline_scope(float("inf"), label="hedged attempt") as deadline:
+                with self._lock:
+                    self.deadline = deadline
+                    if self.cancelled and deadline is not None:
+                        deadline.cancel()
+                return self.fn()
+        finally:
+            with self._lock:
+                self.deadline = None
+            self.finished.set()
+
+    def cancel(self):
+        """Stop the attempt: its socket is shut, retries are cut and body reads stop"""
+        with self._lock:
+            self.cancelled = True
+            if self.deadline is not None:
+                self.deadline.cancel()
+
+class _Race:
+    """The primary attempt and its hedge; the first to succeed wins and cancels the other"""
+
+    def __init__(self, primary: _Attempt, hedge: _Attempt):
+        self.primary = primary
+        self.hedge = hedge
+        self.winner: Optional[_Attempt] = None
+        self.lock = threading.Lock()
+
+    def claim(self, attempt: _Attempt) -> bool:
+        """Make attempt the winner unless the other one already won"""
+        with self.lock:
+            if self.winner is None:
+                self.winner = attempt
+        if self.winner is not attempt:
+            return False
+        (self.hedge if attempt is self.primary else self.primary).cancel()
+        return True
+
+class HedgingPolicy:
+    """Sends a second copy of slow idempotent requests and keeps whichever answers first"""
+
+    def __init__(self, hedging_config: Dict[str, Any], metrics: MetricsCollector):
+        """
+        Initialize hedging policy
+
+        Args:
+            hedging_config: "client.hedging" configuration section
+            metrics: Client metrics, read for per-endpoint percentiles and written with hedge counters
+        """
+        self.enabled = hedging_config.get("enabled", False)
+        self.methods = {m.upper() for m in hedging_config.get("methods", ["GET", "HEAD"])}
+        self.endpoints = set(hedging_config.get("endpoints", []))
+        self.delay_ms = hedging_config.get("delay_ms", 200)
+        self.delay_percentile = hedging_config.get("delay_percentile")
+        self.min_samples = hedging_config.get("min_samples", 20)
+        self.max_hedge_ratio = hedging_config.get("max_hedge_ratio", 0.1)
+        self.burst = hedging_config.get("burst", 5)
+        self.metrics = metrics
+        self._lock = threading.Lock()
+        self._eligible = 0
+        self._hedged = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._max_workers = hedging_config.get("max_workers", 8)
+
+    def applies(self, method: str, endpoint_key: Optional[str], endpoint_options: Dict[str, Any]) -> bool:
+        """Whether a request may be hedged (idempotent, listed endpoint, not spooled)"""
+        if not self.enabled or method.upper() not in self.methods or endpoint_options.get("stream"):
+            return False
+        return not self.endpoints or endpoint_key in self.endpoints
+
+    def delay(self, endpoint_key: Optional[str]) -> float:
+        """
+        Seconds to wait for the first attempt before hedging
+
+        Uses the configured percentile of the endpoint's observed response times once
+        enough samples exist, else the fixed delay.
+        """
+        if self.delay_percentile is not None:
+            if self.metrics.count("response_time", endpoint=endpoint_key) >= self.min_samples:
+                observed = self.metrics.percentile("response_time", self.delay_percentile / 100, endpoint=endpoint_key)
+                if observed is not None:
+                    return observed
+        return self.delay_ms / 1000
+
+    def _take_budget(self) -> bool:
+        """Allow a hedge while hedges stay within max_hedge_ratio of eligible requests (plus a burst)"""
+        with self._lock:
+            if self._hedged + 1 > self.max_hedge_ratio * self._eligible + self.burst:
+                return False
+            self._hedged += 1
+            return True
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="hedge")
+        # Hedges inherit the caller's deadline and other context
+        return self._executor.submit(contextvars.copy_context().run, fn, *args)
+
+    def run(self, fn: Callable[[], requests.Response], endpoint_key: Optional[str]) -> requests.Response:
+        """
+        Run a request, sending a hedge if it has not answered after the hedge delay
+
+        The first attempt runs on the calling thread; a pool thread sends the hedge
+        once the delay passes. The first attempt to answer wins. The loser is cancelled
+        by expiring its deadline and shutting its socket, which stops its read and
+        retries, and its response is closed if it already finished. If one attempt
+        fails, the other is still awaited; the error is raised only when both fail.
+
+        Args:
+            fn: Function performing one attempt of the request
+            endpoint_key: endpoints.json key of the request (if known)
+
+        Returns:
+            Response of the winning attempt
+        """
+        with self._lock:
+            self._eligible += 1
+        self.metrics.increment("hedge_eligible", endpoint=endpoint_key)
+
+        race = _Race(_Attempt(fn), _Attempt(fn))
+        hedge = self._submit(self._hedge_after, race, time.monotonic() + self.delay(endpoint_key), endpoint_key)
+        try:
+            response = race.primary.run()
+        except Exception as e:
+            with race.lock:
+                hedged = race.hedge.started
+            if not hedged:
+                raise
+            # The hedge may still answer; the primary's error stands only if it fails too
+            try:
+                result = hedge.result()
+            except Exception:
+                raise e
+            if result is None:
+                raise
+            return result
+
+        with race.lock:
+            hedged = race.hedge.started
+        if not hedged or race.claim(race.primary):
+            return response
+        response.close()
+        return cast(requests.Response, hedge.result())
+
+    def _hedge_after(self, race: _Race, due: float, endpoint_key: Optional[str]) -> Optional[requests.Response]:
+        """Send the hedge at the due time unless the primary answered by then; None when not won"""
+        if race.primary.finished.wait(max(due - time.monotonic(), 0.0)):
+            return None
+        if not self._take_budget():
+            self.metrics.increment("hedge_budget_exhausted", endpoint=endpoint_key)
+            return None
+        with race.lock:
+            if race.primary.finished.is_set():
+                return None
+            race.hedge.started = True
+        self.metrics.increment("hedged_requests", endpoint=endpoint_key)
+
+        response = race.hedge.run()
+        if not race.claim(race.hedge):
+            response.close()
+            return None
+        self.metrics.increment("hedge_wins", endpoint=endpoint_key)
+        return response
+
+    def stats(self) -> Dict[str, Any]:
+        """Hedge rate (of eligible requests) and win rate (of hedges sent)"""
+        eligible = self.metrics.counter("hedge_eligible")
+        hedged = self.metrics.counter("hedged_requests")
+        wins = self.metrics.counter("hedge_wins")
+        return {
+            "eligible": eligible,
+            "hedged": hedged,
+            "wins": wins,
+            "hedge_rate": hedged / eligible if eligible else 0.0,
+            "win_rate": wins / hedged if hedged else 0.0
+        }
+
+    def close(self):
+        """Stop the attempt threads (cancelled losers wind down in the background)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -1,4 +1,3 @@
-import json
 import random
 import string
 import time
@@ -6,6 +5,10 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 from config import get_config
+from .json_codec import codec
+
+# Generator used when callers do not pass a seeded one
+_default_rng = random.Random()
 
 class TestHelper:
     
@@ -13,12 +16,14 @@ class TestHelper:
         self.config = get_config()
     
     @staticmethod
-    def generate_random_string(length: int = 10, include_digits: bool = True, include_symbols: bool = False) -> str:
+    def generate_random_string(length: int = 10, include_digits: bool = True, include_symbols: bool = False,
+                               rng: Optional[random.Random] = None) -> str:
         """ 
         Args:
             length: String length
             include_digits: Include digits in string
             include_symbols: Include symbols in string
+            rng: Random number generator (defaults to a shared unseeded generator)
             
         Returns:
             Random string
@@ -31,55 +36,66 @@ class TestHelper:
         if include_symbols:
             chars += "!@#$%^&*"
         
-        return ''.join(random.choice(chars) for _ in range(length))
+        rng = rng or _default_rng
+        return ''.join(rng.choice(chars) for _ in range(length))
     
     @staticmethod
-    def generate_random_email(domain: str = "example.com") -> str:
+    def generate_random_email(domain: str = "example.com", rng: Optional[random.Random] = None) -> str:
         """
         Generate random email address
         
         Args:
             domain: Email domain
+            rng: Random number generator (defaults to a shared unseeded generator)
             
         Returns:
             Random email address
         """
-        username = TestHelper.generate_random_string(8).lower()
+        username = TestHelper.generate_random_string(8, rng=rng).lower()
         return f"{username}@{domain}"
     
     @staticmethod
-    def generate_random_phone() -> str:
+    def generate_random_phone(rng: Optional[random.Random] = None) -> str:
         """
         Generate random phone number
         
+        Args:
+            rng: Random number generator (defaults to a shared unseeded generator)
+            
         Returns:
             Random phone number
         """
-        return f"+1{random.randint(1000000000, 9999999999)}"
+        rng = rng or _default_rng
+        return f"+1{rng.randint(1000000000, 9999999999)}"
     
     @staticmethod
-    def generate_random_price(min_price: float = 1.0, max_price: float = 1000.0) -> float:
+    def generate_random_price(min_price: float = 1.0, max_price: float = 1000.0,
+                              rng: Optional[random.Random] = None) -> float:
         """
         Generate random price
         
         Args:
             min_price: Minimum price
             max_price: Maximum price
+            rng: Random number generator (defaults to a shared unseeded generator)
             
         Returns:
             Random price rounded to 2 decimal places
         """
-        return round(random.uniform(min_price, max_price), 2)
+        rng = rng or _default_rng
+        return round(rng.uniform(min_price, max_price), 2)
     
     @staticmethod
     def generate_random_date(start_date: Optional[datetime] = None, 
-                           end_date: Optional[datetime] = None) -> str:
+                           end_date: Optional[datetime] = None,
+                           rng: Optional[random.Random] = None) -> str:
         """
         Generate random date in ISO format
         
         Args:
             start_date: Start date range
             end_date: End date range
+            rng: Random number generator (defaults to a shared unseeded generator)
             
         Returns:
             Random date string in ISO format
@@ -90,42 +106,46 @@ class TestHelper:
         if end_date is None:
             end_date = datetime.now()
         
+        rng = rng or _default_rng
         time_between = end_date - start_date
-        random_days = random.randint(0, time_between.days)
+        random_days = rng.randint(0, time_between.days)
         random_date = start_date + timedelta(days=random_days)
         
         return random_date.isoformat()
     
     @staticmethod
-    def generate_user_data(custom_fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def generate_user_data(custom_fields: Optional[Dict[str, Any]] = None,
+                           rng: Optional[random.Random] = None) -> Dict[str, Any]:
         """
         Generate test user data
         
         Args:
             custom_fields: Custom fields to override defaults
+            rng: Random number generator (defaults to a shared unseeded generator)
             
         Returns:
             User data dictionary
         """
+        rng = rng or _default_rng
         user_data = {
-            "email": TestHelper.generate_random_email(),
-            "username": TestHelper.generate_random_string(8).lower(),
-            "password": TestHelper.generate_random_string(12, include_symbols=True),
+            "email": TestHelper.generate_random_email(rng=rng),
+            "username": TestHelper.generate_random_string(8, rng=rng).lower(),
+            "password": TestHelper.generate_random_string(12, include_symbols=True, rng=rng),
             "name": {
-                "firstname": random.choice(["John", "Jane", "Bob", "Alice", "Mike", "Sarah"]),
-                "lastname": random.choice(["Doe", "Smith", "Johnson", "Brown", "Davis", "Wilson"])
+                "firstname": rng.choice(["John", "Jane", "Bob", "Alice", "Mike", "Sarah"]),
+                "lastname": rng.choice(["Doe", "Smith", "Johnson", "Brown", "Davis", "Wilson"])
             },
             "address": {
-                "city": random.choice(["New York", "Los Angeles", "Chicago", "Houston", "Phoenix"]),
-                "street": f"{random.randint(1, 999)} {random.choice(['Main', 'Oak', 'Pine', 'Elm'])} St",
-                "number": random.randint(1, 999),
-                "zipcode": f"{random.randint(10000, 99999)}",
+                "city": rng.choice(["New York", "Los Angeles", "Chicago", "Houston", "Phoenix"]),
+                "street": f"{rng.randint(1, 999)} {rng.choice(['Main', 'Oak', 'Pine', 'Elm'])} St",
+                "number": rng.randint(1, 999),
+                "zipcode": f"{rng.randint(10000, 99999)}",
                 "geolocation": {
-                    "lat": f"{random.uniform(-90, 90):.6f}",
-                    "long": f"{random.uniform(-180, 180):.6f}"
+                    "lat": f"{rng.uniform(-90, 90):.6f}",
+                    "long": f"{rng.uniform(-180, 180):.6f}"
                 }
             },
-            "phone": TestHelper.generate_random_phone()
+            "phone": TestHelper.generate_random_phone(rng=rng)
         }
         
         if custom_fields:
@@ -134,24 +154,27 @@ class TestHelper:
         return user_data
     
     @staticmethod
-    def generate_product_data(custom_fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def generate_product_data(custom_fields: Optional[Dict[str, Any]] = None,
+                              rng: Optional[random.Random] = None) -> Dict[str, Any]:
         """
         Generate test product data
         
         Args:
             custom_fields: Custom fields to override defaults
+            rng: Random number generator (defaults to a shared unseeded generator)
             
         Returns:
             Product data dictionary
         """
+        rng = rng or _default_rng
         categories = ["electronics", "jewelery", "men's clothing", "women's clothing"]
         
         product_data = {
-            "title": f"Test Product {TestHelper.generate_random_string(5)}",
-            "price": TestHelper.generate_random_price(),
-            "description": f"Test product description {TestHelper.generate_random_string(20)}",
+            "title": f"Test Product {TestHelper.generate_random_string(5, rng=rng)}",
+            "price": TestHelper.generate_random_price(rng=rng),
+            "description": f"Test product description {TestHelper.generate_random_string(20, rng=rng)}",
             "image": "https://fakestoreapi.com/img/placeholder.jpg",
-            "category": random.choice(categories)
+            "category": rng.choice(categories)
         }
         
         if custom_fields:
@@ -160,29 +183,36 @@ class TestHelper:
         return product_data
     
     @staticmethod
-    def generate_cart_data(user_id: int, custom_fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def generate_cart_data(user_id: int, custom_fields: Optional[Dict[str, Any]] = None,
+                           rng: Optional[random.Random] = None,
+                           start_date: Optional[datetime] = None,
+                           end_date: Optional[datetime] = None) -> Dict[str, Any]:
         """
         Generate test cart data
         
         Args:
             user_id: User ID for the cart
             custom_fields: Custom fields to override defaults
+            rng: Random number generator (defaults to a shared unseeded generator)
+            start_date: Start of the cart date range
+            end_date: End of the cart date range
             
         Returns:
             Cart data dictionary
         """
-        num_products = random.randint(1, 5)
+        rng = rng or _default_rng
+        num_products = rng.randint(1, 5)
         products = []
         
         for _ in range(num_products):
             products.append({
-                "productId": random.randint(1, 20),
-                "quantity": random.randint(1, 5)
+                "productId": rng.randint(1, 20),
+                "quantity": rng.randint(1, 5)
             })
         
         cart_data = {
             "userId": user_id,
-            "date": TestHelper.generate_random_date(),
+            "date": TestHelper.generate_random_date(start_date, end_date, rng=rng),
             "products": products
         }
         
@@ -284,7 +314,7 @@ class TestHelper:
         Returns:
             Formatted JSON string
         """
-        return json.dumps(response_data, indent=indent, ensure_ascii=False)
+        return codec.dumps(response_data, indent=indent)
     
     @staticmethod
     def save_response_to_file(response_data: Dict[str, Any], filename: str, 
@@ -305,8 +335,7 @@ class TestHelper:
         
         file_path = output_path / filename
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(response_data, f, indent=2, ensure_ascii=False)
+        codec.dump(response_data, file_path, indent=2)
         
         return str(file_path)
     
@@ -327,8 +356,7 @@ class TestHelper:
         if not data_path.exists():
             raise FileNotFoundError(f"Test data file not found: {data_path}")
         
-        with open(data_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return codec.load(data_path)
     
     @staticmethod
     def mask_sensitive_data(data: Dict[str, Any], sensitive_fields: List[str]) -> Dict[str, Any]:
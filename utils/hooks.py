@@ -0,0 +1,40 @@
+from typing import Any, Callable, List
+
+class HookRegistry:
+    """Minimal observer registry used by framework components to publish events"""
+
+    def __init__(self):
+        self._callbacks: List[Callable[..., None]] = []
+
+    def register(self, callback: Callable[..., None]):
+        """
+        Register an event callback
+
+        Args:
+            callback: Callable invoked as callback(event, **data)
+        """
+        if callback not in self._callbacks:
+            self._callbacks.append(callback)
+
+    def unregister(self, callback: Callable[..., None]):
+        """Remove a previously registered callback"""
+        if callback in self._callbacks:
+            self._callbacks.remove(callback)
+
+    def emit(self, event: str, **data: Any):
+        """
+        Publish an event to all registered callbacks
+
+        Args:
+            event: Event name
+            **data: Event payload
+        """
+        for callback in list(self._callbacks):
+            try:
+                callback(event, **data)
+            except Exception as e:
+                # Observers must never break the request or validation path
+                print(f"Hook callback failed for event '{event}': {e}")
+
+    def __bool__(self) -> bool:
+        return bool(self._callbacks)
@@ -0,0 +1,274 @@
+import fnmatch
+import json
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Set
+import pytest
+from .hooks import HookRegistry
+from .json_codec import codec
+
+ENDPOINTS_FILE = "config/endpoints.json"
+SCHEMA_DIR = "test_data/schemas/"
+TEST_DATA_DIR = "test_data/"
+
+# Changes to these paths never affect test behaviour
+IGNORED_PATTERNS = ("*.md", "assets/*", ".github/*", ".gitignore")
+
+# Collection-time fixtures backed by test_data files
+DATA_FIXTURES = {
+    "product_test_data": "products_test_data.json",
+    "user_test_data": "users_test_data.json",
+    "cart_test_data": "carts_test_data.json",
+    "products_parameter_data": "products_test_data.json",
+    "users_parameter_data": "users_test_data.json",
+    "carts_parameter_data": "carts_test_data.json",
+}
+
+class ImpactIndex:
+    """Mapping of test node ids to the configuration and data they touch"""
+
+    def __init__(self, path: str = ".cache/impact_index.json"):
+        """
+        Initialize impact index
+
+        Args:
+            path: JSON file holding the index
+        """
+        self.path = Path(path)
+        self.tests: Dict[str, List[str]] = {}
+        self.load()
+
+    def load(self):
+        """Load index from disk"""
+        if not self.path.exists():
+            return
+
+        try:
+            self.tests = codec.load(self.path).get("tests", {})
+        except (json.JSONDecodeError, IOError, AttributeError) as e:
+            print(f"Ignoring unreadable impact index {self.path}: {e}")
+            self.tests = {}
+
+    def update(self, touched: Dict[str, List[str]]):
+        """Replace the dependencies of the given tests"""
+        for node_id, dependencies in touched.items():
+            self.tests[node_id] = sorted(set(dependencies))
+
+    def save(self):
+        """Atomically write index to disk"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(codec.dumps_bytes({"tests": self.tests}, indent=2, sort_keys=True))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Failed to save impact index {self.path}: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+
+    def is_affected(self, node_id: str, changed: Set[str]) -> bool:
+        """
+        Check whether a test is affected by changed dependencies
+
+        Tests missing from the index are always considered affected.
+        """
+        dependencies = self.tests.get(node_id)
+        if dependencies is None:
+            return True
+        return not changed.isdisjoint(dependencies)
+
+class ImpactRecorder:
+    """Collects dependencies touched by the currently running test"""
+
+    def __init__(self):
+        self.current_test: Optional[str] = None
+        self.touched: Dict[str, Set[str]] = {}
+
+    def start(self, node_id: str, fixture_names: Sequence[str] = ()):
+        """Start recording for a test"""
+        self.current_test = node_id
+        dependencies = self.touched.setdefault(node_id, set())
+        for fixture_name in fixture_names:
+            if fixture_name in DATA_FIXTURES:
+                dependencies.add(f"test_data:{DATA_FIXTURES[fixture_name]}")
+
+    def stop(self):
+        """Stop recording"""
+        self.current_test = None
+
+    def attach(self, hooks: HookRegistry):
+        """Subscribe to a component's hook registry"""
+        hooks.register(self.on_event)
+
+    def on_event(self, event: str, **data: Any):
+        """Hook callback translating component events into dependencies"""
+        if self.current_test is None:
+            return
+
+        if event == "request" and data.get("endpoint_key"):
+            dependency = f"endpoint:{data['endpoint_key']}"
+        elif event == "schema":
+            dependency = f"schema:{data['name']}"
+        elif event == "test_data":
+            dependency = f"test_data:{data['name']}"
+        else:
+            return
+
+        self.touched[self.current_test].add(dependency)
+
+    def as_dict(self) -> Dict[str, List[str]]:
+        """Recorded dependencies as JSON-serializable dict"""
+        return {node_id: sorted(deps) for node_id, deps in self.touched.items()}
+
+def changed_files(base_ref: str, root: str = ".") -> List[str]:
+    """
+    List files changed between a git ref and the working tree
+
+    Both paths of a renamed or copied file are listed.
+
+    Args:
+        base_ref: Git ref to diff against
+        root: Repository root
+
+    Returns:
+        Changed file paths relative to the repository root
+
+    Raises:
+        pytest.UsageError: If git cannot diff against the ref
+    """
+    result = subprocess.run(
+        ["git", "diff", "--name-status", base_ref, "--"],
+        cwd=root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise pytest.UsageError(f"--impact-since {base_ref}: {result.stderr.strip()}")
+
+    paths: List[str] = []
+    for line in result.stdout.splitlines():
+        # "M\tpath", or "R100\told\tnew" for renames and copies
+        paths.extend(part for part in line.split("\t")[1:] if part)
+    return paths
+
+def _file_at_ref(base_ref: str, path: str, root: str = ".") -> Optional[str]:
+    """Read a file's content at a git ref (None if it did not exist)"""
+    result = subprocess.run(
+        ["git", "show", f"{base_ref}:{path}"], cwd=root, capture_output=True, text=True
+    )
+    return result.stdout if result.returncode == 0 else None
+
+def changed_endpoint_keys(old_endpoints: Dict[str, Any], new_endpoints: Dict[str, Any]) -> Set[str]:
+    """
+    Compare two endpoints.json documents key by key
+
+    Returns:
+        Set of "resource.name" keys that were added, removed or changed
+    """
+    changed = set()
+    for resource in set(old_endpoints) | set(new_endpoints):
+        old_group = old_endpoints.get(resource, {})
+        new_group = new_endpoints.get(resource, {})
+        for name in set(old_group) | set(new_group):
+            if old_group.get(name) != new_group.get(name):
+                changed.add(f"{resource}.{name}")
+    return changed
+
+def changed_dependencies(base_ref: str, root: str = ".") -> Optional[Dict[str, Set[str]]]:
+    """
+    Translate a git diff into impact-index dependencies
+
+    Args:
+        base_ref: Git ref to diff against
+        root: Repository root
+
+    Returns:
+        Dict with "dependencies" (index keys) and "test_files" (changed test modules),
+        or None when a change cannot be attributed and the whole suite must run
+    """
+    dependencies: Set[str] = set()
+    test_files: Set[str] = set()
+
+    for path in changed_files(base_ref, root):
+        if any(fnmatch.fnmatch(path, pattern) for pattern in IGNORED_PATTERNS):
+            continue
+
+        if path == ENDPOINTS_FILE:
+            old_content = _file_at_ref(base_ref, path, root)
+            if old_content is None:
+                return None
+            new_endpoints = codec.load(Path(root) / path)
+            dependencies |= {f"endpoint:{key}" for key in changed_endpoint_keys(codec.loads(old_content), new_endpoints)}
+        elif path.startswith(SCHEMA_DIR) and path.endswith(".json"):
+            dependencies.add(f"schema:{Path(path).stem}")
+        elif path.startswith(TEST_DATA_DIR) and path.endswith(".json"):
+            dependencies.add(f"test_data:{Path(path).name}")
+        elif path.startswith("tests/") and Path(path).name.startswith("test_"):
+            test_files.add(path)
+        else:
+            print(f"Impact selection: cannot attribute change in {path}, running full suite")
+            return None
+
+    return {"dependencies": dependencies, "test_files": test_files}
+
+class ImpactSelectionPlugin:
+    """pytest plugin recording the impact index and selecting affected tests"""
+
+    def __init__(self, config):
+        self.config = config
+        self.index = ImpactIndex(config.getoption("--impact-index"))
+        self.record = config.getoption("--impact-record")
+        self.since = config.getoption("--impact-since")
+        self.recorder = ImpactRecorder()
+
+    def observe_hooks(self, hooks: HookRegistry):
+        """Attach the recorder to a component's hooks (called by fixtures)"""
+        if self.record:
+            self.recorder.attach(hooks)
+
+    def pytest_collection_modifyitems(self, config, items):
+        if not self.since:
+            return
+
+        changes = changed_dependencies(self.since, str(config.rootpath))
+        if changes is None:
+            return
+
+        selected, deselected = [], []
+        for item in items:
+            in_changed_file = item.nodeid.split("::")[0] in changes["test_files"]
+            if in_changed_file or self.index.is_affected(item.nodeid, changes["dependencies"]):
+                selected.append(item)
+            else:
+                deselected.append(item)
+
+        print(f"Impact selection since {self.since}: {len(selected)} affected, {len(deselected)} skipped")
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if self.record:
+            self.recorder.start(item.nodeid, getattr(item, "fixturenames", []))
+        yield
+        if self.record:
+            self.recorder.stop()
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # xdist controller: merge dependencies recorded by a worker
+        touched = getattr(node, "workeroutput", {}).get("impact_index")
+        if touched:
+            self.index.update(touched)
+
+    def pytest_sessionfinish(self, session):
+        if not self.record:
+            return
+
+        if hasattr(self.config, "workerinput"):
+            self.config.workeroutput["impact_index"] = self.recorder.as_dict()
+            return
+
+        self.index.update(self.recorder.as_dict())
+        self.index.save()
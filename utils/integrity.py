@@ -0,0 +1,187 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from .json_codec import codec
+
+class IntegrityReport:
+    """Findings of a referential integrity check"""
+
+    def __init__(self, max_examples: int = 100):
+        """
+        Initialize integrity report
+
+        Args:
+            max_examples: Findings kept per category; counts always cover all of them
+        """
+        self.max_examples = max_examples
+        self.counts: Dict[str, int] = {}
+        self.examples: Dict[str, List[Dict[str, Any]]] = {}
+        self.totals: Dict[str, int] = {}
+
+    def add(self, category: str, **details: Any):
+        """Record one finding"""
+        self.counts[category] = self.counts.get(category, 0) + 1
+        examples = self.examples.setdefault(category, [])
+        if len(examples) < self.max_examples:
+            examples.append(details)
+
+    @property
+    def is_clean(self) -> bool:
+        """Whether no findings were recorded"""
+        return not self.counts
+
+    def summary(self) -> str:
+        """One-line human readable summary"""
+        totals = ", ".join(f"{count} {resource}" for resource, count in self.totals.items())
+        if self.is_clean:
+            return f"Integrity check passed ({totals})"
+        findings = ", ".join(f"{count} {category}" for category, count in sorted(self.counts.items()))
+        return f"Integrity check failed ({totals}): {findings}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Report as JSON-serializable dict"""
+        return {
+            "clean": self.is_clean,
+            "totals": dict(self.totals),
+            "counts": dict(self.counts),
+            "examples": {k: list(v) for k, v in self.examples.items()}
+        }
+
+    def save(self, path: str = "reports/integrity/integrity_report.json") -> str:
+        """
+        Save report to JSON file
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Full path of saved file
+        """
+        output_path = Path(path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        codec.dump(self.to_dict(), output_path, indent=2)
+        return str(output_path)
+
+class IntegrityChecker:
+    """Verifies that carts reference existing users and products"""
+
+    def __init__(self, client=None, max_examples: int = 100):
+        """
+        Initialize integrity checker
+
+        Args:
+            client: APIClient used to fetch collections (only needed for run())
+            max_examples: Findings kept per category in the report
+        """
+        self.client = client
+        self.max_examples = max_examples
+
+    def fetch_collections(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch products, users and carts concurrently
+
+        Returns:
+            Dict mapping resource name to its full collection
+
+        Raises:
+            requests.HTTPError: If any collection cannot be fetched
+        """
+        services = {
+            "products": self.client.products,
+            "users": self.client.users,
+            "carts": self.client.carts,
+        }
+
+        def fetch(service):
+            response = service.get_all()
+            response.raise_for_status()
+            return response.json()
+
+        with ThreadPoolExecutor(max_workers=len(services)) as executor:
+            futures = {name: executor.submit(fetch, service) for name, service in services.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def run(self) -> IntegrityReport:
+        """Fetch all collections and check them"""
+        collections = self.fetch_collections()
+        return self.check(collections["products"], collections["users"], collections["carts"])
+
+    def build_index(self, resource: str, records: Iterable[Dict[str, Any]],
+                    report: IntegrityReport) -> Dict[Any, Dict[str, Any]]:
+        """
+        Index records by id, reporting missing and duplicate ids
+
+        Args:
+            resource: Resource name used in findings
+            records: Records to index
+            report: Report receiving findings
+
+        Returns:
+            Dict mapping id to the first record with that id
+        """
+        index: Dict[Any, Dict[str, Any]] = {}
+        count = 0
+        for position, record in enumerate(records):
+            count += 1
+            record_id = record.get("id") if isinstance(record, dict) else None
+            if record_id is None:
+                report.add(f"{resource}_missing_id", position=position)
+                continue
+            if record_id in index:
+                report.add(f"{resource}_duplicate_id", id=record_id, position=position)
+                continue
+            index[record_id] = record
+        report.totals[resource] = count
+        return index
+
+    def check(self, products: Iterable[Dict[str, Any]], users: Iterable[Dict[str, Any]],
+              carts: Iterable[Dict[str, Any]]) -> IntegrityReport:
+        """
+        Check all cart references in a single linear pass
+
+        Building the indexes and checking the carts are both O(n); every
+        foreign-key lookup is a dict membership test.
+
+        Args:
+            products: Product records
+            users: User records
+            carts: Cart records
+
+        Returns:
+            Integrity report
+        """
+        report = IntegrityReport(self.max_examples)
+        products_index = self.build_index("products", products, report)
+        users_index = self.build_index("users", users, report)
+        cart_index = self.build_index("carts", carts, report)
+        references = 0
+
+        for cart_id, cart in cart_index.items():
+            user_id = cart.get("userId")
+            references += 1
+            if user_id not in users_index:
+                report.add("orphan_cart_user", cart_id=cart_id, user_id=user_id)
+
+            seen_products = set()
+            for item in cart.get("products") or []:
+                product_id, quantity = self._item_fields(item)
+                references += 1
+                if product_id not in products_index:
+                    report.add("orphan_cart_product", cart_id=cart_id, product_id=product_id)
+                if product_id in seen_products:
+                    report.add("duplicate_cart_item", cart_id=cart_id, product_id=product_id)
+                seen_products.add(product_id)
+                if type(quantity) is not int or quantity < 1:
+                    report.add("invalid_cart_quantity", cart_id=cart_id, product_id=product_id,
+                               quantity=quantity)
+
+        report.totals["references"] = references
+        print(report.summary())
+        return report
+
+    @staticmethod
+    def _item_fields(item: Any) -> Tuple[Optional[Any], Optional[Any]]:
+        """Product id and quantity of a cart item (None for malformed items)"""
+        if not isinstance(item, dict):
+            return None, None
+        return item.get("productId"), item.get("quantity")
@@ -0,0 +1,117 @@
+import json
+import os
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+JSONInput = Union[str, bytes, bytearray, memoryview]
+
+class JSONCodec:
+    """JSON encoder/decoder backed by orjson when installed, stdlib json otherwise"""
+
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Initialize JSON codec
+
+        Args:
+            backend: "orjson", "stdlib" or "auto" (defaults to the JSON_CODEC
+                     environment variable, then "auto")
+        """
+        backend = (backend or os.environ.get("JSON_CODEC") or "auto").lower()
+
+        if backend not in ("auto", "orjson", "stdlib"):
+            raise ValueError(f"Unsupported JSON codec backend: {backend}")
+
+        if backend == "orjson" and orjson is None:
+            print("orjson is not installed, falling back to stdlib json")
+            backend = "stdlib"
+        elif backend == "auto":
+            backend = "orjson" if orjson is not None else "stdlib"
+
+        self.backend = backend
+
+    def dumps_bytes(self, obj: Any, indent: Optional[int] = None, sort_keys: bool = False,
+                    default: Optional[Callable[[Any], Any]] = None) -> bytes:
+        """
+        Serialize object to UTF-8 encoded JSON
+
+        Args:
+            obj: Object to serialize
+            indent: Pretty-print when set (orjson always indents by 2 spaces)
+            sort_keys: Sort dictionary keys
+            default: Fallback serializer for unsupported types
+
+        Returns:
+            JSON document as bytes
+        """
+        if self.backend == "orjson":
+            option = orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            if sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                return orjson.dumps(obj, default=default, option=option)
+            except orjson.JSONEncodeError:
+                # e.g. integers beyond 64 bits; stdlib handles them
+                pass
+
+        return json.dumps(obj, indent=indent, sort_keys=sort_keys, default=default,
+                          ensure_ascii=False).encode("utf-8")
+
+    def dumps(self, obj: Any, indent: Optional[int] = None, sort_keys: bool = False,
+              default: Optional[Callable[[Any], Any]] = None) -> str:
+        """
+        Serialize object to a JSON string
+
+        Args:
+            obj: Object to serialize
+            indent: Pretty-print when set (orjson always indents by 2 spaces)
+            sort_keys: Sort dictionary keys
+            default: Fallback serializer for unsupported types
+
+        Returns:
+            JSON document as str
+        """
+        return self.dumps_bytes(obj, indent=indent, sort_keys=sort_keys, default=default).decode("utf-8")
+
+    def loads(self, data: JSONInput) -> Any:
+        """
+        Deserialize JSON document
+
+        Args:
+            data: JSON document as str, bytes, bytearray or memoryview
+
+        Returns:
+            Deserialized object
+
+        Raises:
+            json.JSONDecodeError: If the document is invalid
+        """
+        if self.backend == "orjson":
+            try:
+                return orjson.loads(data)
+            except orjson.JSONDecodeError:
+                # Fall through so stdlib extensions (NaN, Infinity) and error messages match
+                pass
+
+        if isinstance(data, (bytearray, memoryview)):
+            data = bytes(data)
+        return json.loads(data)
+
+    def load(self, path: Union[str, os.PathLike]) -> Any:
+        """Deserialize a JSON file"""
+        with open(path, 'rb') as f:
+            return self.loads(f.read())
+
+    def dump(self, obj: Any, path: Union[str, os.PathLike], indent: Optional[int] = None,
+             sort_keys: bool = False, default: Optional[Callable[[Any], Any]] = None):
+        """Serialize object into a JSON file"""
+        with open(path, 'wb') as f:
+            f.write(self.dumps_bytes(obj, indent=indent, sort_keys=sort_keys, default=default))
+
+# Default codec shared by the framework
+codec = JSONCodec()
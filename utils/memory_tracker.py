@@ -0,0 +1,312 @@
+import gc
+import os
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import pytest
+from .json_codec import codec
+
+MB = 1024 * 1024
+
+def detect_monotonic_growth(series: Sequence[int], min_steps: int = 10, min_growth: int = MB,
+                            max_decrease_ratio: float = 0.1) -> bool:
+    """
+    Whether a series of memory readings keeps growing
+
+    Args:
+        series: Readings in bytes, one per test
+        min_steps: Readings needed before growth is judged
+        min_growth: Net growth in bytes required to flag
+        max_decrease_ratio: Share of decreasing steps still tolerated
+
+    Returns:
+        True if the series grew by at least min_growth and rarely decreased
+    """
+    if len(series) < min_steps or series[-1] - series[0] < min_growth:
+        return False
+    increases = sum(1 for a, b in zip(series, series[1:]) if b > a)
+    decreases = sum(1 for a, b in zip(series, series[1:]) if b < a)
+    return decreases <= max_decrease_ratio * (increases + decreases)
+
+class SiteStats:
+    """Size history of one allocation site across tests"""
+
+    __slots__ = ("first", "last", "peak", "increases", "decreases")
+
+    def __init__(self, size: int):
+        self.first = self.last = self.peak = size
+        self.increases = self.decreases = 0
+
+    def update(self, size: int):
+        if size > self.last:
+            self.increases += 1
+        elif size < self.last:
+            self.decreases += 1
+        self.last = size
+        self.peak = max(self.peak, size)
+
+    @property
+    def growth(self) -> int:
+        return self.last - self.first
+
+    def is_monotonic(self, min_increases: int, min_growth: int, max_decrease_ratio: float = 0.1) -> bool:
+        steps = self.increases + self.decreases
+        return (self.increases >= min_increases and self.growth >= min_growth
+                and self.decreases <= max_decrease_ratio * steps)
+
+class MemoryTracker:
+    """Per-test tracemalloc accounting, attributing retained memory to project sources"""
+
+    def __init__(self, root: Optional[str] = None, frames: int = 15, snapshot_interval: int = 10, top: int = 5):
+        """
+        Initialize memory tracker
+
+        Args:
+            root: Project root; allocations are attributed to the innermost frame below it
+            frames: Traceback depth recorded by tracemalloc
+            snapshot_interval: Tests between allocation site snapshots (totals are
+                               measured after every test, snapshots cost about a second)
+            top: Growth sites kept per snapshot
+        """
+        self.root = str(Path(root or os.getcwd()).resolve()) + os.sep
+        self.frames = frames
+        self.snapshot_interval = max(1, snapshot_interval)
+        self.top = top
+        self.tests: List[Dict[str, Any]] = []
+        self.series: List[int] = []
+        self.sites: Dict[str, SiteStats] = {}
+        self.fixtures: Dict[str, Dict[str, Any]] = {}
+        self.baseline = 0
+        self._ignored = {tracemalloc.__file__, __file__, "<unknown>"}
+
+    def start(self):
+        """Start tracing allocations"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        gc.collect()
+        self.baseline = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        """Stop tracing allocations"""
+        tracemalloc.stop()
+
+    def current(self) -> int:
+        """Currently traced bytes"""
+        return tracemalloc.get_traced_memory()[0]
+
+    def site_of(self, traceback: Tuple[Tuple[str, int], ...]) -> Optional[str]:
+        """
+        Attribute a raw traceback (innermost frame first) to a source line
+
+        Returns:
+            Innermost project frame, else the innermost frame, or None for
+            allocations made by tracemalloc, the import system or this module
+        """
+        filename, lineno = traceback[0]
+        if filename in self._ignored or filename.startswith("<frozen importlib"):
+            return None
+        for frame_filename, frame_lineno in traceback:
+            if frame_filename.startswith(self.root):
+                return f"{frame_filename[len(self.root):]}:{frame_lineno}"
+        return f"{'/'.join(Path(filename).parts[-2:])}:{lineno}"
+
+    def site_sizes(self) -> Dict[str, int]:
+        """Retained bytes per allocation site"""
+        snapshot = tracemalloc.take_snapshot()
+        # Every allocation made while walking the traces is itself traced, and tracemalloc
+        # walks the whole stack to do so; a fresh thread keeps that stack a few frames deep
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(self._aggregate, snapshot).result()
+
+    def _aggregate(self, snapshot: tracemalloc.Snapshot) -> Dict[str, int]:
+        # Grouping by traceback sums identical tracebacks first, so each is attributed once
+        sizes: Dict[str, int] = {}
+        for statistic in snapshot.statistics("traceback"):
+            # Traceback objects iterate oldest frame first
+            traceback = tuple((frame.filename, frame.lineno) for frame in reversed(statistic.traceback))
+            site = self.site_of(traceback)
+            if site is not None:
+                sizes[site] = sizes.get(site, 0) + statistic.size
+        return sizes
+
+    def record_fixture(self, name: str, scope: str, size: int):
+        """Accumulate memory retained by a fixture setup"""
+        entry = self.fixtures.setdefault(name, {"scope": scope, "setups": 0, "retained": 0})
+        entry["setups"] += 1
+        entry["retained"] += size
+
+    def record_test(self, nodeid: str, before: int, duration: float, last: bool = False):
+        """
+        Measure memory retained after a test, attributing growth to sources on snapshot tests
+
+        Args:
+            nodeid: Test node id
+            before: Traced bytes when the test started
+            duration: Test protocol duration in seconds
+            last: Whether this is the last test of the session (always snapshotted)
+        """
+        gc.collect()
+        after = self.current()
+        self.series.append(after)
+        entry = {
+            "nodeid": nodeid,
+            "retained": after,
+            "growth": after - before,
+            "duration": round(duration, 4)
+        }
+        if last or len(self.series) % self.snapshot_interval == 0:
+            entry["top_sites"] = [{"site": site, "growth": delta} for delta, site in self.snapshot_growth()]
+        self.tests.append(entry)
+
+    def snapshot_growth(self) -> List[Tuple[int, str]]:
+        """Update per-site history and return the largest growth since the previous snapshot"""
+        sizes = self.site_sizes()
+        growth = []
+        for site, size in sizes.items():
+            stats = self.sites.get(site)
+            if stats is None:
+                self.sites[site] = SiteStats(size)
+                growth.append((size, site))
+            else:
+                delta = size - stats.last
+                stats.update(size)
+                if delta:
+                    growth.append((delta, site))
+        for site, stats in self.sites.items():
+            if site not in sizes and stats.last:
+                growth.append((-stats.last, site))
+                stats.update(0)
+        growth.sort(reverse=True)
+        return [(delta, site) for delta, site in growth[:self.top] if delta > 0]
+
+    def module_growth(self) -> Dict[str, int]:
+        """Net growth since first seen, per source module"""
+        modules: Dict[str, int] = {}
+        for site, stats in self.sites.items():
+            module = site.rsplit(":", 1)[0]
+            modules[module] = modules.get(module, 0) + stats.growth
+        return dict(sorted(modules.items(), key=lambda kv: -kv[1]))
+
+    def leaks(self, min_steps: int = 10, min_growth: int = MB) -> Dict[str, Any]:
+        """
+        Monotonic growth of total memory and of individual sites
+
+        The first test is skipped since it pays for session fixture setup.
+        """
+        sites: List[Dict[str, Any]] = [
+            {"site": site, "growth": stats.growth, "increases": stats.increases, "decreases": stats.decreases}
+            for site, stats in self.sites.items()
+            if stats.is_monotonic(3, min_growth // 4)
+        ]
+        sites.sort(key=lambda entry: -entry["growth"])
+        return {
+            "total": detect_monotonic_growth(self.series[1:], min_steps, min_growth),
+            "sites": sites
+        }
+
+    def report(self, min_steps: int = 10, min_growth: int = MB) -> Dict[str, Any]:
+        """Report as JSON-serializable dict"""
+        return {
+            "baseline": self.baseline,
+            "final": self.series[-1] if self.series else self.baseline,
+            "peak": tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None,
+            "tests": self.tests,
+            "largest_growth": sorted(self.tests, key=lambda t: -t["growth"])[:10],
+            "modules": dict(list(self.module_growth().items())[:20]),
+            "fixtures": dict(sorted(self.fixtures.items(), key=lambda kv: -kv[1]["retained"])),
+            "leaks": self.leaks(min_steps, min_growth)
+        }
+
+class MemoryTrackerPlugin:
+    """pytest plugin snapshotting memory per test (registered only with --memory-track)"""
+
+    def __init__(self, config):
+        self.config = config
+        self.report_path = Path(config.getoption("--memory-report"))
+        self.max_test_growth = config.getoption("--memory-max-test-growth")
+        self.fail_on_leak = config.getoption("--memory-fail-on-leak")
+        self.min_steps = 10
+        self.min_growth = MB
+        self.tracker = MemoryTracker(str(config.rootpath), config.getoption("--memory-frames"),
+                                     config.getoption("--memory-snapshot-interval"))
+        self.worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+        self.reports: Dict[str, Dict[str, Any]] = {}
+
+    def _is_controller(self) -> bool:
+        return bool(getattr(self.config.option, "numprocesses", None)) and not hasattr(self.config, "workerinput")
+
+    @pytest.hookimpl(tryfirst=True)
+    def pytest_runtestloop(self, session):
+        # Start after collection so the collected tree does not count as retained by tests
+        if not self._is_controller() and not session.config.option.collectonly:
+            self.tracker.start()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        before = self.tracker.current() if tracemalloc.is_tracing() else None
+        yield
+        if before is not None:
+            self.tracker.record_fixture(fixturedef.argname, fixturedef.scope, self.tracker.current() - before)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if not tracemalloc.is_tracing():
+            yield
+            return
+        gc.collect()
+        before = self.tracker.current()
+        start = time.perf_counter()
+        yield
+        self.tracker.record_test(item.nodeid, before, time.perf_counter() - start, last=nextitem is None)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(self, node, error):
+        # xdist controller: collect a worker's report
+        report = getattr(node, "workeroutput", {}).get("memory_report")
+        if report:
+            self.reports[node.workerinput["workerid"]] = report
+
+    def violations(self, report: Dict[str, Any]) -> List[str]:
+        """Threshold violations of one worker's report"""
+        found = []
+        if self.max_test_growth is not None:
+            limit = self.max_test_growth * MB
+            for test in report["tests"]:
+                if test["growth"] > limit:
+                    found.append(f"{test['nodeid']} retained {test['growth'] / MB:.1f} MB")
+        if self.fail_on_leak:
+            if report["leaks"]["total"]:
+                found.append(f"memory grew monotonically to {report['final'] / MB:.1f} MB")
+            for site in report["leaks"]["sites"]:
+                found.append(f"{site['site']} grew monotonically by {site['growth'] / MB:.1f} MB")
+        return found
+
+    def pytest_sessionfinish(self, session):
+        if tracemalloc.is_tracing():
+            report = self.tracker.report(self.min_steps, self.min_growth)
+            self.tracker.stop()
+            if hasattr(self.config, "workerinput"):
+                self.config.workeroutput["memory_report"] = report
+                return
+            self.reports[self.worker] = report
+
+        if not self.reports:
+            return
+
+        self.report_path.parent.mkdir(parents=True, exist_ok=True)
+        codec.dump({"workers": self.reports}, self.report_path, indent=2)
+
+        violations = []
+        for worker, report in sorted(self.reports.items()):
+            leaking = len(report["leaks"]["sites"]) + int(report["leaks"]["total"])
+            print(f"\nMemory ({worker}): {report['baseline'] / MB:.1f} MB -> {report['final'] / MB:.1f} MB "
+                  f"over {len(report['tests'])} tests, {leaking} growth suspects")
+            violations.extend(f"[{worker}] {v}" for v in self.violations(report))
+        print(f"Memory report written to {self.report_path}")
+
+        if violations:
+            for violation in violations:
+                print(f"Memory threshold exceeded: {violation}")
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
@@ -0,0 +1,158 @@
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Any, Optional
+from .json_codec import codec
+
+class _Series:
+    """Running statistics with a bounded window of recent samples for percentiles"""
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        self.samples.append(value)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99)
+        }
+
+class MetricsCollector:
+    """Thread-safe counters and value series, overall and per endpoint"""
+
+    def __init__(self, window: int = 1024):
+        """
+        Initialize metrics collector
+
+        Args:
+            window: Number of recent samples kept per series for percentiles
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = {}
+        self._series: Dict[str, _Series] = {}
+        self._endpoint_counters: Dict[str, Dict[str, float]] = {}
+        self._endpoint_series: Dict[str, Dict[str, _Series]] = {}
+
+    def increment(self, name: str, value: float = 1, endpoint: Optional[str] = None):
+        """
+        Increment a counter
+
+        Args:
+            name: Counter name
+            value: Increment
+            endpoint: Endpoint key to also attribute the value to
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+            if endpoint:
+                counters = self._endpoint_counters.setdefault(endpoint, {})
+                counters[name] = counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float, endpoint: Optional[str] = None):
+        """
+        Record a value in a series
+
+        Args:
+            name: Series name
+            value: Observed value
+            endpoint: Endpoint key to also attribute the value to
+        """
+        with self._lock:
+            self._series.setdefault(name, _Series(self.window)).add(value)
+            if endpoint:
+                series = self._endpoint_series.setdefault(endpoint, {})
+                series.setdefault(name, _Series(self.window)).add(value)
+
+    def counter(self, name: str, endpoint: Optional[str] = None) -> float:
+        """Current value of a counter"""
+        with self._lock:
+            if endpoint:
+                return self._endpoint_counters.get(endpoint, {}).get(name, 0)
+            return self._counters.get(name, 0)
+
+    def count(self, name: str, endpoint: Optional[str] = None) -> int:
+        """Number of values recorded in a series"""
+        with self._lock:
+            if endpoint:
+                series = self._endpoint_series.get(endpoint, {}).get(name)
+            else:
+                series = self._series.get(name)
+            return series.count if series else 0
+
+    def percentile(self, name: str, q: float, endpoint: Optional[str] = None) -> Optional[float]:
+        """Percentile of the recent samples of a series"""
+        with self._lock:
+            if endpoint:
+                series = self._endpoint_series.get(endpoint, {}).get(name)
+            else:
+                series = self._series.get(name)
+            return series.percentile(q) if series else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get all metrics as a JSON-serializable dict
+
+        Returns:
+            Metrics dictionary
+        """
+        with self._lock:
+            endpoints = {}
+            for endpoint in set(self._endpoint_counters) | set(self._endpoint_series):
+                endpoints[endpoint] = {
+                    "counters": dict(self._endpoint_counters.get(endpoint, {})),
+                    "series": {k: v.summary() for k, v in self._endpoint_series.get(endpoint, {}).items()}
+                }
+
+            return {
+                "counters": dict(self._counters),
+                "series": {k: v.summary() for k, v in self._series.items()},
+                "endpoints": endpoints
+            }
+
+    def save(self, path: str) -> str:
+        """
+        Save metrics snapshot to JSON file
+
+        Args:
+            path: Output file path
+
+        Returns:
+            Full path of saved file
+        """
+        output_path = Path(path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        codec.dump(self.snapshot(), output_path, indent=2, sort_keys=True)
+
+        return str(output_path)
+
+    def reset(self):
+        """Clear all metrics"""
+        with self._lock:
+            self._counters.clear()
+            self._series.clear()
+            self._endpoint_counters.clear()
+            self._endpoint_series.clear()
@@ -0,0 +1,118 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, List, Literal, Optional, Type, TypeVar, Union
+from urllib.parse import urlparse
+from pydantic import BaseModel, ConfigDict, Field, StrictFloat, StrictInt, StrictStr, TypeAdapter, field_validator
+
+ModelT = TypeVar("ModelT", bound="FakeStoreModel")
+
+JSONInput = Union[str, bytes, bytearray]
+
+@lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Cached validator for a list of models (building one is the expensive part)"""
+    return TypeAdapter(List[model])  # type: ignore[valid-type]
+
+class FakeStoreModel(BaseModel):
+    """Base class for FakeStore API response models"""
+
+    # Unknown fields such as "__v" are ignored; numbers and strings are not coerced
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    @classmethod
+    def parse(cls: Type[ModelT], data: Union[JSONInput, dict]) -> ModelT:
+        """
+        Validate a single object
+
+        Args:
+            data: Raw JSON (str/bytes) or already decoded dict
+
+        Returns:
+            Model instance
+
+        Raises:
+            pydantic.ValidationError: If the data does not match the model
+        """
+        if isinstance(data, (str, bytes, bytearray)):
+            return cls.model_validate_json(data)
+        return cls.model_validate(data)
+
+    @classmethod
+    def parse_many(cls: Type[ModelT], data: Union[JSONInput, List[Any]]) -> List[ModelT]:
+        """
+        Validate a list of objects in one pass
+
+        Raw JSON is parsed and validated together without building intermediate
+        dicts, which is the fast path for list endpoints.
+
+        Args:
+            data: Raw JSON array (str/bytes) or already decoded list
+
+        Returns:
+            List of model instances
+
+        Raises:
+            pydantic.ValidationError: If any item does not match the model
+        """
+        adapter = _list_adapter(cls)
+        if isinstance(data, (str, bytes, bytearray)):
+            return adapter.validate_json(data)
+        return adapter.validate_python(data)
+
+class Rating(FakeStoreModel):
+    rate: StrictFloat = Field(ge=0, le=5)
+    count: StrictInt = Field(ge=0)
+
+class Product(FakeStoreModel):
+    id: StrictInt = Field(ge=1)
+    title: StrictStr = Field(min_length=1)
+    price: StrictFloat = Field(ge=0)
+    description: StrictStr
+    category: Literal["electronics", "jewelery", "men's clothing", "women's clothing"]
+    image: StrictStr
+    rating: Rating
+
+    @field_validator("image")
+    @classmethod
+    def _check_image_uri(cls, value: str) -> str:
+        parsed = urlparse(value)
+        if not parsed.scheme or not parsed.netloc:
+            raise ValueError("image must be an absolute URI")
+        return value
+
+class Name(FakeStoreModel):
+    firstname: StrictStr
+    lastname: StrictStr
+
+class Geolocation(FakeStoreModel):
+    lat: StrictStr
+    long: StrictStr
+
+class Address(FakeStoreModel):
+    city: StrictStr
+    street: StrictStr
+    number: StrictInt
+    zipcode: StrictStr
+    geolocation: Optional[Geolocation] = None
+
+class User(FakeStoreModel):
+    id: StrictInt = Field(ge=1)
+    email: StrictStr
+    username: StrictStr
+    password: StrictStr
+    name: Name
+    address: Address
+    phone: StrictStr
+
+class CartItem(FakeStoreModel):
+    productId: StrictInt = Field(ge=1)
+    quantity: StrictInt = Field(ge=1)
+
+class Cart(FakeStoreModel):
+    id: StrictInt = Field(ge=1)
+    userId: StrictInt = Field(ge=1)
+    date: datetime
+    products: List[CartItem]
+
+class AuthToken(FakeStoreModel):
+    token: StrictStr = Field(min_length=1)
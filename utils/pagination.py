@@ -0,0 +1,160 @@
+import contextvars
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_DONE = object()
+
+def ordered_parallel(fn: Callable[[T], R], items: Iterable[T], max_workers: int) -> Iterator[R]:
+    """
+    Map fn over items in a thread pool, yielding results in input order
+
+    At most max_workers calls are in flight, so results are never buffered
+    beyond that window regardless of how many items there are.
+
+    Args:
+        fn: Function to apply
+        items: Input items (consumed lazily)
+        max_workers: Number of concurrent calls
+
+    Yields:
+        fn(item) for each item, in order
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque["Future[R]"] = deque()
+
+        def submit_next():
+            item = next(items, _DONE)
+            if item is not _DONE:
+                # Carry the caller's context, and with it the current deadline, into the pool
+                pending.append(executor.submit(contextvars.copy_context().run, fn, item))
+
+        for _ in range(max_workers):
+            submit_next()
+        try:
+            while pending:
+                result = pending.popleft().result()
+                submit_next()
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+def date_windows(start_date: str, end_date: str, window_days: int) -> List[Tuple[str, str]]:
+    """
+    Split an inclusive date range into consecutive non-overlapping windows
+
+    Args:
+        start_date: First day (YYYY-MM-DD)
+        end_date: Last day (YYYY-MM-DD)
+        window_days: Days per window
+
+    Returns:
+        List of (start, end) date strings
+    """
+    current = date.fromisoformat(start_date)
+    last = date.fromisoformat(end_date)
+    windows = []
+    while current <= last:
+        window_end = min(current + timedelta(days=window_days - 1), last)
+        windows.append((current.isoformat(), window_end.isoformat()))
+        current = window_end + timedelta(days=1)
+    return windows
+
+class PageIterator:
+    """Yields records page by page, optionally prefetching the next page in the background"""
+
+    def __init__(self, fetch_page: Callable[[int], Optional[List[Dict[str, Any]]]], prefetch: bool = True):
+        """
+        Initialize page iterator
+
+        Args:
+            fetch_page: Returns the records of a zero-based page number, or None when
+                        there are no more pages
+            prefetch: Fetch page n+1 while the records of page n are being consumed
+        """
+        self.fetch_page = fetch_page
+        self.prefetch = prefetch
+        self.pages_fetched = 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        if not self.prefetch:
+            page_number = 0
+            while True:
+                page = self._fetch(page_number)
+                if page is None:
+                    return
+                yield from page
+                page_number += 1
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future: Optional[Future] = executor.submit(contextvars.copy_context().run, self._fetch, 0)
+            page_number = 0
+            try:
+                while future is not None:
+                    page = future.result()
+                    if page is None:
+                        future = None
+                        return
+                    page_number += 1
+                    future = executor.submit(contextvars.copy_context().run, self._fetch, page_number)
+                    yield from page
+            finally:
+                if future is not None:
+                    future.cancel()
+
+    def _fetch(self, page_number: int) -> Optional[List[Dict[str, Any]]]:
+        page = self.fetch_page(page_number)
+        self.pages_fetched += 1
+        return page
+
+class IdRangePager:
+    """Pages through a resource by consecutive ids for APIs without offset paging"""
+
+    def __init__(self, get_by_id: Callable[[int], Any], page_size: int = 50,
+                 max_workers: int = 8, max_empty_pages: int = 3, start_id: int = 1):
+        """
+        Initialize id range pager
+
+        Args:
+            get_by_id: Service method fetching one record by id
+            page_size: Ids per page
+            max_workers: Concurrent requests per page
+            max_empty_pages: Consecutive pages without any record that end the walk; deleted
+                             records leave gaps, so a single empty page is not proof of the end
+            start_id: First id
+        """
+        self.get_by_id = get_by_id
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.max_empty_pages = max_empty_pages
+        self.start_id = start_id
+        self._empty_pages = 0
+
+    def __call__(self, page_number: int) -> Optional[List[Dict[str, Any]]]:
+        if self._empty_pages >= self.max_empty_pages:
+            return None
+
+        first = self.start_id + page_number * self.page_size
+        ids = range(first, first + self.page_size)
+        records = [record for record in ordered_parallel(self._fetch_one, ids, self.max_workers) if record]
+
+        self._empty_pages = 0 if records else self._empty_pages + 1
+        if not records and self._empty_pages >= self.max_empty_pages:
+            print(f"Id range walk stopped after {self._empty_pages} empty page(s) "
+                  f"ending at id {first + self.page_size - 1}")
+            return None
+        return records
+
+    def _fetch_one(self, record_id: int) -> Optional[Dict[str, Any]]:
+        response = self.get_by_id(record_id)
+        # Missing ids come back as 404 or as an empty 200 body
+        if response.status_code != 200 or not response.content.strip():
+            return None
+        record = response.json()
+        return record if isinstance(record, dict) else None
@@ -0,0 +1,227 @@
+import hashlib
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+import pytest
+from .json_codec import codec
+
+# Sample categories, matched against frames from the innermost outwards (first match wins)
+CATEGORIES: List[Tuple[str, Tuple[str, ...]]] = [
+    ("network", ("/socket.py", "/ssl.py", "/http/client.py", "/selectors.py")),
+    ("validation", ("utils/validators.py", "utils/schema_compiler.py", "utils/models.py",
+                    "compiled_schemas/", "/jsonschema/", "/pydantic/", "/pydantic_core/")),
+    ("allure_capture", ("/allure_commons/", "/allure_pytest/")),
+    ("data_provider", ("utils/data_provider.py", "utils/data_generator.py", "utils/helpers.py", "/faker/")),
+    ("json", ("utils/json_codec.py", "/json/", "/orjson")),
+    ("http_client", ("utils/api_client.py", "utils/transport.py", "utils/streaming.py",
+                     "utils/compression.py", "/urllib3/", "/requests/")),
+    ("test_code", ("tests/", "conftest.py")),
+    ("pytest", ("/_pytest/", "/pluggy/", "/xdist/")),
+]
+
+def _heaviest(weights: Dict[Any, float]) -> List[Tuple[Any, float]]:
+    """Items of a weight mapping, heaviest first"""
+    return sorted(weights.items(), key=lambda item: item[1], reverse=True)
+
+class SamplingProfiler:
+    """Low-overhead statistical profiler sampling thread stacks from a background thread"""
+
+    def __init__(self, interval: float = 0.005, root: Optional[str] = None):
+        """
+        Initialize sampling profiler
+
+        Args:
+            interval: Seconds between samples
+            root: Project root; paths below it are shown relative, and helper threads
+                  are only sampled while running project code
+        """
+        self.interval = interval
+        self.root = str(Path(root or os.getcwd()).resolve()) + os.sep
+        # Seconds per stack and per category, weighted by the wall time between samples
+        self.stacks: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self.categories: Dict[str, float] = defaultdict(float)
+        self.samples = 0
+        self.duration = 0.0
+        self._labels: Dict[Any, str] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._started = 0.0
+
+    def start(self):
+        """Start sampling"""
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.duration += time.perf_counter() - self._started
+
+    def reset(self):
+        """Discard collected samples"""
+        self.stacks.clear()
+        self.categories.clear()
+        self.samples = 0
+        self.duration = 0.0
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        main_ident = threading.main_thread().ident
+        last = time.perf_counter()
+        # Ticks run late under GIL contention, so each sample is weighted by the time it stands for
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            for ident, frame in sys._current_frames().items():
+                if ident != own_ident:
+                    self._sample(frame, ident == main_ident, elapsed)
+
+    def _sample(self, frame, is_main: bool, elapsed: float):
+        codes = []
+        while frame is not None:
+            codes.append(frame.f_code)
+            frame = frame.f_back
+
+        # Idle pool workers are noise; keep helper threads only while they run project code
+        if not is_main and not any(code.co_filename.startswith(self.root) for code in codes):
+            return
+
+        self.samples += 1
+        self.categories[self._categorize(codes)] += elapsed
+        self.stacks[tuple(self._label(code) for code in reversed(codes))] += elapsed
+
+    def _categorize(self, codes) -> str:
+        for code in codes:
+            filename = code.co_filename.replace(os.sep, "/")
+            for category, patterns in CATEGORIES:
+                if any(pattern in filename for pattern in patterns):
+                    return category
+        return "other"
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            filename = code.co_filename
+            if filename.startswith(self.root):
+                filename = filename[len(self.root):]
+            else:
+                filename = "/".join(Path(filename).parts[-2:])
+            label = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+            self._labels[code] = label
+        return label
+
+    def category_seconds(self) -> Dict[str, float]:
+        """Estimated wall time per category"""
+        return {category: round(seconds, 4) for category, seconds in _heaviest(self.categories)}
+
+    def write_collapsed(self, path: Path) -> str:
+        """Write stacks in collapsed format (flamegraph.pl, speedscope, inferno), weighted in microseconds"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, seconds in _heaviest(self.stacks):
+                f.write(";".join(label.replace(";", ":") for label in stack) + f" {round(seconds * 1e6)}\n")
+        return str(path)
+
+    def write_speedscope(self, path: Path, name: str) -> str:
+        """Write a speedscope sampled profile"""
+        frame_index: Dict[str, int] = {}
+        frames: List[Dict[str, str]] = []
+        samples = []
+        weights = []
+        for stack, seconds in _heaviest(self.stacks):
+            indices = []
+            for label in stack:
+                if label not in frame_index:
+                    frame_index[label] = len(frames)
+                    frames.append({"name": label})
+                indices.append(frame_index[label])
+            samples.append(indices)
+            weights.append(round(seconds, 6))
+
+        document = {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "fakestore-sampling-profiler",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 6),
+                "samples": samples,
+                "weights": weights
+            }]
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        codec.dump(document, path)
+        return str(path)
+
+class ProfilerPlugin:
+    """pytest plugin profiling each test or the whole session (registered only with --profile)"""
+
+    def __init__(self, config):
+        self.config = config
+        self.mode = config.getoption("--profile")
+        self.output_dir = Path(config.getoption("--profile-dir"))
+        self.worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+        self.profiler = SamplingProfiler(config.getoption("--profile-interval") / 1000.0, str(config.rootpath))
+        self.summary: Dict[str, Any] = {}
+
+    def pytest_sessionstart(self, session):
+        if self.mode == "session":
+            self.profiler.start()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        if self.mode != "test":
+            yield
+            return
+
+        self.profiler.reset()
+        self.profiler.start()
+        yield
+        self.profiler.stop()
+
+        # Truncated names of long node ids can collide; the hash of the full id keeps them apart
+        digest = hashlib.sha1(item.nodeid.encode("utf-8")).hexdigest()[:8]
+        name = f'{re.sub(r"[^A-Za-z0-9_.-]+", "_", item.nodeid)[-150:]}-{digest}'
+        self.profiler.write_collapsed(self.output_dir / f"{name}.collapsed.txt")
+        self.profiler.write_speedscope(self.output_dir / f"{name}.speedscope.json", item.nodeid)
+        self.summary[item.nodeid] = {
+            "duration": round(self.profiler.duration, 4),
+            "samples": self.profiler.samples,
+            "categories": self.profiler.category_seconds()
+        }
+
+    def pytest_sessionfinish(self, session):
+        if self.mode == "session":
+            self.profiler.stop()
+            name = f"session-{self.worker}"
+            self.profiler.write_collapsed(self.output_dir / f"{name}.collapsed.txt")
+            self.profiler.write_speedscope(self.output_dir / f"{name}.speedscope.json", name)
+            self.summary["session"] = {
+                "duration": round(self.profiler.duration, 4),
+                "samples": self.profiler.samples,
+                "categories": self.profiler.category_seconds()
+            }
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        codec.dump(self.summary, self.output_dir / f"summary-{self.worker}.json", indent=2)
+
+        totals: Counter = Counter()
+        for entry in self.summary.values():
+            totals.update(entry["categories"])
+        breakdown = ", ".join(f"{category} {seconds:.2f}s" for category, seconds in totals.most_common())
+        print(f"\nProfile ({self.mode}, {self.worker}) written to {self.output_dir}: {breakdown}")
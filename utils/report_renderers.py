@@ -0,0 +1,392 @@
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+import time
+import uuid
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Union
+from .event_log import read_events
+from .json_codec import codec
+
+FORMATS = ("junit", "html", "allure", "metrics")
+
+# Where each format is written, relative to the reports root
+OUTPUT_PATHS = {
+    "junit": "junit/junit.xml",
+    "html": "html/report.html",
+    # Not allure/results, where allure-pytest writes the native results of a run
+    "allure": "allure/event-log-results",
+    "metrics": "metrics/metrics.json"
+}
+
+class RunResults:
+    """Tests, requests and metrics of a run, rebuilt from its event log"""
+
+    def __init__(self):
+        self.tests: Dict[str, Dict[str, Any]] = {}
+        self.metrics: List[Dict[str, Any]] = []
+        self.sessions: List[Dict[str, Any]] = []
+
+    @classmethod
+    def load(cls, directory: Union[str, Path]) -> "RunResults":
+        """
+        Read the event log of a run
+
+        Args:
+            directory: Directory holding the event log files
+
+        Returns:
+            Run results
+        """
+        run = cls()
+        for event in read_events(directory):
+            kind = event["event"]
+            if kind == "test":
+                run._test(event["nodeid"]).update(
+                    {k: event[k] for k in ("name", "location", "markers", "labels", "title", "description", "worker")}
+                )
+            elif kind == "phase":
+                run._test(event["nodeid"])["phases"][event["when"]] = event
+            elif kind == "request":
+                if event.get("nodeid"):
+                    run._test(event["nodeid"])["requests"].append(event)
+            elif kind == "capture":
+                if event.get("nodeid"):
+                    run._test(event["nodeid"])["captures"].append(event)
+            elif kind == "metrics":
+                run.metrics.append(event)
+            elif kind == "session_finish":
+                run.sessions.append(event)
+        return run
+
+    def _test(self, nodeid: str) -> Dict[str, Any]:
+        if nodeid not in self.tests:
+            self.tests[nodeid] = {"nodeid": nodeid, "name": nodeid.rsplit("::", 1)[-1], "labels": [],
+                                  "markers": [], "title": None, "description": "", "phases": {},
+                                  "requests": [], "captures": []}
+        return self.tests[nodeid]
+
+    @staticmethod
+    def outcome(test: Dict[str, Any]) -> str:
+        """passed, failed, error (setup or teardown failed), skipped, xfailed or xpassed"""
+        phases = test["phases"]
+        for when in ("setup", "teardown"):
+            if phases.get(when, {}).get("outcome") == "failed":
+                return "error"
+        call = phases.get("call")
+        if call is None:
+            return "skipped" if phases.get("setup", {}).get("outcome") == "skipped" else "error"
+        if call.get("wasxfail") is not None:
+            return "xfailed" if call["outcome"] == "skipped" else "xpassed"
+        return call["outcome"]
+
+    @staticmethod
+    def duration(test: Dict[str, Any]) -> float:
+        return sum(phase.get("duration") or 0.0 for phase in test["phases"].values())
+
+    @staticmethod
+    def message(test: Dict[str, Any]) -> str:
+        """Failure traceback or skip reason of a test"""
+        for when in ("setup", "call", "teardown"):
+            longrepr = test["phases"].get(when, {}).get("longrepr")
+            if longrepr:
+                return longrepr
+        return ""
+
+    def summary(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for test in self.tests.values():
+            outcome = self.outcome(test)
+            counts[outcome] = counts.get(outcome, 0) + 1
+        return counts
+
+def render_junit(run: RunResults, path: Union[str, Path]) -> str:
+    """
+    Render a JUnit XML report (xunit2)
+
+    Args:
+        run: Run results
+        path: Output file
+
+    Returns:
+        Path of the report
+    """
+    summary = run.summary()
+    suite = ET.Element("testsuite", {
+        "name": "pytest",
+        "tests": str(len(run.tests)),
+        "failures": str(summary.get("failed", 0) + summary.get("xpassed", 0)),
+        "errors": str(summary.get("error", 0)),
+        "skipped": str(summary.get("skipped", 0) + summary.get("xfailed", 0)),
+        "time": f"{sum(run.duration(test) for test in run.tests.values()):.3f}"
+    })
+    for nodeid, test in run.tests.items():
+        module, _, rest = nodeid.partition("::")
+        classname = ".".join([module[:-3].replace("/", ".")] + rest.split("::")[:-1])
+        case = ET.SubElement(suite, "testcase", {
+            "classname": classname, "name": test["name"], "time": f"{run.duration(test):.3f}"
+        })
+        outcome = run.outcome(test)
+        message = run.message(test)
+        if outcome in ("failed", "xpassed"):
+            ET.SubElement(case, "failure", {"message": message.splitlines()[-1] if message else outcome}).text = message
+        elif outcome == "error":
+            ET.SubElement(case, "error", {"message": message.splitlines()[-1] if message else outcome}).text = message
+        elif outcome in ("skipped", "xfailed"):
+            ET.SubElement(case, "skipped", {"message": message or outcome})
+
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    root = ET.Element("testsuites")
+    root.append(suite)
+    ET.ElementTree(root).write(output_path, encoding="utf-8", xml_declaration=True)
+    return str(output_path)
+
+HTML_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Test Report</title>
+<style>
+body { font-family: sans-serif; margin: 2em; }
+table { border-collapse: collapse; width: 100%; }
+td, th { border: 1px solid #ddd; padding: 4px 8px; text-align: left; vertical-align: top; }
+.passed { color: #2e7d32; } .failed, .error, .xpassed { color: #c62828; } .skipped, .xfailed { color: #f9a825; }
+pre { white-space: pre-wrap; margin: 0; font-size: 0.85em; }
+</style></head><body>
+<h1>Test Report</h1>
+<p>{{ total }} tests in {{ "%.2f"|format(duration) }}s:
+{% for outcome, count in summary|dictsort %}<span class="{{ outcome }}">{{ count }} {{ outcome }}</span>{% if not loop.last %}, {% endif %}{% endfor %}</p>
+<table>
+<tr><th>Test</th><th>Outcome</th><th>Duration</th><th>Requests</th><th>Details</th></tr>
+{% for test in tests %}
+<tr>
+<td>{{ test.title or test.nodeid }}{% if test.title %}<br><small>{{ test.nodeid }}</small>{% endif %}</td>
+<td class="{{ test.outcome }}">{{ test.outcome }}</td>
+<td>{{ "%.3f"|format(test.duration) }}s</td>
+<td>{% for r in test.requests %}{{ r.method }} {{ r.url }} &rarr; {{ r.status or r.error }}{% if r.elapsed is not none %} ({{ "%.3f"|format(r.elapsed) }}s){% endif %}<br>{% endfor %}</td>
+<td>{% if test.message %}<pre>{{ test.message }}</pre>{% endif %}</td>
+</tr>
+{% endfor %}
+</table>
+</body></html>
+"""
+
+def render_html(run: RunResults, path: Union[str, Path]) -> str:
+    """
+    Render a self-contained HTML report
+
+    Args:
+        run: Run results
+        path: Output file
+
+    Returns:
+        Path of the report
+    """
+    import jinja2
+
+    tests = [{
+        **test,
+        "outcome": run.outcome(test),
+        "duration": run.duration(test),
+        "message": run.message(test)
+    } for test in run.tests.values()]
+    html = jinja2.Environment(autoescape=True).from_string(HTML_TEMPLATE).render(
+        tests=tests,
+        total=len(tests),
+        summary=run.summary(),
+        duration=sum(test["duration"] for test in tests)
+    )
+
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    output_path.write_text(html, encoding="utf-8")
+    return str(output_path)
+
+# Allure result statuses of the outcomes
+ALLURE_STATUS = {"passed": "passed", "failed": "failed", "error": "broken", "skipped": "skipped",
+                 "xfailed": "skipped", "xpassed": "failed"}
+
+def render_allure(run: RunResults, directory: Union[str, Path]) -> str:
+    """
+    Render Allure result files (for `allure generate` / `allure serve`)
+
+    Earlier results in the directory are replaced.
+
+    Args:
+        run: Run results
+        directory: Allure results directory
+
+    Returns:
+        Path of the results directory
+    """
+    output_dir = Path(directory)
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True)
+
+    for nodeid, test in run.tests.items():
+        phases = test["phases"]
+        starts = [p["start"] for p in phases.values() if p.get("start")]
+        stops = [p["stop"] for p in phases.values() if p.get("stop")]
+        module = nodeid.partition("::")[0]
+        labels = [{"name": name, "value": value} for name, value in test["labels"]]
+        labels += [{"name": "tag", "value": marker} for marker in test["markers"]
+                   if not marker.startswith(("allure_", "parametrize"))]
+        labels += [{"name": "suite", "value": module}, {"name": "framework", "value": "pytest"},
+                   {"name": "thread", "value": test.get("worker") or "main"}]
+
+        attachments = []
+        if test["requests"]:
+            attachments.append(_allure_attachment(output_dir, "Requests", test["requests"]))
+        for capture in test["captures"]:
+            attachments.append(_allure_attachment(
+                output_dir, capture.get("name", "API Request"),
+                {"request": capture.get("request"), "response": capture.get("response")}
+            ))
+
+        outcome = run.outcome(test)
+        message = run.message(test)
+        result = {
+            "uuid": str(uuid.uuid4()),
+            "historyId": hashlib.md5(nodeid.encode("utf-8")).hexdigest(),
+            "testCaseId": hashlib.md5(nodeid.split("[")[0].encode("utf-8")).hexdigest(),
+            "fullName": nodeid,
+            "name": test["title"] or test["name"],
+            "description": test["description"],
+            "status": ALLURE_STATUS.get(outcome, "unknown"),
+            "statusDetails": {"message": message.splitlines()[-1] if message else "", "trace": message},
+            "stage": "finished",
+            "start": int(min(starts) * 1000) if starts else None,
+            "stop": int(max(stops) * 1000) if stops else None,
+            "labels": labels,
+            "attachments": attachments
+        }
+        codec.dump(result, output_dir / f"{result['uuid']}-result.json")
+    return str(output_dir)
+
+def _allure_attachment(directory: Path, name: str, content: Any) -> Dict[str, str]:
+    source = f"{uuid.uuid4()}-attachment.json"
+    codec.dump(content, directory / source, indent=2)
+    return {"name": name, "source": source, "type": "application/json"}
+
+def _percentile(ordered: List[float], q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def render_metrics(run: RunResults, path: Union[str, Path]) -> str:
+    """
+    Render run metrics: per-endpoint request latency and errors, test durations and client counters
+
+    Args:
+        run: Run results
+        path: Output file
+
+    Returns:
+        Path of the metrics file
+    """
+    endpoints: Dict[str, Dict[str, Any]] = {}
+    for test in run.tests.values():
+        for request in test["requests"]:
+            stats = endpoints.setdefault(request.get("endpoint") or "unknown", {"elapsed": [], "errors": 0})
+            if request.get("elapsed") is not None:
+                stats["elapsed"].append(request["elapsed"])
+            if request.get("error") or (request.get("status") or 0) >= 500:
+                stats["errors"] += 1
+
+    latency = {}
+    for endpoint, stats in sorted(endpoints.items()):
+        ordered = sorted(stats["elapsed"])
+        latency[endpoint] = {
+            "count": len(ordered),
+            "errors": stats["errors"],
+            "p50": _percentile(ordered, 0.50),
+            "p95": _percentile(ordered, 0.95),
+            "p99": _percentile(ordered, 0.99),
+            "max": ordered[-1] if ordered else None
+        }
+
+    # Client counters of every worker, summed
+    counters: Dict[str, float] = {}
+    for snapshot in run.metrics:
+        for name, value in snapshot.get("snapshot", {}).get("counters", {}).items():
+            counters[name] = counters.get(name, 0) + value
+
+    durations = sorted(((run.duration(test), nodeid) for nodeid, test in run.tests.items()), reverse=True)
+    metrics = {
+        "summary": run.summary(),
+        "endpoints": latency,
+        "counters": counters,
+        "slowest_tests": [{"nodeid": nodeid, "duration": duration} for duration, nodeid in durations[:10]],
+        "workers": {snapshot.get("worker"): snapshot.get("snapshot") for snapshot in run.metrics}
+    }
+
+    output_path = Path(path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    codec.dump(metrics, output_path, indent=2, sort_keys=True)
+    return str(output_path)
+
+RENDERERS: Dict[str, Callable[[RunResults, Union[str, Path]], str]] = {
+    "junit": render_junit,
+    "html": render_html,
+    "allure": render_allure,
+    "metrics": render_metrics
+}
+
+def render_reports(event_dir: Union[str, Path], formats: List[str], output_dir: Union[str, Path] = "reports",
+                   jobs: Optional[int] = None) -> Dict[str, str]:
+    """
+    Render reports from the event log of a run, one process per format
+
+    Args:
+        event_dir: Directory holding the event log files
+        formats: Formats to render (see FORMATS), or ["all"]
+        output_dir: Root directory of the reports
+        jobs: Maximum parallel renderers (defaults to one per format)
+
+    Returns:
+        Mapping of format to written path
+
+    Raises:
+        ValueError: If a format is unknown
+    """
+    formats = list(FORMATS) if "all" in formats else formats
+    unknown = set(formats) - set(RENDERERS)
+    if unknown:
+        raise ValueError(f"Unknown report formats: {', '.join(sorted(unknown))} (choose from {', '.join(FORMATS)})")
+
+    started = time.perf_counter()
+    run = RunResults.load(event_dir)
+    paths = {}
+    if len(formats) == 1:
+        paths[formats[0]] = RENDERERS[formats[0]](run, Path(output_dir) / OUTPUT_PATHS[formats[0]])
+    else:
+        with ProcessPoolExecutor(max_workers=min(len(formats), jobs or len(formats), os.cpu_count() or 1)) as pool:
+            futures = {fmt: pool.submit(RENDERERS[fmt], run, Path(output_dir) / OUTPUT_PATHS[fmt]) for fmt in formats}
+            paths = {fmt: future.result() for fmt, future in futures.items()}
+
+    print(f"Rendered {', '.join(f'{fmt} -> {path}' for fmt, path in paths.items())} "
+          f"from {len(run.tests)} tests in {time.perf_counter() - started:.2f}s")
+    return paths
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Render test reports from the event log of a run")
+    parser.add_argument("--events", default="reports/events", help="Directory holding the event log files")
+    parser.add_argument("--formats", default="all",
+                        help=f"Comma-separated formats to render: {', '.join(FORMATS)} or all")
+    parser.add_argument("--output", default="reports", help="Root directory of the reports")
+    parser.add_argument("--jobs", type=int, default=None, help="Maximum parallel renderers")
+    args = parser.parse_args(argv)
+
+    try:
+        render_reports(args.events, [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()],
+                       args.output, args.jobs)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
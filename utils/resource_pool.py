@@ -0,0 +1,236 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterator, List, Optional, Set
+from .deadline import current_deadline
+
+class ResourcePoolError(Exception):
+    """A pool could not hand out a resource"""
+
+class Lease:
+    """Exclusive use of one pooled resource by one test"""
+
+    def __init__(self, resource: str, resource_id: Any, data: Dict[str, Any]):
+        self.resource = resource
+        self.id = resource_id
+        self.data = data
+        self.deleted = False
+
+    def mark_deleted(self):
+        """Record that the test deleted the resource, so it is replaced instead of recycled"""
+        self.deleted = True
+
+    def __repr__(self) -> str:
+        return f"Lease({self.resource}, id={self.id})"
+
+class ResourcePool:
+    """Pre-created resources of one kind, leased exclusively and recycled in the background"""
+
+    def __init__(self, resource: str, service, factory: Callable[[int], Dict[str, Any]],
+                 executor: ThreadPoolExecutor, recycle: str = "restore"):
+        """
+        Initialize resource pool
+
+        Args:
+            resource: Resource name (products, users, carts)
+            service: API service with create/update/delete methods
+            factory: Returns the creation payload for the n-th resource
+            executor: Executor running creation and recycling
+            recycle: "restore" puts the original data back after a lease,
+                     "replace" discards leased resources and creates new ones
+        """
+        self.resource = resource
+        self.service = service
+        self.factory = factory
+        self.executor = executor
+        self.recycle = recycle
+        self.available: "queue.Queue[Lease]" = queue.Queue()
+        self.created: List[Any] = []
+        self._created_ids: Set[Any] = set()
+        self.errors: List[str] = []
+        self._sequence = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def fill(self, count: int):
+        """Start creating count resources in the background"""
+        for _ in range(count):
+            self._submit(self._create_into_pool)
+
+    def _submit(self, task: Callable, *args):
+        with self._lock:
+            self._pending += 1
+        future = self.executor.submit(task, *args)
+        future.add_done_callback(self._task_done)
+
+    def _task_done(self, future):
+        error = future.exception()
+        # Errors are recorded before the task stops counting as pending, so acquire() reports them
+        if error is not None:
+            message = f"{self.resource} pool: {error}"
+            self.errors.append(message)
+            print(message)
+        with self._lock:
+            self._pending -= 1
+
+    def _next_payload(self) -> Dict[str, Any]:
+        with self._lock:
+            self._sequence += 1
+            sequence = self._sequence
+        return self.factory(sequence)
+
+    def create(self) -> Lease:
+        """
+        Create one resource synchronously
+
+        Raises:
+            requests.HTTPError: If the API rejects the creation
+            ValueError: If the response carries no id
+            ResourcePoolError: If the API returned the id of a resource the pool already holds
+        """
+        data = self._next_payload()
+        response = self.service.create(data)
+        response.raise_for_status()
+        resource_id = response.json().get("id")
+        if resource_id is None:
+            raise ValueError(f"Created {self.resource} response has no id")
+        with self._lock:
+            # APIs that do not persist creations (FakeStore) hand out the same id every time
+            if resource_id in self._created_ids:
+                raise ResourcePoolError(f"Created {self.resource} got id {resource_id} again; "
+                                        f"leases on it would not be exclusive")
+            self._created_ids.add(resource_id)
+            self.created.append(resource_id)
+        return Lease(self.resource, resource_id, data)
+
+    def _create_into_pool(self):
+        self.available.put(self.create())
+
+    def _recycle(self, lease: Lease):
+        if lease.deleted or self.recycle == "replace":
+            self._create_into_pool()
+            return
+        response = self.service.update(lease.id, lease.data)
+        response.raise_for_status()
+        self.available.put(Lease(self.resource, lease.id, lease.data))
+
+    def acquire(self, timeout: float = 30.0) -> Lease:
+        """
+        Take a resource out of the pool
+
+        Waits while background creations are pending and creates one
+        synchronously when the pool is empty and nothing is pending.
+
+        Args:
+            timeout: Seconds to wait for a pending creation
+
+        Returns:
+            Lease on the resource
+
+        Raises:
+            ResourcePoolError: If the synchronous creation fails after background
+                               creations failed too (their errors are included)
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self.available.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                pending = self._pending
+            if not pending or time.monotonic() >= deadline:
+                return self._create_now()
+            try:
+                return self.available.get(timeout=min(0.1, max(0.0, deadline - time.monotonic())))
+            except queue.Empty:
+                continue
+
+    def _create_now(self) -> Lease:
+        try:
+            return self.create()
+        except Exception as e:
+            with self._lock:
+                errors = list(self.errors)
+            if not errors:
+                raise
+            # The pool is empty because background creations failed; say why
+            raise ResourcePoolError(
+                f"{self.resource} pool is empty and creating one failed: {e}; "
+                f"{len(errors)} background errors, last: {'; '.join(errors[-3:])}"
+            ) from e
+
+    def release(self, lease: Lease):
+        """Return a lease; the resource is restored or replaced in the background"""
+        self._submit(self._recycle, lease)
+
+class ResourcePoolManager:
+    """Resource pools of one worker, created on first use"""
+
+    def __init__(self, client, factories: Dict[str, Callable[[int], Dict[str, Any]]],
+                 pool_config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize resource pool manager
+
+        Args:
+            client: APIClient
+            factories: Payload factory per resource name
+            pool_config: "resource_pool" configuration section
+        """
+        self.client = client
+        self.factories = factories
+        self.config = pool_config or {}
+        self.executor = ThreadPoolExecutor(max_workers=self.config.get("max_workers", 8),
+                                           thread_name_prefix="resource-pool")
+        self.pools: Dict[str, ResourcePool] = {}
+        self._lock = threading.Lock()
+
+    def pool(self, resource: str) -> ResourcePool:
+        """Pool of one resource"""
+        with self._lock:
+            if resource not in self.pools:
+                self.pools[resource] = ResourcePool(
+                    resource, getattr(self.client, resource), self.factories[resource],
+                    self.executor, self.config.get("recycle", "restore")
+                )
+            return self.pools[resource]
+
+    def warm(self, expected: Dict[str, int]):
+        """
+        Start filling pools ahead of the tests that will lease from them
+
+        Args:
+            expected: Number of tests expected to lease each resource
+        """
+        size = self.config.get("size", 5)
+        for resource, count in expected.items():
+            if count:
+                self.pool(resource).fill(min(size, count))
+
+    @contextmanager
+    def lease(self, resource: str) -> Iterator[Lease]:
+        """Lease a resource for the duration of the with block"""
+        pool = self.pool(resource)
+        timeout = self.config.get("acquire_timeout", 30)
+        deadline = current_deadline()
+        if deadline is not None:
+            timeout = deadline.cap(timeout)
+        lease = pool.acquire(timeout)
+        try:
+            yield lease
+        finally:
+            pool.release(lease)
+
+    def created_ids(self) -> Dict[str, List[Any]]:
+        """Ids of every resource created by the pools"""
+        return {resource: list(pool.created) for resource, pool in self.pools.items()}
+
+    def close(self):
+        """Wait for background work to finish"""
+        self.executor.shutdown(wait=True)
+        errors = sum(len(pool.errors) for pool in self.pools.values())
+        created = {resource: len(ids) for resource, ids in self.created_ids().items()}
+        if created:
+            print(f"Resource pools created {created} ({errors} background errors)")
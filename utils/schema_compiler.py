@@ -0,0 +1,323 @@
+import hashlib
+import importlib.util
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .json_codec import codec
+
+# Bump when the generated code changes so cached modules are regenerated
+COMPILER_VERSION = 1
+
+# Keywords that carry no validation semantics
+ANNOTATION_KEYWORDS = {"$schema", "$id", "$comment", "title", "description", "default", "examples"}
+
+SUPPORTED_KEYWORDS = ANNOTATION_KEYWORDS | {
+    "type", "enum", "const", "required", "properties", "additionalProperties", "items",
+    "minItems", "maxItems", "minimum", "maximum", "exclusiveMinimum", "exclusiveMaximum",
+    "minLength", "maxLength", "pattern", "format"
+}
+
+SUPPORTED_FORMATS = {"uri", "email"}
+
+# Python type tests for JSON Schema types; integers accept integral floats like jsonschema does
+TYPE_CHECKS = {
+    "object": "type({v}) is dict",
+    "array": "type({v}) is list",
+    "string": "type({v}) is str",
+    "boolean": "type({v}) is bool",
+    "null": "{v} is None",
+    "number": "(type({v}) is int or type({v}) is float)",
+    "integer": "(type({v}) is int or (type({v}) is float and {v}.is_integer()))",
+}
+
+# Validator signature: returns None when valid, else (message, path)
+CompiledValidator = Callable[[Any], Optional[Tuple[str, tuple]]]
+
+class UnsupportedSchemaError(Exception):
+    """Raised when a schema uses keywords the compiler does not handle"""
+
+class _CodeGenerator:
+    """Translates a schema into the source of a straight-line validate() function"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.constants: List[str] = []
+        self._counter = 0
+
+    def generate(self, schema: Dict[str, Any]) -> str:
+        self.lines = ["def validate(v0):"]
+        self._emit(schema, "v0", [], 1)
+        self.lines.append("    return None")
+
+        header = [
+            "# Generated by utils.schema_compiler - do not edit",
+            "import re",
+            "from urllib.parse import urlparse",
+            "",
+            "def _is_uri(value):",
+            "    parsed = urlparse(value)",
+            "    return bool(parsed.scheme) and bool(parsed.netloc or parsed.path)",
+            "",
+        ]
+        return "\n".join(header + self.constants + [""] + self.lines) + "\n"
+
+    def _name(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def _line(self, depth: int, text: str):
+        self.lines.append("    " * depth + text)
+
+    def _fail(self, depth: int, message_expr: str, path: List[str]):
+        path_expr = "(" + "".join(f"{p}, " for p in path) + ")"
+        self._line(depth, f"return ({message_expr}, {path_expr})")
+
+    def _emit(self, schema: Any, var: str, path: List[str], depth: int):
+        if schema is True or schema == {}:
+            return
+        if schema is False:
+            self._fail(depth, f"'False schema does not allow ' + repr({var})", path)
+            return
+        if not isinstance(schema, dict):
+            raise UnsupportedSchemaError(f"Invalid subschema: {schema!r}")
+
+        unsupported = set(schema) - SUPPORTED_KEYWORDS
+        if unsupported:
+            raise UnsupportedSchemaError(f"Unsupported keywords: {sorted(unsupported)}")
+
+        # With a single declared type, later keyword checks need no type guard
+        known = None
+        types = schema.get("type")
+        if types is not None:
+            types = [types] if isinstance(types, str) else list(types)
+            if any(t not in TYPE_CHECKS for t in types):
+                raise UnsupportedSchemaError(f"Unsupported type: {types}")
+            check = " or ".join(TYPE_CHECKS[t].format(v=var) for t in types)
+            self._line(depth, f"if not ({check}):")
+            expected = types[0] if len(types) == 1 else types
+            message = f" is not of type {expected!r}"
+            self._fail(depth + 1, f"repr({var}) + {message!r}", path)
+            if len(types) == 1:
+                known = types[0]
+
+        if "enum" in schema:
+            self._emit_enum(schema["enum"], var, path, depth)
+        if "const" in schema:
+            self._emit_enum([schema["const"]], var, path, depth)
+
+        self._emit_string(schema, var, path, depth, known)
+        self._emit_number(schema, var, path, depth, known)
+        self._emit_array(schema, var, path, depth, known)
+        self._emit_object(schema, var, path, depth, known)
+
+    def _emit_enum(self, values: List[Any], var: str, path: List[str], depth: int):
+        # Mixed or non-scalar enums need jsonschema's equality rules
+        if all(type(value) is str for value in values):
+            type_check = f"type({var}) is str"
+        elif all(type(value) is int for value in values):
+            type_check = f"type({var}) is int"
+        else:
+            raise UnsupportedSchemaError(f"Unsupported enum: {values!r}")
+
+        name = self._name("_ENUM")
+        self.constants.append(f"{name} = frozenset({sorted(values)!r})")
+        self._line(depth, f"if not ({type_check} and {var} in {name}):")
+        self._fail(depth + 1, f"repr({var}) + ' is not one of ' + repr(sorted({name}))", path)
+
+    def _emit_string(self, schema: Dict[str, Any], var: str, path: List[str], depth: int,
+                     known: Optional[str]):
+        checks = []
+        if "minLength" in schema:
+            checks.append((f"len({var}) < {schema['minLength']!r}", f"repr({var}) + ' is too short'"))
+        if "maxLength" in schema:
+            checks.append((f"len({var}) > {schema['maxLength']!r}", f"repr({var}) + ' is too long'"))
+        if "pattern" in schema:
+            name = self._name("_PATTERN")
+            self.constants.append(f"{name} = re.compile({schema['pattern']!r})")
+            checks.append((f"{name}.search({var}) is None",
+                           f"repr({var}) + ' does not match ' + {schema['pattern']!r}"))
+        if "format" in schema:
+            fmt = schema["format"]
+            if fmt not in SUPPORTED_FORMATS:
+                raise UnsupportedSchemaError(f"Unsupported format: {fmt}")
+            if fmt == "uri":
+                checks.append((f"not _is_uri({var})", f"repr({var}) + ' is not a \\'uri\\''"))
+            else:
+                checks.append((f"'@' not in {var}", f"repr({var}) + ' is not a \\'email\\''"))
+        self._emit_guarded(f"type({var}) is str", known == "string", checks, path, depth)
+
+    def _emit_number(self, schema: Dict[str, Any], var: str, path: List[str], depth: int,
+                     known: Optional[str]):
+        checks = []
+        if "minimum" in schema:
+            checks.append((f"{var} < {schema['minimum']!r}",
+                           f"repr({var}) + ' is less than the minimum of {schema['minimum']!r}'"))
+        if "maximum" in schema:
+            checks.append((f"{var} > {schema['maximum']!r}",
+                           f"repr({var}) + ' is greater than the maximum of {schema['maximum']!r}'"))
+        if "exclusiveMinimum" in schema:
+            checks.append((f"{var} <= {schema['exclusiveMinimum']!r}",
+                           f"repr({var}) + ' is less than or equal to the minimum of {schema['exclusiveMinimum']!r}'"))
+        if "exclusiveMaximum" in schema:
+            checks.append((f"{var} >= {schema['exclusiveMaximum']!r}",
+                           f"repr({var}) + ' is greater than or equal to the maximum of {schema['exclusiveMaximum']!r}'"))
+        self._emit_guarded(f"(type({var}) is int or type({var}) is float)",
+                           known in ("integer", "number"), checks, path, depth)
+
+    def _emit_array(self, schema: Dict[str, Any], var: str, path: List[str], depth: int,
+                    known: Optional[str]):
+        checks = []
+        if "minItems" in schema:
+            checks.append((f"len({var}) < {schema['minItems']!r}", f"repr({var}) + ' is too short'"))
+        if "maxItems" in schema:
+            checks.append((f"len({var}) > {schema['maxItems']!r}", f"repr({var}) + ' is too long'"))
+        items = schema.get("items")
+        if isinstance(items, list):
+            raise UnsupportedSchemaError("Tuple-form items are not supported")
+        if not checks and items in (None, True, {}):
+            return
+
+        if known != "array":
+            self._line(depth, f"if type({var}) is list:")
+            depth += 1
+        for condition, message in checks:
+            self._line(depth, f"if {condition}:")
+            self._fail(depth + 1, message, path)
+        if items not in (None, True, {}):
+            index = self._name("i")
+            item = self._name("v")
+            self._line(depth, f"for {index}, {item} in enumerate({var}):")
+            self._emit(items, item, path + [index], depth + 1)
+
+    def _emit_object(self, schema: Dict[str, Any], var: str, path: List[str], depth: int,
+                     known: Optional[str]):
+        required = schema.get("required", [])
+        properties = schema.get("properties", {})
+        additional = schema.get("additionalProperties", True)
+        if additional not in (True, False):
+            raise UnsupportedSchemaError("Schema-valued additionalProperties is not supported")
+        if not required and not properties and additional is True:
+            return
+
+        if known != "object":
+            self._line(depth, f"if type({var}) is dict:")
+            depth += 1
+        for prop in required:
+            self._line(depth, f"if {prop!r} not in {var}:")
+            self._fail(depth + 1, repr(f"{prop!r} is a required property"), path)
+        if additional is False:
+            name = self._name("_ALLOWED")
+            key = self._name("k")
+            self.constants.append(f"{name} = frozenset({sorted(properties)!r})")
+            self._line(depth, f"for {key} in {var}:")
+            self._line(depth + 1, f"if {key} not in {name}:")
+            self._fail(depth + 2, f"'Additional properties are not allowed (' + repr({key}) + ' was unexpected)'", path)
+        for prop, subschema in properties.items():
+            if subschema in (True, {}):
+                continue
+            child = self._name("v")
+            # Required properties are known to be present at this point
+            if prop in required:
+                self._line(depth, f"{child} = {var}[{prop!r}]")
+                self._emit(subschema, child, path + [repr(prop)], depth)
+            else:
+                self._line(depth, f"if {prop!r} in {var}:")
+                self._line(depth + 1, f"{child} = {var}[{prop!r}]")
+                self._emit(subschema, child, path + [repr(prop)], depth + 1)
+
+    def _emit_guarded(self, guard: str, type_known: bool, checks: List[Tuple[str, str]],
+                      path: List[str], depth: int):
+        """Emit keyword checks that only apply to values of one JSON type"""
+        if not checks:
+            return
+        if not type_known:
+            self._line(depth, f"if {guard}:")
+            depth += 1
+        for condition, message in checks:
+            self._line(depth, f"if {condition}:")
+            self._fail(depth + 1, message, path)
+
+class SchemaCompiler:
+    """Compiles JSON schemas into cached Python validator modules"""
+
+    def __init__(self, build_dir: str = "build/compiled_schemas"):
+        """
+        Initialize schema compiler
+
+        Args:
+            build_dir: Directory holding the generated modules
+        """
+        self.build_dir = Path(build_dir)
+        self._validators: Dict[str, Optional[CompiledValidator]] = {}
+
+    @staticmethod
+    def schema_hash(schema: Dict[str, Any]) -> str:
+        """Stable hash of a schema and the compiler version"""
+        canonical = codec.dumps_bytes(schema, sort_keys=True)
+        return hashlib.sha256(canonical + f":{COMPILER_VERSION}".encode("utf-8")).hexdigest()
+
+    def get_validator(self, schema_name: str, schema: Dict[str, Any]) -> Optional[CompiledValidator]:
+        """
+        Get compiled validator for a schema, generating its module if needed
+
+        Args:
+            schema_name: Schema name (used in the module file name)
+            schema: Schema document
+
+        Returns:
+            validate(instance) function, or None if the schema cannot be compiled
+        """
+        digest = self.schema_hash(schema)
+        if digest in self._validators:
+            return self._validators[digest]
+
+        module_path = self.build_dir / f"{schema_name}_{digest[:16]}.py"
+        if not module_path.exists() and not self._generate_module(schema_name, schema, module_path):
+            self._validators[digest] = None
+            return None
+
+        try:
+            module = self._load_module(module_path)
+        except FileNotFoundError:
+            # Removed by another worker between the existence check and the load
+            self._generate_module(schema_name, schema, module_path)
+            module = self._load_module(module_path)
+        validator = module.validate
+        self._validators[digest] = validator
+        return validator
+
+    def _generate_module(self, schema_name: str, schema: Dict[str, Any], module_path: Path) -> bool:
+        """Generate and write the module of a schema, False if it cannot be compiled"""
+        try:
+            source = _CodeGenerator().generate(schema)
+        except UnsupportedSchemaError as e:
+            print(f"Schema {schema_name} cannot be compiled, using jsonschema: {e}")
+            return False
+        self._write_module(schema_name, module_path, source)
+        return True
+
+    def _write_module(self, schema_name: str, module_path: Path, source: str):
+        """Atomically write a generated module, removing stale ones for the schema"""
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+        # Only <name>_<16 hex digits>.py, not modules of other schemas sharing the prefix
+        own_module = re.compile(re.escape(schema_name) + r"_[0-9a-f]{16}\.py")
+        for stale in self.build_dir.glob(f"{schema_name}_*.py"):
+            if stale != module_path and own_module.fullmatch(stale.name):
+                stale.unlink(missing_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.build_dir, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(source)
+        os.replace(tmp_path, module_path)
+        print(f"Compiled schema {schema_name} -> {module_path}")
+
+    @staticmethod
+    def _load_module(module_path: Path):
+        spec = importlib.util.spec_from_file_location(f"compiled_schemas.{module_path.stem}", module_path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Cannot load compiled schema module {module_path}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
@@ -0,0 +1,529 @@
+import argparse
+import bisect
+import math
+import os
+import random
+import re
+import signal
+import time
+from pathlib import Path
+from typing import Dict, Any, Callable, List, Optional, Tuple, Union
+import requests
+from .circuit_breaker import CircuitOpenError
+from .json_codec import codec
+
+MB = 1024 * 1024
+
+# Log-spaced latency bucket bounds, 0.1 ms to ~2 min, 10% apart
+LATENCY_BOUNDS = [0.0001 * 1.1 ** i for i in range(int(math.log(1200000) / math.log(1.1)) + 2)]
+
+# Distinct product payloads the churn step cycles through; memoized payloads stay bounded over hours
+CHURN_PAYLOADS = 64
+
+# One scenario step: (name, fn(client, rng) -> response)
+ScenarioStep = Tuple[str, Callable[[Any, random.Random], requests.Response]]
+
+def parse_duration(value: Union[str, float]) -> float:
+    """
+    Parse a duration such as "90", "45s", "30m" or "4h" into seconds
+
+    Raises:
+        ValueError: If the duration is malformed
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smh]?)\s*", str(value))
+    if not match:
+        raise ValueError(f"Invalid duration: {value!r} (expected e.g. 90, 45s, 30m or 4h)")
+    return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process (Linux), or None where unavailable"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+class LatencyHistogram:
+    """Fixed-size latency histogram; percentiles are accurate to the 10% bucket width"""
+
+    __slots__ = ("counts", "count", "errors", "rejected", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BOUNDS) + 1)
+        self.count = 0
+        self.errors = 0
+        # Calls refused by an open circuit: no request was made, so they carry no latency
+        self.rejected = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float, error: bool = False):
+        self.counts[bisect.bisect_left(LATENCY_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.errors += error
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile"""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1) + 1
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(LATENCY_BOUNDS[index], self.max) if index < len(LATENCY_BOUNDS) else self.max
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": self.errors / self.count if self.count else 0.0,
+            "rejected": self.rejected,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.percentile(0.50),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max if self.count else None
+        }
+
+class RollingWindow:
+    """Consecutive fixed-length windows; only the open window's histograms are held"""
+
+    def __init__(self, window_seconds: float, index: int = 0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize rolling window
+
+        Args:
+            window_seconds: Length of each window
+            index: Number of the first window (continues after a resume)
+            clock: Monotonic clock
+        """
+        self.window_seconds = window_seconds
+        self.index = index
+        self.clock = clock
+        self.started = clock()
+        self.series: Dict[str, LatencyHistogram] = {}
+
+    def record(self, series: str, seconds: float, error: bool = False):
+        """Record one call in a series of the open window"""
+        self._histogram(series).add(seconds, error)
+
+    def reject(self, series: str):
+        """Count one call of a series that was rejected without a request"""
+        self._histogram(series).rejected += 1
+
+    def _histogram(self, series: str) -> LatencyHistogram:
+        histogram = self.series.get(series)
+        if histogram is None:
+            histogram = self.series[series] = LatencyHistogram()
+        return histogram
+
+    def due(self) -> bool:
+        return self.clock() - self.started >= self.window_seconds
+
+    def close(self) -> Dict[str, Any]:
+        """
+        Summarize the open window and start the next one
+
+        Returns:
+            Window summary with per-series latency statistics and the client's RSS
+        """
+        rss = rss_bytes()
+        summary = {
+            "window": self.index,
+            "ended_at": time.time(),
+            "seconds": self.clock() - self.started,
+            "series": {name: histogram.summary() for name, histogram in sorted(self.series.items())},
+            "rss_mb": rss / MB if rss is not None else None
+        }
+        self.index += 1
+        self.started = self.clock()
+        self.series = {}
+        return summary
+
+class PageHinkley:
+    """Page-Hinkley test for a sustained upward drift of the mean, relative to a learned baseline"""
+
+    def __init__(self, delta: float = 0.05, threshold: float = 1.0, warmup: int = 5):
+        """
+        Initialize Page-Hinkley test
+
+        Args:
+            delta: Tolerated relative increase per sample (0.05 = 5% above the running mean)
+            threshold: Cumulative relative excess that signals drift
+            warmup: Samples averaged into the baseline before testing
+        """
+        self.delta = delta
+        self.threshold = threshold
+        self.warmup = warmup
+        self.baseline: Optional[float] = None
+        self.samples = 0
+        self.mean = 0.0
+        self.cumulative = 0.0
+        self.minimum = 0.0
+
+    def update(self, value: float) -> bool:
+        """
+        Add a sample
+
+        Returns:
+            True if drift is detected (the test then restarts from the current level)
+        """
+        self.samples += 1
+        if self.baseline is None:
+            self.mean += (value - self.mean) / self.samples
+            if self.samples == self.warmup:
+                self.baseline = max(self.mean, 1e-9)
+                self.samples, self.mean = 0, 0.0
+            return False
+
+        x = value / self.baseline
+        self.mean += (x - self.mean) / self.samples
+        self.cumulative += x - self.mean - self.delta
+        self.minimum = min(self.minimum, self.cumulative)
+        if self.cumulative - self.minimum > self.threshold:
+            self.samples, self.mean, self.cumulative, self.minimum = 0, 0.0, 0.0, 0.0
+            self.baseline = max(value, 1e-9)
+            return True
+        return False
+
+class Cusum:
+    """One-sided CUSUM for an upward shift, standardized by a learned baseline mean and deviation"""
+
+    def __init__(self, k: float = 0.5, h: float = 8.0, warmup: int = 5, min_sigma_ratio: float = 0.1):
+        """
+        Initialize CUSUM test
+
+        Args:
+            k: Allowance in baseline standard deviations
+            h: Decision threshold in baseline standard deviations
+            warmup: Samples used to learn the baseline
+            min_sigma_ratio: Floor of the deviation as a share of the mean (quiet baselines)
+        """
+        self.k = k
+        self.h = h
+        self.warmup = warmup
+        self.min_sigma_ratio = min_sigma_ratio
+        self.baseline: List[float] = []
+        self.mu: Optional[float] = None
+        self.sigma: Optional[float] = None
+        self.statistic = 0.0
+
+    def update(self, value: float) -> bool:
+        """
+        Add a sample
+
+        Returns:
+            True if a shift is detected (the baseline is then relearned)
+        """
+        # Learned together at the end of the warmup
+        mu, sigma = self.mu, self.sigma
+        if mu is None or sigma is None:
+            self.baseline.append(value)
+            if len(self.baseline) == self.warmup:
+                self.mu = sum(self.baseline) / len(self.baseline)
+                variance = sum((v - self.mu) ** 2 for v in self.baseline) / max(len(self.baseline) - 1, 1)
+                self.sigma = max(math.sqrt(variance), abs(self.mu) * self.min_sigma_ratio, 1e-9)
+                self.baseline = []
+            return False
+
+        self.statistic = max(0.0, self.statistic + (value - mu) / sigma - self.k)
+        if self.statistic > self.h:
+            self.mu, self.sigma, self.statistic = None, None, 0.0
+            return True
+        return False
+
+class DriftMonitor:
+    """Page-Hinkley and CUSUM tests over the metrics of each closed window"""
+
+    def __init__(self, soak_config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize drift monitor
+
+        Args:
+            soak_config: "soak" configuration section
+        """
+        self.config = soak_config or {}
+        self.detectors: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def metrics(summary: Dict[str, Any]) -> Dict[str, float]:
+        """Monitored values of a window: p95 of every series, overall mean latency and client RSS"""
+        values = {f"{name}.p95": stats["p95"] for name, stats in summary["series"].items() if stats["p95"] is not None}
+        overall = summary["series"].get("all", {})
+        if overall.get("mean") is not None:
+            values["all.mean"] = overall["mean"]
+        if summary.get("rss_mb") is not None:
+            values["client.rss_mb"] = summary["rss_mb"]
+        return values
+
+    def _detectors(self, metric: str) -> Dict[str, Any]:
+        if metric not in self.detectors:
+            warmup = self.config.get("warmup_windows", 5)
+            self.detectors[metric] = {
+                "page_hinkley": PageHinkley(warmup=warmup, **self.config.get("page_hinkley", {})),
+                "cusum": Cusum(warmup=warmup, **self.config.get("cusum", {}))
+            }
+        return self.detectors[metric]
+
+    def update(self, summary: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Feed a closed window to the tests
+
+        Returns:
+            Drift alerts raised by this window
+        """
+        alerts = []
+        for metric, value in self.metrics(summary).items():
+            for name, detector in self._detectors(metric).items():
+                baseline = detector.baseline if name == "page_hinkley" else detector.mu
+                if detector.update(value):
+                    alerts.append({"window": summary["window"], "metric": metric, "detector": name,
+                                   "value": value, "baseline": baseline})
+        return alerts
+
+    def state(self) -> Dict[str, Any]:
+        return {metric: {name: vars(detector) for name, detector in detectors.items()}
+                for metric, detectors in self.detectors.items()}
+
+    def restore(self, state: Dict[str, Any]):
+        for metric, detectors in state.items():
+            for name, fields in detectors.items():
+                vars(self._detectors(metric)[name]).update(fields)
+
+def default_scenario(data_generator=None) -> List[ScenarioStep]:
+    """
+    Scenario mixing reads of every resource with product create/delete churn
+
+    Args:
+        data_generator: SeededDataGenerator for created products (defaults to a new one)
+    """
+    if data_generator is None:
+        from .data_generator import SeededDataGenerator
+        data_generator = SeededDataGenerator()
+
+    def churn(client, rng: random.Random) -> requests.Response:
+        created = client.products.create(data_generator.product_data(f"soak/{rng.randrange(CHURN_PAYLOADS)}"))
+        if created.status_code >= 400:
+            return created
+        return client.products.delete(created.json()["id"])
+
+    return [
+        ("products.list", lambda client, rng: client.products.get_all(limit=5)),
+        ("products.get", lambda client, rng: client.products.get_by_id(rng.randint(1, 20))),
+        ("products.categories", lambda client, rng: client.products.get_categories()),
+        ("users.get", lambda client, rng: client.users.get_by_id(rng.randint(1, 10))),
+        ("carts.user", lambda client, rng: client.carts.get_user_carts(rng.randint(1, 5))),
+        ("products.churn", churn)
+    ]
+
+class SoakRunner:
+    """Loops a scenario for hours, checkpointing rolling-window statistics and drift alerts to disk"""
+
+    def __init__(self, client, scenario: Optional[List[ScenarioStep]] = None,
+                 soak_config: Optional[Dict[str, Any]] = None, output_dir: Union[str, Path, None] = None,
+                 seed: int = 0):
+        """
+        Initialize soak runner
+
+        Args:
+            client: APIClient used by the scenario
+            scenario: Steps run in order on every iteration (defaults to default_scenario())
+            soak_config: "soak" configuration section
+            output_dir: Directory receiving windows.jsonl, state.json and soak_report.json
+            seed: Seed of the scenario's random choices
+        """
+        self.client = client
+        self.scenario = scenario or default_scenario()
+        self.config = soak_config or {}
+        self.output_dir = Path(output_dir or self.config.get("output_dir", "reports/soak"))
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.windows_path = self.output_dir / "windows.jsonl"
+        self.state_path = self.output_dir / "state.json"
+        self.rng = random.Random(seed)
+        self.think_time = self.config.get("think_time_ms", 0) / 1000
+        self.window = RollingWindow(self.config.get("window_seconds", 60))
+        self.monitor = DriftMonitor(self.config)
+        self.alerts: List[Dict[str, Any]] = []
+        self.iterations = 0
+        self.elapsed = 0.0
+        self._stop = False
+
+    def stop(self, *_):
+        """Finish the current iteration, checkpoint and return (also bound to SIGTERM/SIGINT)"""
+        self._stop = True
+
+    def resume(self) -> bool:
+        """
+        Continue from the last checkpoint of an interrupted run
+
+        Returns:
+            True if a checkpoint was found
+        """
+        if not self.state_path.exists():
+            return False
+        state = codec.load(self.state_path)
+        self.window = RollingWindow(self.window.window_seconds, index=state["next_window"])
+        self.monitor.restore(state["detectors"])
+        self.alerts = state["alerts"]
+        self.iterations = state["iterations"]
+        self.elapsed = state["elapsed"]
+        self.rng.setstate(_rng_state(state["rng"]))
+        print(f"Resuming soak run at window {self.window.index} after {self.elapsed:.0f}s")
+        return True
+
+    def run(self, duration: float) -> Dict[str, Any]:
+        """
+        Run the scenario until the total soak time reaches duration (or stop() is called)
+
+        Args:
+            duration: Total seconds of soaking, including time before a resume
+
+        Returns:
+            Soak report
+        """
+        if self.window.index == 0:
+            # A fresh run starts a fresh checkpoint
+            self.windows_path.unlink(missing_ok=True)
+        started = time.monotonic() - self.elapsed
+
+        while not self._stop and time.monotonic() - started < duration:
+            for name, step in self.scenario:
+                self._call(name, step)
+            self.iterations += 1
+            if self.window.due():
+                self._checkpoint(self.window.close(), time.monotonic() - started)
+            if self.think_time:
+                time.sleep(self.think_time)
+
+        elapsed = time.monotonic() - started
+        if self.window.series:
+            self._checkpoint(self.window.close(), elapsed)
+        else:
+            # Nothing was recorded since the last checkpoint, which may predate the end of the run
+            self.elapsed = elapsed
+        return self.report()
+
+    def _call(self, name: str, step: Callable[[Any, random.Random], requests.Response]):
+        call_started = time.perf_counter()
+        try:
+            error = step(self.client, self.rng).status_code >= 400
+        except CircuitOpenError:
+            # Rejected in microseconds without a request; as a sample it would hide the outage
+            self.window.reject(name)
+            self.window.reject("all")
+            return
+        except requests.exceptions.RequestException:
+            error = True
+        elapsed = time.perf_counter() - call_started
+        self.window.record(name, elapsed, error)
+        self.window.record("all", elapsed, error)
+
+    def _checkpoint(self, summary: Dict[str, Any], elapsed: float):
+        """Append the window and its alerts durably, then replace the resumable state atomically"""
+        alerts = self.monitor.update(summary)
+        for alert in alerts:
+            print(f"Drift detected by {alert['detector']} in {alert['metric']} at window {alert['window']}: "
+                  f"{alert['value']:.4g} vs baseline {alert['baseline']:.4g}")
+        self.alerts.extend(alerts)
+        self.elapsed = elapsed
+
+        with open(self.windows_path, "ab") as f:
+            f.write(codec.dumps_bytes({**summary, "alerts": alerts}) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        state = {
+            "next_window": self.window.index,
+            "iterations": self.iterations,
+            "elapsed": elapsed,
+            "alerts": self.alerts,
+            "detectors": self.monitor.state(),
+            "rng": self.rng.getstate()
+        }
+        temporary = self.state_path.with_suffix(".tmp")
+        codec.dump(state, temporary)
+        os.replace(temporary, self.state_path)
+
+    def report(self) -> Dict[str, Any]:
+        """Summary of the run, also written to soak_report.json"""
+        report = {
+            "windows": self.window.index,
+            "iterations": self.iterations,
+            "elapsed_seconds": self.elapsed,
+            "drift_detected": bool(self.alerts),
+            "alerts": self.alerts,
+            "checkpoint": str(self.windows_path)
+        }
+        codec.dump(report, self.output_dir / "soak_report.json", indent=2)
+        return report
+
+def soak_client_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Client configuration for soaking: no circuit breakers and no hedging
+
+    An open circuit would answer for the target and a hedge would hide its stragglers,
+    while the soak is there to measure both.
+
+    Args:
+        config: Test configuration
+
+    Returns:
+        Copy of config with circuit breakers and hedging disabled
+    """
+    client_config = {**config.get("client", {}), "hedging": {"enabled": False}}
+    return {**config, "circuit_breaker": {**config.get("circuit_breaker", {}), "enabled": False},
+            "client": client_config}
+
+def _rng_state(state: List[Any]) -> Tuple[Any, ...]:
+    # random.Random state round-tripped through JSON (tuples become lists)
+    version, internal, gauss = state
+    return version, tuple(internal), gauss
+
+def main():
+    parser = argparse.ArgumentParser(description="Loop an API scenario for hours and detect latency and memory drift")
+    parser.add_argument("--duration", default=None, help="Total soak time, e.g. 90s, 30m or 4h")
+    parser.add_argument("--window", type=float, default=None, help="Seconds per statistics window")
+    parser.add_argument("--output", default=None, help="Directory receiving checkpoints and the report")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the scenario's random choices")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted run from its checkpoint")
+    parser.add_argument("--stub", action="store_true", help="Soak a local FakeStore API stub instead of the target")
+    args = parser.parse_args()
+
+    from config import get_config
+    from .api_client import APIClient
+    from .stub_server import StubServer
+
+    config = get_config()
+    soak_config = dict(config.get("soak", {}))
+    if args.window is not None:
+        soak_config["window_seconds"] = args.window
+    duration = parse_duration(args.duration or soak_config.get("duration", "1h"))
+
+    server = StubServer().start() if args.stub else None
+    if server is not None:
+        config["base_url"] = server.url
+    client = APIClient(soak_client_config(config))
+    runner = SoakRunner(client, soak_config=soak_config, output_dir=args.output, seed=args.seed)
+    signal.signal(signal.SIGTERM, runner.stop)
+    signal.signal(signal.SIGINT, runner.stop)
+    if args.resume:
+        runner.resume()
+
+    print(f"Soaking {config['base_url']} for {duration:.0f}s in {runner.window.window_seconds:g}s windows")
+    try:
+        report = runner.run(duration)
+    finally:
+        client.close()
+        if server is not None:
+            server.stop()
+
+    print(f"Soak finished: {report['windows']} windows, {report['iterations']} iterations, "
+          f"{len(report['alerts'])} drift alerts; report in {runner.output_dir / 'soak_report.json'}")
+    raise SystemExit(1 if report["drift_detected"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import hashlib
+import mmap
+import os
+import tempfile
+import time
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple
+import requests
+from urllib3.exceptions import DecodeError, ProtocolError, ReadTimeoutError, SSLError
+from .compression import ContentDecoder, DECODE_ERRORS
+from .deadline import current_deadline
+from .transport import APIResponse
+
+class ResponseTooLargeError(requests.exceptions.RequestException):
+    """Raised when a response body exceeds the configured hard size cap"""
+
+class SpooledBody:
+    """Response body spooled to a temporary file"""
+
+    def __init__(self, path: str, size: int, sha256: str):
+        """
+        Initialize spooled body
+
+        Args:
+            path: Temporary file holding the body
+            size: Body size in bytes
+            sha256: Hex digest of the body
+        """
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        # Remove the file once the body is no longer referenced
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+
+    @contextmanager
+    def open_mmap(self) -> Iterator[mmap.mmap]:
+        """
+        Memory-map the spooled body read-only
+
+        Yields:
+            mmap object over the body
+        """
+        with open(self.path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def read_bytes(self) -> bytes:
+        """Load the whole body into memory"""
+        return Path(self.path).read_bytes()
+
+    def cleanup(self):
+        """Delete the spooled file"""
+        self._finalizer()
+
+def _remove_file(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+class BodyStreamer:
+    """Reads response bodies incrementally, spooling large ones to disk"""
+
+    def __init__(self, streaming_config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize body streamer
+
+        Args:
+            streaming_config: "streaming" section of the client configuration
+        """
+        streaming_config = streaming_config or {}
+        self.spool_threshold = streaming_config.get("spool_threshold_bytes", 1024 * 1024)
+        self.max_body_bytes = streaming_config.get("max_body_bytes", 256 * 1024 * 1024)
+        self.chunk_size = streaming_config.get("chunk_size", 64 * 1024)
+        self.spool_dir = streaming_config.get("spool_dir")
+
+        if self.spool_dir:
+            Path(self.spool_dir).mkdir(parents=True, exist_ok=True)
+
+    def consume(self, response: APIResponse, spool: bool = False,
+                max_body_bytes: Optional[int] = None):
+        """
+        Read a streamed response body, enforcing the size cap
+
+        Bodies up to the spool threshold (or all bodies when spool is False) are kept
+        in memory as response.content; larger ones are written to a temporary file
+        and exposed as response.spooled_body. The body is read undecoded so that
+        response.wire_size reports the bytes actually transferred, and the cap applies
+        to the decoded size.
+
+        Args:
+            response: Response obtained with stream=True
+            spool: Whether bodies above the threshold may be spooled to disk
+            max_body_bytes: Hard size cap overriding the configured one
+
+        Raises:
+            ResponseTooLargeError: If the body exceeds the size cap
+            DeadlineExceeded: If the current deadline passes while the body is read
+        """
+        limit = max_body_bytes or self.max_body_bytes
+
+        declared = response.headers.get("content-length")
+        if declared and declared.isdigit() and int(declared) > limit:
+            response.close()
+            raise ResponseTooLargeError(
+                f"Declared body size {declared} exceeds limit {limit} bytes: {response.url}",
+                response=response
+            )
+
+        hasher = hashlib.sha256()
+        buffer = bytearray()
+        spool_file = None
+        size = 0
+        wire_size = 0
+        started = time.perf_counter()
+        # Socket timeouts bound each read, the deadline bounds a slowly trickling body as a whole
+        deadline = current_deadline()
+
+        try:
+            for wire_chunk, chunk in self._iter_body(response):
+                if deadline is not None:
+                    deadline.check(f"the body of {response.url} was read")
+                wire_size += wire_chunk
+                size += len(chunk)
+                if size > limit:
+                    raise ResponseTooLargeError(
+                        f"Body exceeds limit of {limit} bytes: {response.url}", response=response
+                    )
+
+                hasher.update(chunk)
+                if spool_file is not None:
+                    spool_file.write(chunk)
+                    continue
+
+                buffer += chunk
+                if spool and len(buffer) > self.spool_threshold:
+                    spool_file = tempfile.NamedTemporaryFile(
+                        prefix="body-", suffix=".bin", dir=self.spool_dir, delete=False
+                    )
+                    spool_file.write(buffer)
+                    buffer = bytearray()
+        except BaseException:
+            response.close()
+            if spool_file is not None:
+                spool_file.close()
+                _remove_file(spool_file.name)
+            raise
+
+        response.body_size = size
+        response.wire_size = wire_size
+        timings = response.timings
+        if timings is not None:
+            timings["download"] = time.perf_counter() - started
+        response.body_sha256 = hasher.hexdigest()
+        response._content_consumed = True
+
+        if spool_file is not None:
+            spool_file.close()
+            response._content = None
+            response.spooled_body = SpooledBody(spool_file.name, size, hasher.hexdigest())
+        else:
+            response._content = bytes(buffer)
+
+    def _iter_body(self, response: requests.Response) -> Iterator[Tuple[int, bytes]]:
+        """
+        Iterate over the body as (wire bytes, decoded chunk) pairs
+
+        Falls back to requests' own decoding (counting decoded bytes as wire bytes)
+        when the raw stream is not available or the encoding is not supported here.
+        """
+        content_encoding = response.headers.get("content-encoding", "").strip()
+        unsupported = False
+        try:
+            decoder = ContentDecoder(content_encoding) if content_encoding else None
+        except ValueError:
+            decoder = None
+            unsupported = True
+
+        if unsupported or not hasattr(response.raw, "stream"):
+            for chunk in response.iter_content(self.chunk_size):
+                yield len(chunk), chunk
+            return
+
+        # Same exception translation as requests.Response.iter_content
+        try:
+            for raw_chunk in response.raw.stream(self.chunk_size, decode_content=False):
+                if decoder is None:
+                    yield len(raw_chunk), raw_chunk
+                    continue
+                # Decoded in bounded pieces so the size cap applies before a compression bomb inflates
+                wire_chunk = len(raw_chunk)
+                for chunk in decoder.decompress(raw_chunk, self.chunk_size):
+                    yield wire_chunk, chunk
+                    wire_chunk = 0
+                if wire_chunk:
+                    yield wire_chunk, b""
+            if decoder is not None:
+                for chunk in decoder.flush(self.chunk_size):
+                    yield 0, chunk
+        except ProtocolError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        except (DecodeError,) + DECODE_ERRORS as e:
+            raise requests.exceptions.ContentDecodingError(e)
+        except ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except SSLError as e:
+            raise requests.exceptions.SSLError(e)
@@ -0,0 +1,267 @@
+import argparse
+import os
+import random
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from .json_codec import codec
+
+CATEGORIES = ["electronics", "jewelery", "men's clothing", "women's clothing"]
+
+def build_catalog(seed: int = 0, products: int = 20, users: int = 10, carts: int = 7) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate FakeStore-shaped collections
+
+    Args:
+        seed: Random seed, so every stub serves the same data
+        products: Number of products
+        users: Number of users
+        carts: Number of carts
+
+    Returns:
+        Dict with products, users and carts lists
+    """
+    rng = random.Random(seed)
+    catalog = {
+        "products": [{
+            "id": i,
+            "title": f"Stub product {i}",
+            "price": round(rng.uniform(1, 1000), 2),
+            "description": f"Description of stub product {i}",
+            "category": CATEGORIES[i % len(CATEGORIES)],
+            "image": f"https://stub.local/img/{i}.jpg",
+            "rating": {"rate": round(rng.uniform(1, 5), 1), "count": rng.randint(0, 500)}
+        } for i in range(1, products + 1)],
+        "users": [{
+            "id": i,
+            "email": f"user{i}@stub.local",
+            "username": f"user{i}",
+            "password": f"password{i}",
+            "name": {"firstname": f"First{i}", "lastname": f"Last{i}"},
+            "address": {
+                "city": "Stubville",
+                "street": f"{i} Main Street",
+                "number": rng.randint(1, 9999),
+                "zipcode": f"{rng.randint(10000, 99999)}-{rng.randint(1000, 9999)}",
+                "geolocation": {"lat": f"{rng.uniform(-90, 90):.4f}", "long": f"{rng.uniform(-180, 180):.4f}"}
+            },
+            "phone": f"1-570-236-{i:04d}",
+            "__v": 0
+        } for i in range(1, users + 1)],
+        "carts": []
+    }
+    start = datetime(2020, 1, 1)
+    for i in range(1, carts + 1):
+        product_ids = rng.sample(range(1, products + 1), k=min(3, products))
+        catalog["carts"].append({
+            "id": i,
+            "userId": rng.randint(1, users),
+            "date": (start + timedelta(days=rng.randint(0, 90))).strftime("%Y-%m-%dT00:00:00.000Z"),
+            "products": [{"productId": pid, "quantity": rng.randint(1, 10)} for pid in product_ids],
+            "__v": 0
+        })
+    return catalog
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """FakeStore API lookalike over an in-memory catalog"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle on, the body waits for the client's delayed ACK
+    disable_nagle_algorithm = True
+    server: "StubServer"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: Any):
+        payload = codec.dumps_bytes(body)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(payload)
+
+    def _body(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = codec.loads(raw) if raw else {}
+        except ValueError:
+            body = {}
+        return body if isinstance(body, dict) else {}
+
+    def _route(self) -> Tuple[str, List[str], Dict[str, str]]:
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        return parts.path, [p for p in parts.path.split("/") if p], query
+
+    def do_GET(self):
+        path, segments, query = self._route()
+        catalog = self.server.catalog
+        if not segments or segments[0] not in catalog:
+            return self._reply(404, {"error": f"Cannot GET {path}"})
+
+        resource = segments[0]
+        records = catalog[resource]
+        if len(segments) == 2 and segments[1] == "categories" and resource == "products":
+            return self._reply(200, list(CATEGORIES))
+        if len(segments) == 3 and segments[1] == "category" and resource == "products":
+            return self._reply(200, [p for p in records if p["category"] == segments[2]])
+        if len(segments) == 3 and segments[1] == "user" and resource == "carts":
+            return self._reply(200, [c for c in records if str(c["userId"]) == segments[2]])
+        if len(segments) == 2:
+            record = self.server.find(resource, segments[1])
+            if record is None:
+                return self._reply(404, {"error": f"{resource[:-1]} {segments[1]} not found"})
+            return self._reply(200, record)
+
+        if resource == "carts" and "startdate" in query and "enddate" in query:
+            records = [c for c in records if query["startdate"] <= c["date"][:10] <= query["enddate"]]
+        if query.get("sort") == "desc":
+            records = list(reversed(records))
+        if "limit" in query:
+            records = records[:int(query["limit"])]
+        return self._reply(200, records)
+
+    do_HEAD = do_GET
+
+    def do_POST(self):
+        path, segments, _ = self._route()
+        body = self._body()
+        if segments == ["auth", "login"]:
+            if body.get("username") and body.get("password"):
+                return self._reply(200, {"token": f"stub-token-{body['username']}"})
+            return self._reply(400, "username and password are not provided in JSON format")
+        if len(segments) != 1 or segments[0] not in self.server.catalog:
+            return self._reply(404, {"error": f"Cannot POST {path}"})
+        return self._reply(200, self.server.add(segments[0], body))
+
+    def do_PUT(self):
+        path, segments, _ = self._route()
+        if len(segments) != 2 or segments[0] not in self.server.catalog:
+            return self._reply(404, {"error": f"Cannot {self.command} {path}"})
+        return self._reply(200, {**self._body(), "id": int(segments[1]) if segments[1].isdigit() else segments[1]})
+
+    do_PATCH = do_PUT
+
+    def do_DELETE(self):
+        path, segments, _ = self._route()
+        if len(segments) != 2 or segments[0] not in self.server.catalog:
+            return self._reply(404, {"error": f"Cannot DELETE {path}"})
+        record = self.server.remove(segments[0], segments[1])
+        if record is None:
+            return self._reply(404, {"error": f"{segments[0][:-1]} {segments[1]} not found"})
+        return self._reply(200, record)
+
+class StubServer(ThreadingHTTPServer):
+    """Local FakeStore API stub for offline and resilience runs"""
+
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, seed: int = 0,
+                 catalog: Optional[Dict[str, List[Dict[str, Any]]]] = None):
+        """
+        Initialize stub server
+
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            seed: Seed of the generated catalog
+            catalog: Collections to serve instead of the generated ones
+        """
+        super().__init__((host, port), _StubHandler)
+        self.catalog = catalog or build_catalog(seed)
+        self._ids = {resource: len(records) for resource, records in self.catalog.items()}
+        # Like the real API, created records never show up in listings; they only answer by id
+        self.created: Dict[str, List[Dict[str, Any]]] = {resource: [] for resource in self.catalog}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server"""
+        host, port = self.socket.getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def find(self, resource: str, record_id: str) -> Optional[Dict[str, Any]]:
+        """Record of a resource by id, or None"""
+        records = self.catalog[resource] + self.created[resource]
+        return next((r for r in records if str(r["id"]) == record_id), None)
+
+    def add(self, resource: str, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a created record under the next id"""
+        with self._lock:
+            self._ids[resource] += 1
+            record = {**record, "id": self._ids[resource]}
+            self.created[resource].append(record)
+        return record
+
+    def remove(self, resource: str, record_id: str) -> Optional[Dict[str, Any]]:
+        """Delete a record; returns it, or None if it does not exist"""
+        with self._lock:
+            record = self.find(resource, record_id)
+            for records in (self.catalog[resource], self.created[resource]):
+                if record in records:
+                    records.remove(record)
+        return record
+
+    def start(self) -> "StubServer":
+        """Serve on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and release the port"""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+class StubServerPlugin:
+    """pytest plugin serving the suite from a local stub instead of the configured base URL"""
+
+    def __init__(self, config, seed: int = 0):
+        self.config = config
+        self.server: Optional[StubServer] = None
+        # xdist workers inherit API_BASE_URL from the controller, which owns the server
+        if hasattr(config, "workerinput") or os.environ.get("API_BASE_URL"):
+            return
+        self.server = StubServer(seed=seed).start()
+        os.environ["API_BASE_URL"] = self.server.url
+        print(f"Stub server listening on {self.server.url}")
+
+    def pytest_unconfigure(self, config):
+        if self.server is not None:
+            self.server.stop()
+            os.environ.pop("API_BASE_URL", None)
+            self.server = None
+
+def main():
+    """Run the stub server in the foreground"""
+    parser = argparse.ArgumentParser(description="Local FakeStore API stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = StubServer(args.host, args.port, args.seed)
+    print(f"Stub server listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import heapq
+import json
+import os
+import statistics
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import pytest
+from .json_codec import codec
+
+# Fixtures whose state is shared between the tests using them (scheduling.group_fixtures);
+# the suite's fixtures are all per test or per worker, so only xdist_group markers group by default
+DEFAULT_GROUP_FIXTURES: Tuple[str, ...] = ()
+
+class DurationStore:
+    """Persistent per-test duration history"""
+
+    def __init__(self, path: str = ".cache/test_durations.json", smoothing: float = 0.5):
+        """
+        Initialize duration store
+
+        Args:
+            path: JSON file holding recorded durations
+            smoothing: Weight of the newest sample in the moving average (0-1]
+        """
+        self.path = Path(path)
+        self.smoothing = smoothing
+        self.durations: Dict[str, float] = {}
+        self.load()
+
+    def load(self):
+        """Load recorded durations from disk"""
+        if not self.path.exists():
+            return
+
+        try:
+            self.durations = {k: float(v) for k, v in codec.load(self.path).items()}
+        except (json.JSONDecodeError, IOError, ValueError, AttributeError) as e:
+            print(f"Ignoring unreadable duration history {self.path}: {e}")
+            self.durations = {}
+
+    def record(self, node_id: str, duration: float):
+        """
+        Record a test duration using an exponential moving average
+
+        Args:
+            node_id: pytest node id
+            duration: Measured duration in seconds
+        """
+        previous = self.durations.get(node_id)
+        if previous is None:
+            self.durations[node_id] = duration
+        else:
+            self.durations[node_id] = self.smoothing * duration + (1 - self.smoothing) * previous
+
+    def get(self, node_id: str, default: Optional[float] = None) -> Optional[float]:
+        """Get the recorded duration of a test"""
+        return self.durations.get(node_id, default)
+
+    def default_duration(self) -> float:
+        """Prediction for tests without history (median of known durations)"""
+        if not self.durations:
+            return 1.0
+        return statistics.median(self.durations.values())
+
+    def save(self):
+        """Atomically write durations to disk"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(codec.dumps_bytes(self.durations, indent=2, sort_keys=True))
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"Failed to save duration history {self.path}: {e}")
+            Path(tmp_path).unlink(missing_ok=True)
+
+class TestScheduler:
+    """Longest-processing-time-first ordering and partitioning of test items"""
+
+    __test__ = False  # Not a test class despite the name
+
+    def __init__(self, store: DurationStore, group_fixtures: Sequence[str] = DEFAULT_GROUP_FIXTURES):
+        """
+        Initialize test scheduler
+
+        Args:
+            store: Duration history
+            group_fixtures: Fixture names whose users should run on the same worker
+        """
+        self.store = store
+        self.group_fixtures = tuple(group_fixtures)
+        self._default = store.default_duration()
+
+    def predicted(self, item) -> float:
+        """Predicted duration of a test item"""
+        return self.store.durations.get(item.nodeid, self._default)
+
+    def group_of(self, item) -> Optional[str]:
+        """Scheduling group of a test item, or None if it can run anywhere"""
+        marker = item.get_closest_marker("xdist_group")
+        if marker is not None:
+            return marker.kwargs.get("name", marker.args[0] if marker.args else "default")
+
+        fixture_names = getattr(item, "fixturenames", ())
+        for fixture_name in self.group_fixtures:
+            if fixture_name in fixture_names:
+                return fixture_name
+        return None
+
+    def units(self, items: List[Any]) -> List[Tuple[float, List[Any]]]:
+        """
+        Split items into scheduling units (a group or a single test)
+
+        Returns:
+            List of (predicted duration, items) tuples, longest first
+        """
+        groups: Dict[str, List[Any]] = {}
+        units: List[Tuple[float, List[Any]]] = []
+
+        for item in items:
+            group = self.group_of(item)
+            if group is None:
+                units.append((self.predicted(item), [item]))
+            else:
+                groups.setdefault(group, []).append(item)
+
+        for group_items in groups.values():
+            group_items.sort(key=self.predicted, reverse=True)
+            units.append((sum(self.predicted(i) for i in group_items), group_items))
+
+        # Stable sort keeps collection order between equally long units
+        units.sort(key=lambda unit: unit[0], reverse=True)
+        return units
+
+    def order(self, items: List[Any]) -> List[Any]:
+        """Order items longest first, keeping grouped tests contiguous"""
+        return [item for _, unit_items in self.units(items) for item in unit_items]
+
+    def partition(self, items: List[Any], count: int) -> List[List[Any]]:
+        """
+        Split items into buckets of similar predicted duration (LPT bin packing)
+
+        Args:
+            items: Test items
+            count: Number of buckets (e.g. CI machines)
+
+        Returns:
+            List of item lists, one per bucket
+        """
+        buckets: List[List[Any]] = [[] for _ in range(count)]
+        heap = [(0.0, index) for index in range(count)]
+
+        for duration, unit_items in self.units(items):
+            load, index = heapq.heappop(heap)
+            buckets[index].extend(unit_items)
+            heapq.heappush(heap, (load + duration, index))
+
+        return buckets
+
+class DurationSchedulerPlugin:
+    """pytest plugin recording test durations and scheduling slowest tests first"""
+
+    def __init__(self, config, scheduling_config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize duration scheduler plugin
+
+        Args:
+            config: pytest config
+            scheduling_config: "scheduling" configuration section
+        """
+        self.config = config
+        scheduling_config = scheduling_config or {}
+        self.store = DurationStore(config.getoption("--durations-path"))
+        self.scheduler = TestScheduler(self.store, scheduling_config.get("group_fixtures", DEFAULT_GROUP_FIXTURES))
+        self.reorder = config.getoption("--schedule-by-duration")
+        self.ci_split = config.getoption("--ci-split")
+        self._pending: Dict[str, float] = {}
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if self.ci_split:
+            index, count = (int(part) for part in self.ci_split.split("/"))
+            if count < 1 or not 0 <= index < count:
+                raise pytest.UsageError(f"Invalid --ci-split {self.ci_split}")
+
+            buckets = self.scheduler.partition(items, count)
+            selected = buckets[index]
+            selected_ids = {id(item) for item in selected}
+            deselected = [item for item in items if id(item) not in selected_ids]
+            if deselected:
+                config.hook.pytest_deselected(items=deselected)
+
+            predicted = sum(self.scheduler.predicted(item) for item in selected)
+            print(f"CI split {index}/{count}: {len(selected)} tests, predicted {predicted:.1f}s")
+            items[:] = selected
+
+        if self.reorder or self.ci_split:
+            items[:] = self.scheduler.order(items)
+            for item in items:
+                group = self.scheduler.group_of(item)
+                if group is not None and item.get_closest_marker("xdist_group") is None:
+                    # Honoured by pytest-xdist --dist=loadgroup
+                    item.add_marker(pytest.mark.xdist_group(name=group))
+
+    def pytest_runtest_logreport(self, report):
+        self._pending[report.nodeid] = self._pending.get(report.nodeid, 0.0) + report.duration
+        if report.when == "teardown":
+            self.store.record(report.nodeid, self._pending.pop(report.nodeid))
+
+    def pytest_sessionfinish(self, session):
+        # Under xdist only the controller persists; workers forward their reports to it
+        if hasattr(self.config, "workerinput"):
+            return
+        self.store.save()
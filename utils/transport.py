@@ -0,0 +1,222 @@
+import functools
+import json
+import socket
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util import connection as urllib3_connection
+from urllib3.util.timeout import Timeout
+from requests.exceptions import JSONDecodeError as RequestsJSONDecodeError
+from .json_codec import codec
+from .deadline import Deadline, capped_timeout, current_deadline
+
+if TYPE_CHECKING:
+    from .streaming import SpooledBody
+
+class APIResponse(requests.Response):
+    """Response whose JSON decoding goes through the framework codec"""
+
+    # Set by BodyStreamer when the body was read through the framework
+    spooled_body: Optional["SpooledBody"] = None
+    body_size: Optional[int] = None
+    wire_size: Optional[int] = None
+    # Per-phase timings in seconds: dns, connect, tls, send, ttfb, download, plus reused flag
+    timings: Optional[Dict[str, Any]] = None
+    body_sha256: Optional[str] = None
+
+    @property
+    def content(self):
+        """Response body; spooled bodies are read back from disk"""
+        if self.spooled_body is not None:
+            return self.spooled_body.read_bytes()
+        return requests.Response.content.fget(self)
+
+    def json(self, **kwargs):
+        """
+        Decode response body as JSON
+
+        Args:
+            **kwargs: Passed to stdlib json.loads (disables the fast path)
+
+        Returns:
+            Decoded JSON body
+        """
+        if kwargs:
+            return super().json(**kwargs)
+
+        if self.spooled_body is not None:
+            # Decode straight from the memory-mapped file instead of loading a copy
+            try:
+                with self.spooled_body.open_mmap() as mapped, memoryview(mapped) as view:
+                    return codec.loads(view)
+            except json.JSONDecodeError as e:
+                raise RequestsJSONDecodeError(e.msg, e.doc, e.pos)
+
+        encoding = (self.encoding or "utf-8").lower().replace("_", "-")
+        try:
+            if encoding in ("utf-8", "utf8", "ascii"):
+                return codec.loads(self.content)
+            return codec.loads(self.text)
+        except json.JSONDecodeError as e:
+            raise RequestsJSONDecodeError(e.msg, e.doc, e.pos)
+
+if TYPE_CHECKING:
+    _ConnectionBase = HTTPConnection
+    _PoolBase = HTTPConnectionPool
+else:
+    _ConnectionBase = _PoolBase = object
+
+class _TimedConnectionMixin(_ConnectionBase):
+    """
+    Records DNS, connect, TLS, send and time-to-first-byte for each request
+
+    _new_conn mirrors urllib3 2.x's own connection setup so that resolving and
+    connecting are timed separately; requirements.txt pins urllib3 to 2.x for it.
+    """
+
+    _connect_timings: Optional[Dict[str, float]] = None
+    _request_timings: Optional[Dict[str, Any]] = None
+    _sent_at = 0.0
+    # Deadline of the request this connection currently serves
+    _deadline: Optional[Deadline] = None
+
+    def _new_conn(self) -> socket.socket:
+        # Resolve separately from connecting so each phase is timed on its own
+        start = time.perf_counter()
+        host = self._dns_host.strip("[]")
+        try:
+            addresses = socket.getaddrinfo(host, self.port, urllib3_connection.allowed_gai_family(),
+                                           socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        resolved = time.perf_counter()
+
+        error: Optional[Exception] = None
+        for *_, sockaddr in addresses:
+            try:
+                sock = urllib3_connection.create_connection(
+                    (str(sockaddr[0]), self.port),
+                    self.timeout,
+                    source_address=self.source_address,
+                    socket_options=self.socket_options,
+                )
+                break
+            except socket.timeout as e:
+                error = ConnectTimeoutError(
+                    self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})"
+                )
+                error.__cause__ = e
+            except OSError as e:
+                error = NewConnectionError(self, f"Failed to establish a new connection: {e}")
+                error.__cause__ = e
+        else:
+            raise error or NewConnectionError(self, "Failed to establish a new connection: no addresses")
+
+        self._connect_timings = {"dns": resolved - start, "connect": time.perf_counter() - resolved}
+        return sock
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        timings = self._connect_timings or {"dns": 0.0, "connect": 0.0}
+        # Whatever connect() spent beyond the socket setup is the TLS handshake (and proxy tunnel)
+        timings["tls"] = max(time.perf_counter() - start - timings["dns"] - timings["connect"], 0.0)
+        timings["started"] = start
+        self._connect_timings = timings
+
+    def request(self, *args, **kwargs):
+        # Cancelling the deadline (a losing hedge) shuts the socket, so a blocked read returns at once
+        deadline = self._deadline = current_deadline()
+        if deadline is not None:
+            deadline.bind_abort(functools.partial(self._abort, deadline))
+        start = time.perf_counter()
+        super().request(*args, **kwargs)
+        sent = time.perf_counter()
+
+        connect_timings, self._connect_timings = self._connect_timings, None
+        timings = {"dns": 0.0, "connect": 0.0, "tls": 0.0, "reused": connect_timings is None}
+        send = sent - start
+        if connect_timings is not None:
+            timings.update({k: connect_timings[k] for k in ("dns", "connect", "tls")})
+            # Plain HTTP connects lazily while sending the request
+            if connect_timings["started"] >= start:
+                send -= timings["dns"] + timings["connect"] + timings["tls"]
+        timings["send"] = max(send, 0.0)
+
+        self._request_timings = timings
+        self._sent_at = sent
+
+    def getresponse(self, *args, **kwargs):
+        response = super().getresponse(*args, **kwargs)
+        timings = dict(self._request_timings or {})
+        timings["ttfb"] = time.perf_counter() - self._sent_at
+        response.phase_timings = timings
+        return response
+
+    def _abort(self, deadline: Deadline):
+        # A pooled connection may serve another request by now; leave that one alone
+        sock = self.sock
+        if self._deadline is deadline and sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+class _DeadlinePoolMixin(_PoolBase):
+    """Limits the connect and read timeouts of every attempt to the remaining deadline"""
+
+    def _get_timeout(self, timeout: Any) -> Timeout:
+        timeout = super()._get_timeout(timeout)
+        if current_deadline() is None:
+            return timeout
+        connect, read = (value if isinstance(value, (int, float)) else None
+                         for value in (timeout.connect_timeout, timeout.read_timeout))
+        connect, read = capped_timeout(connect, read)
+        return Timeout(connect=connect, read=read)
+
+class TimedHTTPConnectionPool(_DeadlinePoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(_DeadlinePoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+class FrameworkHTTPAdapter(HTTPAdapter):
+    """HTTP adapter producing APIResponse objects with per-phase timings"""
+
+    def __init__(self, *args, fault_injector=None, **kwargs):
+        """
+        Initialize adapter
+
+        Args:
+            fault_injector: FaultInjector whose profile is applied to every request attempt (optional)
+        """
+        # Read by init_poolmanager, which the base constructor calls
+        self.fault_injector = fault_injector
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        if self.fault_injector is not None:
+            self.poolmanager.pool_classes_by_scheme = self.fault_injector.pool_classes()
+            return
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+    def build_response(self, req, resp):
+        response = super().build_response(req, resp)
+        response.__class__ = APIResponse
+        timings = getattr(resp, "phase_timings", None)
+        response.timings = dict(timings) if timings else None
+        return response
@@ -1,9 +1,14 @@
 import json
 import jsonschema
-from typing import Dict, Any, List, Optional, Union
+from typing import Dict, Any, List, Optional, Type, Union
+from pydantic import ValidationError
 from requests import Response
 from pathlib import Path
 from config import get_config
+from .hooks import HookRegistry
+from .json_codec import codec
+from .models import FakeStoreModel
+from .schema_compiler import SchemaCompiler
 
 class ResponseValidator:
     """Response validation utility class"""
@@ -13,6 +18,13 @@ class ResponseValidator:
         self.config = get_config()
         self.validation_config = self.config["validation"]
         self.schema_dir = Path(__file__).parent.parent / "test_data" / "schemas"
+        self.hooks = HookRegistry()
+        
+        # Schemas are compiled to Python validators unless configured otherwise
+        self.schema_engine = self.validation_config.get("schema_engine", "compiled")
+        self.schema_compiler = SchemaCompiler(
+            self.validation_config.get("compiled_schema_dir", "build/compiled_schemas")
+        )
         
         print(f"Response validator initialized")
     
@@ -90,13 +102,16 @@ class ResponseValidator:
         
         return is_valid
     
-    def validate_json_schema(self, response: Response, schema_name: str) -> bool:
+    def validate_json_schema(self, response: Response, schema_name: str,
+                             engine: Optional[str] = None) -> bool:
         """
         Validate response JSON against schema
         
         Args:
             response: HTTP response object
             schema_name: Schema file name (without .json extension)
+            engine: "compiled" or "jsonschema" (defaults to validation.schema_engine);
+                    schemas the compiler does not support always use jsonschema
             
         Returns:
             True if valid, False otherwise
@@ -114,6 +129,18 @@ class ResponseValidator:
             print(f"Schema not found: {schema_name}")
             return False
         
+        if (engine or self.schema_engine) == "compiled":
+            compiled_validator = self.schema_compiler.get_validator(schema_name, schema)
+            if compiled_validator is not None:
+                error = compiled_validator(response_json)
+                if error is None:
+                    print(f"JSON schema validation passed: {schema_name}")
+                    return True
+                message, path = error
+                print(f"JSON schema validation failed: {message}")
+                print(f"   Failed at path: {' -> '.join(str(p) for p in path)}")
+                return False
+        
         try:
             # Validate against schema
             jsonschema.validate(
@@ -132,6 +159,37 @@ class ResponseValidator:
             print(f"Invalid schema: {e.message}")
             return False
     
+    def validate_model(self, response: Response, model: Type[FakeStoreModel],
+                       many: bool = False) -> Optional[Union[FakeStoreModel, List[FakeStoreModel]]]:
+        """
+        Validate response JSON against a typed model
+        
+        The raw body is parsed and validated in one step, so list endpoints avoid
+        both the intermediate dicts and interpreted JSON Schema validation.
+        
+        Args:
+            response: HTTP response object
+            model: Model class from utils.models (e.g. Product)
+            many: Whether the response is a list of objects
+            
+        Returns:
+            Model instance (or list of instances) if valid, None otherwise
+        """
+        result: Union[FakeStoreModel, List[FakeStoreModel]]
+        try:
+            if many:
+                result = model.parse_many(response.content)
+            else:
+                result = model.parse(response.content)
+        except ValidationError as e:
+            first = e.errors()[0]
+            print(f"Model validation failed: {model.__name__} ({e.error_count()} errors)")
+            print(f"   First error: {first['msg']} at {' -> '.join(str(p) for p in first['loc'])}")
+            return None
+        
+        print(f"Model validation passed: {model.__name__}{' list' if many else ''}")
+        return result
+    
     def validate_required_fields(self, response: Response, required_fields: List[str]) -> bool:
         """
         Validate that response contains required fields
@@ -319,13 +377,13 @@ class ResponseValidator:
     def _load_schema(self, schema_name: str) -> Optional[Dict[str, Any]]:
         """Load JSON schema from file"""
         schema_file = self.schema_dir / f"{schema_name}.json"
+        self.hooks.emit("schema", name=schema_name, path=str(schema_file))
         
         if not schema_file.exists():
             return None
         
         try:
-            with open(schema_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return codec.load(schema_file)
         except (json.JSONDecodeError, IOError) as e:
             print(f"Failed to load schema {schema_name}: {e}")
             return None